@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+bench_slides.py — Benchmark the slide generator in build_slides.py.
+
+Builds the real course deck and synthetic decks (default 1k and 10k slides
+with long notes and many bullets) through ``build_presentation`` with each
+backend, and reports wall time, throughput, peak memory and output size.
+Every case runs in a fresh interpreter so peak RSS is not polluted by earlier
+cases; wall time is the best of --repeat runs.
+
+Run:
+    python3 scripts/bench_slides.py                     # compare to baseline
+    python3 scripts/bench_slides.py --sizes 1000 --repeat 5
+    python3 scripts/bench_slides.py --update-baseline   # record this machine
+    python3 scripts/bench_slides.py --check             # exit 1 on regression
+
+The baseline lives in scripts/bench_baseline.json. Timings are machine
+specific: refresh it on the machine that runs --check.
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import build_slides
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "bench_baseline.json")
+
+_WORDS = (
+    "podman container image rootless volume network pod secret quadlet systemd "
+    "unit registry digest layer build label selinux namespace user mapping port "
+    "service health check restart policy journal storage overlay socket timer"
+).split()
+
+_CODE_LINES = (
+    "podman run -d --name web -p 8080:80 docker.io/library/nginx:alpine",
+    "systemctl --user daemon-reload",
+    "FROM registry.fedoraproject.org/fedora-minimal:40",
+    "[Container]",
+    "Image=docker.io/library/mariadb:11",
+    "--security-opt label=disable",
+)
+
+
+def synthetic_slides(count: int, seed: int = 0) -> list[build_slides.Slide]:
+    """Deterministic deck of *count* slides with long notes and many bullets."""
+    rng = random.Random(seed)
+
+    def sentence(lo: int, hi: int) -> str:
+        return " ".join(rng.choice(_WORDS) for _ in range(rng.randint(lo, hi))).capitalize()
+
+    slides = []
+    for i in range(count):
+        kind = ("section", "content", "content", "lab")[i % 4] if i else "title"
+        slide = {
+            "module": f"synthetic-{i // 50:03d}",
+            "type": kind,
+            "title": sentence(3, 7),
+            "notes": ". ".join(sentence(10, 20) for _ in range(rng.randint(6, 12))) + ".",
+        }
+        if kind in ("title", "section"):
+            slide["subtitle"] = sentence(4, 9)
+        else:
+            slide["bullets"] = [
+                rng.choice(_CODE_LINES) if rng.random() < 0.3 else sentence(5, 12)
+                for _ in range(rng.randint(5, 10))
+            ]
+        slides.append(build_slides.Slide.from_dict(slide))
+    return slides
+
+
+def _run_case(slides_spec: str | int, backend: str, repeat: int) -> dict:
+    """Child-process body: build the deck *repeat* times and measure it."""
+    build_slides.prime_odf_namespaces()
+    if slides_spec == "course":
+        slides = build_slides.all_slides()
+    else:
+        slides = synthetic_slides(int(slides_spec))
+    options = build_slides.BuildOptions(backend=backend)
+    times = []
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.odp")
+        for _ in range(repeat):
+            start = time.perf_counter()
+            build_slides.build_presentation(path, slides, options)
+            times.append(time.perf_counter() - start)
+        size = os.path.getsize(path)
+    best = min(times)
+    return {
+        "slides": len(slides),
+        "seconds": round(best, 6),
+        "slides_per_second": round(len(slides) / best, 1),
+        "peak_rss_kb": build_slides.peak_rss_kb(),
+        "bytes": size,
+    }
+
+
+def run_case(slides_spec: str | int, backend: str, repeat: int) -> dict:
+    # "spawn" gives each case a clean interpreter, so its peak RSS is its own.
+    ctx = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=1, mp_context=ctx) as pool:
+        return pool.submit(_run_case, slides_spec, backend, repeat).result()
+
+
+def load_baseline() -> dict:
+    try:
+        with open(BASELINE_PATH, encoding="utf-8") as fh:
+            return json.load(fh)
+    except FileNotFoundError:
+        return {}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark build_slides.py.")
+    parser.add_argument("--sizes", default="1000,10000",
+                        help="comma-separated synthetic deck sizes (default: 1000,10000)")
+    parser.add_argument("--backend", action="append", choices=build_slides.BACKENDS,
+                        help="backend(s) to measure (default: all)")
+    parser.add_argument("--repeat", type=int, default=3,
+                        help="builds per case; the fastest is reported (default: 3)")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="relative slowdown or growth counted as a regression "
+                             "(default: 0.10)")
+    parser.add_argument("--json", metavar="FILE", help="also write results as JSON")
+    parser.add_argument("--update-baseline", action="store_true",
+                        help=f"store these results in {os.path.basename(BASELINE_PATH)}")
+    parser.add_argument("--check", action="store_true",
+                        help="exit with status 1 if any case regressed against the baseline")
+    args = parser.parse_args()
+
+    specs: list[str | int] = ["course", *(int(n) for n in args.sizes.split(",") if n)]
+    backends = args.backend or list(build_slides.BACKENDS)
+    baseline = load_baseline().get("cases", {})
+
+    results: dict[str, dict] = {}
+    regressions: list[str] = []
+    print(f"{'case':<22} {'slides':>7} {'seconds':>9} {'slides/s':>10} "
+          f"{'peak RSS':>10} {'size':>10}  vs baseline")
+    for spec in specs:
+        for backend in backends:
+            name = f"{spec if spec == 'course' else f'synthetic-{spec}'}/{backend}"
+            r = run_case(spec, backend, args.repeat)
+            results[name] = r
+
+            base = baseline.get(name)
+            delta = ""
+            if base:
+                ratios = {
+                    "time": r["seconds"] / base["seconds"] - 1,
+                    "rss": r["peak_rss_kb"] / base["peak_rss_kb"] - 1,
+                    "size": r["bytes"] / base["bytes"] - 1,
+                }
+                delta = "  ".join(f"{k} {v:+.0%}" for k, v in ratios.items())
+                worse = [k for k, v in ratios.items() if v > args.threshold]
+                if worse:
+                    regressions.append(f"{name}: {', '.join(worse)}")
+                    delta += "  REGRESSION"
+            print(f"{name:<22} {r['slides']:>7} {r['seconds']:>9.3f} "
+                  f"{r['slides_per_second']:>10.1f} {r['peak_rss_kb'] / 1024:>8.1f}MB "
+                  f"{r['bytes'] / 1024:>8.1f}KB  {delta or '-'}")
+
+    report = {
+        "generator": build_slides.GENERATOR_VERSION,
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "repeat": args.repeat,
+        "cases": results,
+    }
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as fh:
+            json.dump(report, fh, indent=2)
+            fh.write("\n")
+    if args.update_baseline:
+        merged = load_baseline()
+        merged.update({k: v for k, v in report.items() if k != "cases"})
+        merged["cases"] = {**merged.get("cases", {}), **results}
+        with open(BASELINE_PATH, "w", encoding="utf-8") as fh:
+            json.dump(merged, fh, indent=2, sort_keys=True)
+            fh.write("\n")
+        print(f"\nBaseline updated: {BASELINE_PATH}")
+
+    if regressions:
+        print("\nRegressions (> {:.0%}):\n  ".format(args.threshold) + "\n  ".join(regressions))
+    return 1 if args.check and regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
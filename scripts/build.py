@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+"""
+build.py — Build every course artifact, doing only the work that changed.
+
+The build is a graph of nodes:
+
+    slides/src/<key>.json ──▶ slides:<key> ──┐
+    slides/src/index.json ───────────────────┴─▶ slides:combined ──▶ export
+    course markdown (book chapters) ──▶ markdown ──▶ pdf
+
+Each node hashes its input files (size and mtime first, then sha256), the
+scripts that build it and its parameters, together with the hashes of the
+nodes it depends on. A node whose hash matches .cache/build-state.json and
+whose outputs exist is skipped. The rest run as soon as their dependencies
+finish, with independent nodes in parallel worker processes. Each tool keeps
+its own finer cache underneath (the slide and export manifests,
+dist/.pdf-cache/), so a node that does run still only redoes what changed.
+"export" renders the decks to PDF and thumbnails with LibreOffice (see
+export_slides.py).
+
+Run:
+    python3 scripts/build.py                     # everything ("all")
+    python3 scripts/build.py slides              # all decks
+    python3 scripts/build.py slides:07-pods pdf -j 8 --split
+    python3 scripts/build.py export              # decks, then their PDFs and PNGs
+    python3 scripts/build.py --dry-run           # list the nodes that would run
+"""
+
+from __future__ import annotations
+
+import argparse
+import functools
+import hashlib
+import json
+import os
+import shutil
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable
+
+import build_course_pdf
+import build_slides
+import course_source
+import export_slides
+
+ROOT_DIR = course_source.ROOT_DIR
+STATE_PATH = ROOT_DIR / ".cache" / "build-state.json"
+
+# Bump whenever node definitions change, to invalidate STATE_PATH.
+GRAPH_VERSION = "2"
+
+
+@dataclass(frozen=True)
+class Node:
+    """One build step. *action* runs in a worker process and must pickle;
+    *finish*, if given, runs in this process with the action's result."""
+    name: str
+    action: Callable
+    inputs: tuple[str, ...] = ()    # files relative to ROOT_DIR
+    deps: tuple[str, ...] = ()
+    outputs: tuple[str, ...] = ()   # files relative to ROOT_DIR
+    params: tuple = ()
+    finish: Callable | None = field(default=None, compare=False)
+
+
+# ---------------------------------------------------------------------------
+# Actions (run in worker processes)
+# ---------------------------------------------------------------------------
+
+def _slide_deck(out_dir: str, key: str | None, options: build_slides.BuildOptions,
+                force: bool) -> dict:
+    """Build one deck unless the slide manifest says it is current.
+
+    Returns its manifest entry; the caller records it, since workers must not
+    write the shared manifest concurrently.
+    """
+    bs = build_slides
+    path = bs.deck_path(out_dir, key)
+    slides = bs.all_slides() if key is None else bs.load_module(key)
+    digest = bs.deck_hash(slides, options)
+    if force or not bs.is_fresh(path, digest, bs.load_manifest(out_dir)):
+        os.makedirs(out_dir, exist_ok=True)
+        if key is None and bs.modules_are_contiguous(slides):
+            # The module decks are current (they are dependencies): stitch them.
+            bs.merge_presentations(path, [bs.deck_path(out_dir, k) for k in bs.module_keys()],
+                                   options)
+        else:
+            bs.build_deck(path, key, options)
+    return {os.path.basename(path): digest}
+
+
+def _record_decks(out_dir: str, entries: dict) -> None:
+    manifest = build_slides.load_manifest(out_dir)
+    manifest.update(entries)
+    build_slides.save_manifest(out_dir, manifest)
+
+
+def _export_decks(jobs: int, force: bool) -> None:
+    if shutil.which(export_slides.SOFFICE) is None:
+        raise RuntimeError(f"{export_slides.SOFFICE} not found; install LibreOffice")
+    failed = export_slides.export(jobs=jobs, force=force, log=lambda msg: None)[2]
+    if failed:
+        raise RuntimeError(f"{failed} deck(s) failed to export")
+
+
+def _book_markdown() -> None:
+    build_course_pdf.write_book_markdown()
+
+
+def _book_pdf(jobs: int, split: bool, warm: bool, force: bool) -> None:
+    container_type = build_course_pdf.WarmContainer if warm else build_course_pdf.Container
+    build_course_pdf.build(force=force, jobs=jobs, split=split, container=container_type(),
+                           log=lambda msg: None)
+
+
+# ---------------------------------------------------------------------------
+# The graph
+# ---------------------------------------------------------------------------
+
+def course_graph(*, jobs: int = 1, split: bool = False, warm: bool = False,
+                 force: bool = False) -> dict[str, Node]:
+    """Every node of the course build, keyed by name, in dependency order."""
+    out_dir = str(ROOT_DIR / "slides")
+    options = build_slides.BuildOptions(reproducible="SOURCE_DATE_EPOCH" in os.environ)
+    slide_tools = ("scripts/build_slides.py",)
+    src = os.path.relpath(build_slides.SLIDES_SRC_DIR, ROOT_DIR)
+    record = functools.partial(_record_decks, out_dir)
+
+    graph: dict[str, Node] = {}
+    for key in build_slides.module_keys():
+        graph[f"slides:{key}"] = Node(
+            f"slides:{key}", functools.partial(_slide_deck, out_dir, key, options, force),
+            inputs=(f"{src}/{key}.json", *slide_tools), outputs=(f"slides/{key}.odp",),
+            params=(repr(options),), finish=record)
+    graph["slides:combined"] = Node(
+        "slides:combined", functools.partial(_slide_deck, out_dir, None, options, force),
+        inputs=(f"{src}/index.json", *slide_tools),
+        deps=tuple(n for n in graph), outputs=(f"slides/{build_slides.COMBINED_KEY}.odp",),
+        params=(repr(options),), finish=record)
+    graph["export"] = Node(
+        "export", functools.partial(_export_decks, jobs, force),
+        inputs=("scripts/export_slides.py",), deps=tuple(n for n in graph),
+        outputs=(f"dist/slides/{build_slides.COMBINED_KEY}.pdf",))
+
+    book_sources = sorted({p.as_posix() for c in build_course_pdf.book_chapters()
+                           for p in c.sources} | {course_source.MODULES_INDEX})
+    book_tools = ("scripts/build_course_pdf.py", "scripts/course_source.py")
+    md = f"dist/{build_course_pdf.BOOK_NAME}.md"
+    graph["markdown"] = Node("markdown", _book_markdown,
+                             inputs=(*book_sources, *book_tools), outputs=(md,))
+    graph["pdf"] = Node("pdf", functools.partial(_book_pdf, jobs, split, warm, force),
+                        inputs=(*book_sources, *book_tools), deps=("markdown",),
+                        outputs=(f"dist/{build_course_pdf.BOOK_NAME}.pdf",), params=(split,))
+    return graph
+
+
+def select(graph: dict[str, Node], targets: list[str]) -> list[str]:
+    """Names of *targets* and everything they depend on, in dependency order."""
+    wanted: set[str] = set()
+
+    def add(name: str) -> None:
+        if name not in wanted:
+            wanted.add(name)
+            for dep in graph[name].deps:
+                add(dep)
+
+    for target in targets:
+        if target == "all":
+            names = list(graph)
+        elif target == "slides":
+            names = [n for n in graph if n.startswith("slides:")]
+        elif target in graph:
+            names = [target]
+        else:
+            raise KeyError(target)
+        for name in names:
+            add(name)
+    return [n for n in graph if n in wanted]
+
+
+# ---------------------------------------------------------------------------
+# Running
+# ---------------------------------------------------------------------------
+
+def load_state(path: Path = STATE_PATH) -> dict:
+    data = course_source.read_json_dict(path)
+    return data if data.get("version") == GRAPH_VERSION else {}
+
+
+def save_state(state: dict, path: Path = STATE_PATH) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    course_source.write_json_atomic(path, {**state, "version": GRAPH_VERSION})
+
+
+def node_hashes(graph: dict[str, Node], names: list[str], known: dict) -> tuple[dict, dict]:
+    """(node hashes, source digests) for *names*, which are in dependency order."""
+    digests: dict[str, list] = {}
+    hashes: dict[str, str] = {}
+    for name in names:
+        node = graph[name]
+        for rel in node.inputs:
+            if rel not in digests:
+                digests[rel] = course_source.source_digest(ROOT_DIR, Path(rel), known)
+        payload = json.dumps([name, [digests[r][2] for r in node.inputs],
+                              [hashes.get(d) for d in node.deps], list(node.params)])
+        hashes[name] = hashlib.sha256(payload.encode("utf-8")).hexdigest()
+    return hashes, digests
+
+
+def run(graph: dict[str, Node], names: list[str], *, jobs: int = 1, force: bool = False,
+        dry_run: bool = False) -> int:
+    state = load_state()
+    hashes, digests = node_hashes(graph, names, state.get("sources", {}))
+    recorded = state.get("nodes", {})
+    stale = [n for n in names
+             if force or recorded.get(n) != hashes[n]
+             or not all((ROOT_DIR / out).exists() for out in graph[n].outputs)]
+    if dry_run:
+        for name in stale:
+            print(name)
+        print(f"\n{len(stale)} of {len(names)} node(s) would run.")
+        return 0
+
+    start = time.perf_counter()
+    done = set(names) - set(stale)
+    failed: set[str] = set()
+    waiting = list(stale)
+    with ProcessPoolExecutor(max_workers=max(1, jobs), initializer=build_slides.init_worker,
+                             initargs=(False, "json")) as pool:
+        running: dict = {}
+        while waiting or running:
+            for name in list(waiting):
+                deps = [d for d in graph[name].deps if d in hashes]
+                if any(d in failed for d in deps):
+                    waiting.remove(name)
+                    failed.add(name)
+                    print(f"skip  {name} (a dependency failed)")
+                elif all(d in done for d in deps):
+                    waiting.remove(name)
+                    running[pool.submit(graph[name].action)] = (name, time.perf_counter())
+            if not running:
+                break
+            finished, _pending = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                name, began = running.pop(future)
+                try:
+                    result = future.result()
+                    if graph[name].finish is not None:
+                        graph[name].finish(result)
+                except Exception as exc:  # report and carry on with unrelated nodes
+                    failed.add(name)
+                    print(f"FAIL  {name}: {exc}")
+                    continue
+                done.add(name)
+                recorded[name] = hashes[name]
+                print(f"built {name} ({time.perf_counter() - began:.2f}s)")
+
+    save_state({"sources": {**state.get("sources", {}), **digests}, "nodes": recorded})
+    print(f"\nDone. {len(stale) - len(failed)} node(s) built, {len(names) - len(stale)} "
+          f"up to date, {len(failed)} failed ({time.perf_counter() - start:.2f}s)")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build the course artifacts.")
+    parser.add_argument("targets", nargs="*", default=["all"],
+                        help="all (default), slides, slides:<key>, slides:combined, "
+                             "export, markdown or pdf")
+    parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count() or 1,
+                        help="nodes to run at once; also the PDF's container count and "
+                             "the export's soffice count (default: one per CPU)")
+    parser.add_argument("-f", "--force", action="store_true",
+                        help="rebuild the selected nodes, ignoring every cache")
+    parser.add_argument("-n", "--dry-run", action="store_true",
+                        help="list the nodes that would run and exit")
+    parser.add_argument("--split", action="store_true",
+                        help="build the PDF chapter by chapter (see build_course_pdf.py)")
+    parser.add_argument("--warm", action="store_true",
+                        help="run pandoc in the long-lived container (see build_course_pdf.py)")
+    args = parser.parse_args()
+
+    graph = course_graph(jobs=args.jobs, split=args.split, warm=args.warm, force=args.force)
+    try:
+        names = select(graph, args.targets)
+    except KeyError as exc:
+        parser.error(f"unknown target {exc}; choose from all, slides, {', '.join(graph)}")
+    sys.exit(run(graph, names, jobs=args.jobs, force=args.force, dry_run=args.dry_run))
@@ -0,0 +1,560 @@
+#!/usr/bin/env python3
+"""
+build_course_pdf.py — Build dist/course_podman.pdf from the course markdown.
+
+The book is the front matter (README, COURSE_OUTLINE, MODULES), every module
+listed in MODULES.md, the cheatsheets and the appendix, in that order. Each
+of those is a chapter that pandoc converts to LaTeX on its own. The result
+is cached in dist/.pdf-cache/ under a content hash of the chapter's source
+files, so an edit re-converts only the chapters it touches. The PDF is then
+compiled from the cached chapters in one LaTeX run, which is skipped when no
+chapter changed. pandoc and LaTeX run in the docker.io/pandoc/latex
+container, so the host only needs podman. The module list and the source
+digests come from course_source.py, shared with build_slides.py.
+
+With --split each chapter is also compiled to its own PDF in one of --jobs
+concurrent containers, and the book is stitched from those with pdfpages,
+keeping the section numbering and the TOC; only changed chapters then go
+through LaTeX at all. --warm keeps one container running between builds and
+execs into it, with TeX's caches on a named volume, so authoring loops skip
+container start-up and cold caches.
+
+Run:
+    python3 scripts/build_course_pdf.py            # or scripts/build-course-pdf.sh
+    python3 scripts/build_course_pdf.py --force    # ignore the cache
+    python3 scripts/build_course_pdf.py --split -j 8
+    python3 scripts/build_course_pdf.py --warm     # reuse one running container
+    python3 scripts/build_course_pdf.py --stop-warm
+
+Output:
+    dist/course_podman.md   (the whole book as one markdown file)
+    dist/course_podman.pdf
+"""
+
+from __future__ import annotations
+
+import argparse
+import datetime as dt
+import hashlib
+import json
+import os
+import re
+import shlex
+import shutil
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import BinaryIO, Iterable
+
+from course_source import (COPY_BUFSIZE, module_paths, read_json_dict, source_digest,
+                           write_json_atomic)
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+OUT_DIR = ROOT_DIR / "dist"
+CACHE_DIR = OUT_DIR / ".pdf-cache"
+MANIFEST_NAME = "manifest.json"
+BOOK_NAME = "course_podman"
+
+TITLE = "Podman Zero-to-Expert Course"
+FRONT = ("README.md", "COURSE_OUTLINE.md", "MODULES.md")
+APPENDIX = ("ASSESSMENTS.md", "GLOSSARY.md", "FAQ.md")
+
+PANDOC_IMAGE = "docker.io/pandoc/latex:latest"
+# Options for every pandoc call; BOOK_ARGS only affect the preamble and TOC.
+PANDOC_ARGS = ("--from", "markdown", "--to", "latex", "--number-sections")
+BOOK_ARGS = ("--toc", "--toc-depth=2", "-V", "geometry:margin=1in")
+PDFLATEX = ("pdflatex", "-interaction=nonstopmode", "-halt-on-error")
+# The repository is mounted into several containers at once (--jobs), so it
+# gets SELinux's shared label (":z"). A private ":Z" label would be
+# re-applied by each new container and lock the others out of /data.
+DATA_MOUNT = "/data:z"
+
+# Bump whenever the chapters or the book .tex this script writes change.
+ASSEMBLER_VERSION = "2"
+
+# pandoc's --id-prefix only applies to HTML and DocBook output, and each
+# chapter is converted on its own, so every module would otherwise emit the
+# same \label and \hypertarget (table-of-contents, lab-1, ...). This filter
+# prefixes every identifier, and every internal link, with the chapter slug
+# passed as the chapter-id-prefix metadata value.
+ID_PREFIX_FILTER = """\
+local function prefixed(prefix)
+  local function attr(el)
+    if el.identifier and el.identifier ~= "" then
+      el.identifier = prefix .. el.identifier
+      return el
+    end
+  end
+  return {
+    Header = attr, Div = attr, Span = attr, CodeBlock = attr, Code = attr,
+    Image = attr, Table = attr, Figure = attr,
+    Link = function(el)
+      if el.target:sub(1, 1) == "#" then
+        el.target = "#" .. prefix .. el.target:sub(2)
+      end
+      return attr(el) or el
+    end,
+  }
+end
+
+function Pandoc(doc)
+  local prefix = pandoc.utils.stringify(doc.meta["chapter-id-prefix"] or "")
+  if prefix ~= "" then
+    return doc:walk(prefixed(prefix))
+  end
+end
+"""
+ID_PREFIX_FILTER_NAME = "chapter-ids.lua"
+
+
+# ---------------------------------------------------------------------------
+# Sources and chapters
+# ---------------------------------------------------------------------------
+
+def read_text(p: Path) -> str:
+    return p.read_text(encoding="utf-8")
+
+
+def section(title: str) -> str:
+    return f"# {title}\n\n"
+
+
+@dataclass(frozen=True)
+class Chapter:
+    """One independently converted part of the book.
+
+    *pieces* are literal markdown strings and source file paths (relative
+    to the repository root), concatenated in order.
+    """
+    slug: str
+    pieces: tuple
+
+    @property
+    def sources(self) -> list[Path]:
+        return [p for p in self.pieces if isinstance(p, Path)]
+
+    def write_markdown(self, out: BinaryIO, root: Path = ROOT_DIR) -> None:
+        """Stream the chapter into the binary file *out*, one piece at a time."""
+        for p in self.pieces:
+            if isinstance(p, Path):
+                with open(root / p, "rb") as src:
+                    shutil.copyfileobj(src, out, COPY_BUFSIZE)
+            else:
+                out.write(p.encode("utf-8"))
+
+
+def book_chapters(root: Path = ROOT_DIR) -> list[Chapter]:
+    """The book's chapters in order; concatenated, they are the whole book."""
+    front: list = [section("Front Matter")]
+    for i, fp in enumerate(FRONT):
+        front += [f"## {fp}\n\n", Path(fp), "\n"]
+        if i != len(FRONT) - 1:
+            front.append("\\newpage\n\n")
+    chapters = [Chapter("front-matter", tuple(front))]
+
+    # Modules (each starts on a new page)
+    chapters.append(Chapter("modules", ("\\newpage\n\n", section("Modules"))))
+    for fp in module_paths(root):
+        chapters.append(Chapter(Path(fp).stem, ("\\newpage\n\n", Path(fp), "\n")))
+
+    chapters.append(Chapter("cheatsheets", ("\\newpage\n\n", section("Cheatsheets"))))
+    for p in sorted((root / "cheatsheets").glob("*.md")):
+        chapters.append(Chapter(f"cheatsheet-{p.stem}", (
+            "\\newpage\n\n", f"## {p.name}\n\n", p.relative_to(root), "\n")))
+
+    # Assessments / Glossary / FAQ
+    chapters.append(Chapter("appendix", ("\\newpage\n\n", section("Appendix"))))
+    for fp in APPENDIX:
+        chapters.append(Chapter(Path(fp).stem.lower(), (
+            "\\newpage\n\n", f"## {fp}\n\n", Path(fp), "\n")))
+    return chapters
+
+
+def front_matter(date: str) -> str:
+    return f'---\ntitle: "{TITLE}"\ndate: "{date}"\n---\n\n'
+
+
+def write_book_markdown(root: Path = ROOT_DIR, chapters: list[Chapter] | None = None,
+                        date: str | None = None) -> Path:
+    """Stream the whole book into dist/course_podman.md; return its path."""
+    out_md = root / OUT_DIR.name / f"{BOOK_NAME}.md"
+    out_md.parent.mkdir(parents=True, exist_ok=True)
+    with open(out_md, "wb") as out:
+        out.write(front_matter(date or dt.date.today().isoformat()).encode("utf-8"))
+        for c in chapters if chapters is not None else book_chapters(root):
+            c.write_markdown(out, root)
+    return out_md
+
+
+# ---------------------------------------------------------------------------
+# Content hashes and the cache manifest
+# ---------------------------------------------------------------------------
+
+def load_manifest(cache_dir: Path) -> dict:
+    """Read the cache manifest from *cache_dir*; empty if missing or corrupt."""
+    return read_json_dict(cache_dir / MANIFEST_NAME)
+
+
+def save_manifest(cache_dir: Path, manifest: dict) -> None:
+    write_json_atomic(cache_dir / MANIFEST_NAME, manifest)
+
+
+def _hash(*parts) -> str:
+    payload = json.dumps([ASSEMBLER_VERSION, PANDOC_ARGS, *parts])
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def chapter_hash(chapter: Chapter, sources: dict, image: str = PANDOC_IMAGE) -> str:
+    return _hash(image, chapter.slug, ID_PREFIX_FILTER, [sources[p.as_posix()][2] if isinstance(p, Path) else p
+                                for p in chapter.pieces])
+
+
+# ---------------------------------------------------------------------------
+# pandoc/LaTeX container
+# ---------------------------------------------------------------------------
+
+class Container:
+    """Runs batches of shell commands in the pandoc/latex image with the
+    repository mounted at /data (the working directory)."""
+
+    def __init__(self, root: Path = ROOT_DIR, image: str = PANDOC_IMAGE):
+        self.root = root
+        self.image = image
+
+    def path(self, p: Path) -> str:
+        """*p* as seen from inside the container."""
+        return p.resolve().relative_to(self.root).as_posix()
+
+    def run(self, commands: list[list[str]], cwd: Path | None = None) -> None:
+        """Run *commands* one after another in one container; stop at the first failure."""
+        script = " && ".join(shlex.join(c) for c in commands)
+        if cwd is not None:
+            script = f"cd {shlex.quote(self.path(cwd))} && {script}"
+        subprocess.run(["podman", "run", "--rm", "-v", f"{self.root}:{DATA_MOUNT}",
+                        "-w", "/data", "--entrypoint", "sh", self.image, "-c", script],
+                       check=True)
+
+
+class WarmContainer(Container):
+    """A long-lived pandoc/latex container that commands are exec'd into.
+
+    Repeated builds skip container start-up, and TEXMFVAR (font and format
+    caches) lives on a named volume so it survives the container too. The
+    container is started on first use and kept running until stop().
+    """
+
+    TEXMF_VOLUME = "course-pdf-texmf-var"
+
+    def __init__(self, root: Path = ROOT_DIR, image: str = PANDOC_IMAGE):
+        super().__init__(root, image)
+        tag = hashlib.sha256(str(root).encode("utf-8")).hexdigest()[:8]
+        self.name = f"course-pdf-{tag}"
+        self._started = False
+        self._lock = threading.Lock()   # run_parallel's threads all call start()
+
+    def _state(self) -> str | None:
+        result = subprocess.run(["podman", "container", "inspect", "--format",
+                                 "{{.State.Running}} {{.ImageName}}", self.name],
+                                capture_output=True, text=True)
+        return result.stdout.strip() if result.returncode == 0 else None
+
+    def start(self) -> None:
+        with self._lock:
+            if self._started:
+                return
+            state = self._state()
+            if state != f"true {self.image}":
+                if state is not None:
+                    self.stop()
+                subprocess.run(["podman", "run", "-d", "--name", self.name,
+                                "-v", f"{self.root}:{DATA_MOUNT}",
+                                "-v", f"{self.TEXMF_VOLUME}:/texmf-var",
+                                "-e", "TEXMFVAR=/texmf-var", "-w", "/data",
+                                "--entrypoint", "sleep", self.image, "infinity"],
+                               check=True, stdout=subprocess.DEVNULL)
+            self._started = True
+
+    def stop(self) -> None:
+        subprocess.run(["podman", "rm", "-f", "-t", "0", self.name],
+                       check=True, stdout=subprocess.DEVNULL)
+        self._started = False
+
+    def run(self, commands: list[list[str]], cwd: Path | None = None) -> None:
+        self.start()
+        workdir = "/data" if cwd is None else f"/data/{self.path(cwd)}"
+        subprocess.run(["podman", "exec", "-w", workdir, self.name, "sh", "-c",
+                        " && ".join(shlex.join(c) for c in commands)], check=True)
+
+
+# The book preamble (and closing) comes from pandoc itself: a standalone
+# conversion of the title block plus one of each construct the chapters use
+# (highlighted code, tables, strikeout), so pandoc emits every macro and
+# package they need. Everything before the marker is the book's head.
+_BODY_MARKER = "COURSEPDFBODYMARKER"
+_PROBE = f"""{_BODY_MARKER}
+
+```bash
+podman
+```
+
+| a | b |
+|---|---|
+| 1 | 2 |
+
+~~x~~ [link](https://podman.io)
+"""
+
+
+def split_standalone(tex: str) -> tuple[str, str]:
+    """(head, tail) of a standalone pandoc conversion of the probe."""
+    return tex[:tex.index(_BODY_MARKER)], tex[tex.rindex("\\end{document}"):]
+
+
+# ---------------------------------------------------------------------------
+# Split rendering (--split)
+# ---------------------------------------------------------------------------
+#
+# Each chapter is compiled to its own PDF, concurrently, and the book is
+# stitched from those with pdfpages. Section numbering carries on across
+# chapters because each chapter starts with LaTeX's sectioning counters set
+# to where the previous chapters left them, counted from their cached .tex.
+# The TOC is rebuilt from the entries each chapter wrote to its .aux, with
+# pdfpages' addtotoc pointing them at the right pages. The chapters carry no
+# page numbers; the stitched book stamps its own. Links inside a chapter do
+# not survive pdfpages.
+
+SECTION_LEVELS = ("section", "subsection", "subsubsection", "paragraph", "subparagraph")
+_HEADING_RE = re.compile(r"\\(" + "|".join(SECTION_LEVELS) + r")\{")
+_TOC_ENTRY = "\\@writefile{toc}{"
+_TOC_DEPTH = 2      # matches --toc-depth in BOOK_ARGS
+_PDFPAGES = "pdfpages.sty"
+
+
+def advance_counters(lines: Iterable[str], counters: tuple) -> tuple:
+    """Sectioning counters after a chapter's LaTeX *lines*, starting from *counters*."""
+    values = list(counters)
+    for line in lines:
+        m = _HEADING_RE.match(line)
+        if not m:
+            continue
+        level = SECTION_LEVELS.index(m.group(1))
+        values[level] += 1
+        values[level + 1:] = [0] * (len(values) - level - 1)
+    return tuple(values)
+
+
+def _brace_group(text: str, start: int) -> tuple[str, int]:
+    """The balanced ``{...}`` group at *start*: (contents, index after it)."""
+    depth = 0
+    for i in range(start, len(text)):
+        if text[i] == "{" and text[i - 1] != "\\":
+            depth += 1
+        elif text[i] == "}" and text[i - 1] != "\\":
+            depth -= 1
+            if depth == 0:
+                return text[start + 1:i], i + 1
+    raise ValueError("unbalanced braces")
+
+
+def toc_entries(aux: str) -> list[tuple[str, str, str]]:
+    """(level, heading, page) of each TOC line a chapter wrote to its .aux."""
+    entries = []
+    pos = aux.find(_TOC_ENTRY)
+    while pos != -1:
+        body, end = _brace_group(aux, pos + len(_TOC_ENTRY) - 1)
+        if body.startswith("\\contentsline "):
+            # \contentsline {level}{heading}{page}{anchor}: adjacent groups.
+            args, at = [], body.index("{")
+            for _ in range(3):
+                arg, at = _brace_group(body, at)
+                args.append(arg)
+            level, heading, page = args
+            if level in SECTION_LEVELS[:_TOC_DEPTH]:
+                entries.append((level, heading, page))
+        pos = aux.find(_TOC_ENTRY, end)
+    return entries
+
+
+def chapter_wrapper(preamble: str, slug: str, counters: tuple) -> str:
+    """A document that typesets one cached chapter from *counters* on."""
+    setters = "".join(f"\\setcounter{{{name}}}{{{value}}}"
+                      for name, value in zip(SECTION_LEVELS, counters))
+    return (f"{preamble}\\begin{{document}}\n\\pagestyle{{empty}}\n{setters}\n"
+            f"\\input{{{slug}.tex}}\n\\end{{document}}\n")
+
+
+def include_chapter(slug: str, entries: list) -> str:
+    opts = "pages=-,pagecommand={\\thispagestyle{plain}}"
+    if entries:
+        opts += ",addtotoc={" + ",".join(
+            f"{page},{level},{SECTION_LEVELS.index(level) + 1},{{{heading}}},{slug}-{n}"
+            for n, (level, heading, page) in enumerate(entries)) + "}"
+    return f"\\includepdf[{opts}]{{chapters/{slug}.pdf}}\n"
+
+
+def run_parallel(container: Container, commands: list, jobs: int, cwd: Path | None = None) -> None:
+    """Spread *commands* (heaviest first) over up to *jobs* concurrent containers."""
+    batches = [commands[i::jobs] for i in range(min(jobs, len(commands)))]
+    if len(batches) <= 1:
+        if batches:
+            container.run(batches[0], cwd)
+        return
+    with ThreadPoolExecutor(max_workers=len(batches)) as pool:
+        for future in [pool.submit(container.run, batch, cwd) for batch in batches]:
+            future.result()
+
+
+# ---------------------------------------------------------------------------
+# Build
+# ---------------------------------------------------------------------------
+
+def build(root: Path = ROOT_DIR, *, force: bool = False, jobs: int = 1, split: bool = False,
+          container: Container | None = None, log=print) -> Path:
+    """Convert stale chapters, then compile dist/course_podman.pdf if anything changed.
+
+    With *split*, chapters are also compiled to their own PDFs (cached like
+    their LaTeX) and the book is stitched from them; *jobs* containers run
+    the conversions and chapter compiles concurrently.
+    """
+    container = container or Container(root)
+    out_dir = root / OUT_DIR.name
+    cache_dir = out_dir / CACHE_DIR.name
+    chapter_dir = cache_dir / "chapters"
+    chapter_dir.mkdir(parents=True, exist_ok=True)
+    out_pdf = out_dir / f"{BOOK_NAME}.pdf"
+
+    manifest = {} if force else load_manifest(cache_dir)
+    chapters = book_chapters(root)
+    known = manifest.get("sources", {})
+    sources = {p.as_posix(): source_digest(root, p, known)
+               for c in chapters for p in c.sources}
+    hashes = {c.slug: chapter_hash(c, sources, container.image) for c in chapters}
+    today = dt.date.today().isoformat()
+    # The preamble (hashed without the title block, so the date does not
+    # invalidate chapter PDFs) and the head with title and TOC.
+    preamble_hash = _hash(container.image, BOOK_ARGS, _PROBE)
+    head_hash = _hash(preamble_hash, front_matter(today))
+
+    cached = manifest.get("chapters", {})
+    stale = [c for c in chapters
+             if cached.get(c.slug) != hashes[c.slug]
+             or not (chapter_dir / f"{c.slug}.tex").exists()
+             or not (chapter_dir / f"{c.slug}.md").exists()]
+    id_filter = cache_dir / ID_PREFIX_FILTER_NAME
+    if stale and (not id_filter.exists() or read_text(id_filter) != ID_PREFIX_FILTER):
+        id_filter.write_text(ID_PREFIX_FILTER, encoding="utf-8")
+    commands = []
+    for c in stale:
+        md = chapter_dir / f"{c.slug}.md"
+        with open(md, "wb") as out:
+            c.write_markdown(out, root)
+        commands.append((md.stat().st_size, ["pandoc", container.path(md), "-o",
+                                             container.path(md.with_suffix(".tex")),
+                                             *PANDOC_ARGS, "--lua-filter",
+                                             container.path(id_filter),
+                                             "-M", f"chapter-id-prefix={c.slug}-"]))
+    head_md = cache_dir / "head.md"
+    if manifest.get("head") != head_hash or not (cache_dir / "head.tex").exists():
+        head_md.write_text(front_matter(today) + _PROBE, encoding="utf-8")
+        commands.append((0, ["pandoc", container.path(head_md), "-o",
+                             container.path(cache_dir / "head.tex"), "--standalone",
+                             *PANDOC_ARGS, *BOOK_ARGS]))
+    if commands:
+        start = time.perf_counter()
+        run_parallel(container, [cmd for _size, cmd in sorted(commands, key=lambda c: -c[0])],
+                     jobs)
+        log(f"Converted {len(stale)} chapter(s), {len(chapters) - len(stale)} cached "
+            f"({time.perf_counter() - start:.1f}s)")
+    else:
+        log(f"All {len(chapters)} chapters cached")
+
+    log(str(write_book_markdown(root, chapters, today)))
+
+    head, tail = split_standalone(read_text(cache_dir / "head.tex"))
+    book_tex = cache_dir / f"{BOOK_NAME}.tex"
+    pdf_hashes = manifest.get("pdfs", {})
+    if split:
+        preamble, front = head.split("\\begin{document}", 1)
+        counters = (0,) * len(SECTION_LEVELS)
+        compiles = []
+        for c in chapters:
+            tex = chapter_dir / f"{c.slug}.tex"
+            digest = _hash(preamble_hash, hashes[c.slug], counters)
+            if pdf_hashes.get(c.slug) != digest or not (chapter_dir / f"{c.slug}.pdf").exists():
+                wrapper = chapter_dir / f"{c.slug}.book.tex"
+                wrapper.write_text(chapter_wrapper(preamble, c.slug, counters), encoding="utf-8")
+                compiles.append((tex.stat().st_size, c.slug, [*PDFLATEX, f"-jobname={c.slug}", wrapper.name]))
+            pdf_hashes[c.slug] = digest
+            with open(tex, encoding="utf-8") as lines:
+                counters = advance_counters(lines, counters)
+        if compiles:
+            start = time.perf_counter()
+            run_parallel(container, [cmd for *_key, cmd in sorted(compiles, reverse=True)],
+                         jobs, cwd=chapter_dir)
+            log(f"Compiled {len(compiles)} chapter PDF(s) with {min(jobs, len(compiles))} "
+                f"container(s) ({time.perf_counter() - start:.1f}s)")
+        body = "".join(include_chapter(c.slug, toc_entries(read_text(chapter_dir / f"{c.slug}.aux")))
+                       for c in chapters)
+        book = f"{preamble}\\usepackage{{pdfpages}}\n\\begin{{document}}{front}{body}{tail}"
+        # pandoc/latex ships a minimal TeX Live; fetch pdfpages if it is missing.
+        setup = [["sh", "-c", f"kpsewhich {_PDFPAGES} >/dev/null || tlmgr install pdfpages eso-pic"]]
+    else:
+        book = head + "".join(f"\\input{{chapters/{c.slug}.tex}}\n" for c in chapters) + tail
+        setup = []
+
+    book_hash = _hash(head_hash, split, [pdf_hashes[c.slug] if split else hashes[c.slug]
+                                         for c in chapters])
+    if manifest.get("book") != book_hash or not out_pdf.exists():
+        book_tex.write_text(book, encoding="utf-8")
+        # Two passes: the first writes the .toc the second typesets.
+        start = time.perf_counter()
+        latex = [*PDFLATEX, book_tex.name]
+        container.run([*setup, latex, latex], cwd=cache_dir)
+        shutil.copyfile(book_tex.with_suffix(".pdf"), out_pdf)
+        log(f"Compiled {out_pdf.name} ({time.perf_counter() - start:.1f}s)")
+
+    # Drop the cache files of chapters that left the book.
+    slugs = {c.slug for c in chapters}
+    for p in chapter_dir.iterdir():
+        if p.name.split(".", 1)[0] not in slugs:
+            p.unlink()
+    save_manifest(cache_dir, {"sources": sources, "chapters": hashes, "pdfs": pdf_hashes,
+                              "head": head_hash, "book": book_hash})
+    return out_pdf
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build the course PDF.")
+    parser.add_argument("-f", "--force", action="store_true",
+                        help=f"ignore {CACHE_DIR.relative_to(ROOT_DIR)}/ and rebuild everything")
+    parser.add_argument("--image", default=PANDOC_IMAGE,
+                        help=f"pandoc/LaTeX container image (default: {PANDOC_IMAGE})")
+    parser.add_argument("--split", action="store_true",
+                        help="compile each chapter to its own PDF and stitch the book from "
+                             "them, so only changed chapters go through LaTeX")
+    parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count() or 1,
+                        help="concurrent containers (or execs, with --warm) for pandoc and "
+                             "chapter compiles (default: one per CPU)")
+    parser.add_argument("--warm", action="store_true",
+                        help="exec into a long-lived container (started on first use) with a "
+                             "persistent TeX cache volume instead of one container per step")
+    parser.add_argument("--stop-warm", action="store_true",
+                        help="remove the --warm container and exit")
+    args = parser.parse_args()
+
+    container_type = WarmContainer if args.warm or args.stop_warm else Container
+    container = container_type(image=args.image)
+    if args.stop_warm:
+        container.stop()
+        sys.exit(0)
+
+    try:
+        pdf = build(force=args.force, jobs=max(1, args.jobs), split=args.split,
+                    container=container)
+    except subprocess.CalledProcessError as exc:
+        sys.exit(f"error: container command failed (exit {exc.returncode})")
+    print(f"Wrote: {pdf}")
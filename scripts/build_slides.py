@@ -2,11 +2,32 @@
 """
 build_slides.py — Generate one ODP per module from course content.
 
+Slide content is read from slides/src/<module>.json (order in index.json).
+
 Uses the odfpy library (python-odf) to produce valid OpenDocument Presentation
 files with a dark theme and full instructor notes on every slide.
 
 Run:
-    python3 scripts/build_slides.py
+    python3 scripts/build_slides.py [OUT_DIR] [--jobs N] [--force] [--backend stream]
+    python3 scripts/build_slides.py --module 06-networking     # one deck only
+    python3 scripts/build_slides.py --only-combined
+    python3 scripts/build_slides.py -m 06-networking --slides 2:4   # preview a range
+    python3 scripts/build_slides.py --watch     # rebuild on every save in slides/src
+
+Decks whose slides, theme and generator version are unchanged since the last
+run (tracked in OUT_DIR/.build-manifest.json) are skipped; --force rebuilds the selected decks.
+--verify-backends checks that the odfpy and streaming writers agree.
+--source markdown derives the decks from modules/*.md (into slides/markdown/)
+instead of the curated slides/src/*.json.
+--notes flow emits each notes block as one paragraph instead of hard-wrapping.
+--overflow split continues slides whose bullets overflow the body frame on
+extra slides (by default they are only listed; see "Text fit" below).
+--compression store|fast|default|max picks the zip level (store for quick local
+iteration, max for dist/); --compression-report prints each deck's tradeoff.
+--reproducible (implied by $SOURCE_DATE_EPOCH) gives byte-identical decks for
+unchanged slides.
+--profile [FILE] records per-deck and per-phase timings, sizes and peak RSS
+as JSON; --cprofile FILE adds a cProfile dump.
 Output (one file per module):
     slides/00-setup.odp
     slides/01-containers-101.odp
@@ -15,18 +36,43 @@ Output (one file per module):
     slides/podman-course.odp  (full combined deck)
 """
 
+import argparse
+import contextlib
+import copy
+import cProfile
+import ctypes
+import ctypes.util
+import difflib
+import functools
+import hashlib
+import io
+import json
 import os
+import re
+import resource
+import select
+import struct
+import sys
 import textwrap
+import time
+import zipfile
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field, replace
+from xml.etree.ElementTree import canonicalize
+from xml.sax.saxutils import escape as xml_escape
 from odf.opendocument import OpenDocumentPresentation
 from odf.style import (
     Style, MasterPage, PageLayout, PageLayoutProperties,
     TextProperties, GraphicProperties, DrawingPageProperties,
 )
-from odf.text import P, Span
+from odf.text import LineBreak, P, Span
 from odf.draw import Frame, TextBox, Page
 from odf.presentation import Notes
 from odf.namespaces import PRESENTATIONNS
 
+import course_source
+
 
 # ---------------------------------------------------------------------------
 # Colour palette (dark theme)
@@ -42,1714 +88,1847 @@ WHITE        = "#ffffff"
 SLIDE_W = "25.4cm"
 SLIDE_H = "14.29cm"
 
+BODY_FONT = "Liberation Sans"   # Impress's default; the bullet style names none
+CODE_FONT = "Liberation Mono"
+BULLET_PT = 15
+CODE_PT = 13
+
+# Bump whenever the builder's output changes for the same slide content, so
+# incremental builds (see MANIFEST_NAME) know to regenerate every deck.
+GENERATOR_VERSION = "5"
+MANIFEST_NAME = ".build-manifest.json"
+COMBINED_KEY = "podman-course"
+
+
+# ---------------------------------------------------------------------------
+# Build profiling (--profile)
+# ---------------------------------------------------------------------------
+
+class PhaseTimer:
+    """Accumulates wall time per named build phase while enabled.
+
+    Disabled (the default) it hands out a no-op context manager, so the
+    instrumented hot paths cost one attribute check per call.
+    """
+
+    def __init__(self) -> None:
+        self.enabled = False
+        self.totals: dict[str, float] = {}
+
+    def __call__(self, name: str):
+        return self._timed(name) if self.enabled else contextlib.nullcontext()
+
+    @contextlib.contextmanager
+    def _timed(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.totals[name] = self.totals.get(name, 0.0) + time.perf_counter() - start
+
+    def take(self) -> dict[str, float]:
+        """Return and reset the accumulated totals."""
+        totals, self.totals = self.totals, {}
+        return totals
+
+    @contextlib.contextmanager
+    def separate(self):
+        """Collect phases inside the block apart from the enclosing totals.
+
+        Yields the dict that receives the block's own phases.
+        """
+        outer, self.totals = self.totals, {}
+        inner = self.totals
+        try:
+            yield inner
+        finally:
+            self.totals = outer
+
+
+PHASES = PhaseTimer()
+
+
+def peak_rss_kb(who: int = resource.RUSAGE_SELF) -> int:
+    """High-water resident set size in KiB (ru_maxrss is bytes on macOS)."""
+    rss = resource.getrusage(who).ru_maxrss
+    return rss // 1024 if sys.platform == "darwin" else rss
+
+
+@dataclass
+class DeckResult:
+    path: str
+    slides: int
+    seconds: float
+    phases: dict = field(default_factory=dict)
+    peak_rss_kb: int = 0
+
 
 # ---------------------------------------------------------------------------
 # Slide content
 # ---------------------------------------------------------------------------
+#
+# Slides live in slides/src/: one JSON file per deck holding a list of slide
+# dicts, plus index.json giving the deck order. Files are read on first use
+# and kept in parsed form, so building one module only reads its own file.
+#
+# --source markdown derives the decks from modules/*.md instead, through the
+# parse shared with the PDF build (course_source.py): one deck per module in
+# MODULES.md, a section slide from the "#" title and a slide per "##"/"###"
+# heading, with its lists, tables and fenced code as bullets and its prose
+# as presenter notes. The curated JSON slides remain the default.
+#
+# Either way each slide is checked against the Slide model as it loads, so
+# a misspelt key or a wrong type stops the build with the file and slide
+# number instead of rendering a blank frame.
 
-SLIDES = [
-
-    # ──────────────────────────────────────────────────────────────
-    # TITLE SLIDE
-    # ──────────────────────────────────────────────────────────────
-    {
-        "module": "intro",
-        "type": "title",
-        "title": "Podman: Zero to Production",
-        "subtitle": "Rootless Containers · systemd · Quadlet · Security",
-        "notes": (
-            "Welcome everyone. This course takes you from never having typed 'podman' "
-            "all the way to running reboot-safe, secret-aware production services on a "
-            "Fedora or RHEL system. We use rootless Podman throughout — that means you "
-            "never need root to run containers, which is both safer and more practical "
-            "for most teams. By the end you will be able to deploy a multi-service stack "
-            "that survives reboots, handles secrets securely, and can be upgraded or "
-            "rolled back with a documented procedure. Let's get started."
-        ),
-    },
-
-    # ──────────────────────────────────────────────────────────────
-    # COURSE OVERVIEW
-    # ──────────────────────────────────────────────────────────────
-    {
-        "module": "intro",
-        "type": "content",
-        "title": "Course Map",
-        "bullets": [
-            "Foundations  (Modules 00-03):  setup, concepts, commands, images",
-            "Intermediate (Modules 04-07):  secrets, storage, networking, pods",
-            "Production   (Modules 08-11):  building images, Quadlet, multi-service",
-            "Operations   (Modules 12-14):  security, troubleshooting, auto-updates",
-            "Capstone     (Module 80):      full stack with backups & upgrades",
-            "Optional     (Module 90):      external secrets survey",
-        ],
-        "notes": (
-            "Here is the shape of the course. We move from the bare minimum to get "
-            "Podman running all the way to a production-quality deployment workflow. "
-            "Each module has labs — hands-on commands you run yourself. There is also "
-            "a capstone project that ties everything together into a reboot-safe stack "
-            "with real secrets, backups, and a documented upgrade procedure. "
-            "Module 90 on external secrets is optional but recommended if your team "
-            "will eventually use Vault or SOPS. Total course time is roughly 30-50 hours "
-            "including all labs."
-        ),
-    },
-    {
-        "module": "intro",
-        "type": "content",
-        "title": "What We Cover (and What We Don't)",
-        "bullets": [
-            "YES:  Single-host rootless Podman on Fedora / RHEL",
-            "YES:  systemd integration via Quadlet (production baseline)",
-            "YES:  Secrets, volumes, networking, security hardening",
-            "YES:  Troubleshooting methodology + failure drills",
-            "NO:   Kubernetes / OpenShift orchestration",
-            "NO:   CI/CD pipelines (only image build patterns)",
-            "NO:   Cloud-provider-specific tooling",
-        ],
-        "notes": (
-            "Be explicit with students about scope. This is a single-host Podman course. "
-            "If someone asks how this maps to Kubernetes — the concepts map well "
-            "(images, volumes, secrets, health checks) but the tooling is different. "
-            "We deliberately skip CI/CD pipelines; the course teaches you how to build "
-            "and tag images correctly so that any pipeline can pick them up. "
-            "The Quadlet + systemd approach is the Linux-native alternative to Docker Compose "
-            "and is the right baseline for RHEL-family systems."
-        ),
-    },
-
-    # ──────────────────────────────────────────────────────────────
-    # MODULE 00 — SETUP
-    # ──────────────────────────────────────────────────────────────
-    {
-        "module": "00-setup",
-        "type": "section",
-        "title": "Module 00",
-        "subtitle": "Setup — Fedora / RHEL + systemd   (30-60 min)",
-        "notes": (
-            "Module 00 is pure setup. Its only job is to get everyone to a working "
-            "rootless Podman before the real learning begins. The three hard blockers "
-            "are: cgroups v2 not enabled, missing subuid/subgid ranges, and SELinux "
-            "in enforcing mode causing unexpected permission denials. Walk through each "
-            "check as a group so no one falls behind."
-        ),
-    },
-    {
-        "module": "00-setup",
-        "type": "content",
-        "title": "Install and Verify",
-        "bullets": [
-            "sudo dnf install -y podman",
-            "podman --version        (record it)",
-            "podman info             (verify host config)",
-            "podman info --format '{{.Host.CgroupsVersion}}'   must be: v2",
-            "cgroups v2 is required for Quadlet — check before anything else",
-        ],
-        "notes": (
-            "On Fedora 40+ and RHEL 9+ cgroups v2 is the default. On older systems "
-            "you may need to add systemd.unified_cgroup_hierarchy=1 to the kernel "
-            "command line and reboot. Quadlet will not work without cgroups v2, so "
-            "this check is mandatory. Record the Podman version now — it is the first "
-            "thing to share when filing a bug report or asking for help."
-        ),
-    },
-    {
-        "module": "00-setup",
-        "type": "content",
-        "title": "Rootless Prerequisites",
-        "bullets": [
-            "grep \"^$USER:\" /etc/subuid /etc/subgid   (need 65536+ UIDs)",
-            "If missing:  sudo usermod --add-subuids 100000-165535 $USER",
-            "Log out and back in after adding subuid/subgid ranges",
-            "SELinux check:  getenforce   (Enforcing is fine — don't disable it)",
-            "First container: podman run --rm docker.io/library/alpine:latest uname -a",
-        ],
-        "notes": (
-            "Rootless containers rely on user namespaces. The kernel needs a range of "
-            "subordinate UIDs/GIDs mapped to your user so that processes inside the "
-            "container can have their own UID space. Without these ranges, Podman will "
-            "fail with a cryptic namespace error. The range 100000-165535 gives 65536 "
-            "UIDs which is the minimum Podman expects. "
-            "SELinux: never tell students to set it to permissive. Instead teach them "
-            "the :Z bind-mount label which is covered in Module 05."
-        ),
-    },
-    {
-        "module": "00-setup",
-        "type": "lab",
-        "title": "Lab 00: Workspace Setup",
-        "bullets": [
-            "mkdir -p ~/course_podman-labs && cd ~/course_podman-labs",
-            "podman run --rm docker.io/library/alpine:latest uname -a",
-            "Checkpoint: 'podman info' runs without errors",
-            "Checkpoint: cgroups version reports v2",
-            "Checkpoint: first container runs without sudo",
-        ],
-        "notes": (
-            "Give students 10 minutes for this lab. The most common failure is a "
-            "missing network connection to docker.io — if the pull hangs, check proxy "
-            "settings or try 'podman pull docker.io/library/alpine:latest' explicitly "
-            "to see the error. Second most common: missing subuid entries. Have the "
-            "fix command ready on screen. Once everyone has a working uname -a output "
-            "from inside a container, the group is ready for Module 01."
-        ),
-    },
-
-    # ──────────────────────────────────────────────────────────────
-    # MODULE 01 — CONTAINERS 101
-    # ──────────────────────────────────────────────────────────────
-    {
-        "module": "01-containers-101",
-        "type": "section",
-        "title": "Module 01",
-        "subtitle": "Containers 101 — Concepts   (30-45 min)",
-        "notes": (
-            "Module 01 is intentionally conceptual. Resist the urge to rush through it "
-            "to get to commands. The mental model built here — image vs container, "
-            "namespaces vs cgroups, rootless vs rootful — pays off every time a student "
-            "debugs a weird permission issue in module 05 or a network issue in module 06."
-        ),
-    },
-    {
-        "module": "01-containers-101",
-        "type": "content",
-        "title": "Image vs Container vs Registry",
-        "bullets": [
-            "Image — immutable template (layers + config)",
-            "Container — running (or stopped) instance of an image",
-            "Registry — where images live (Docker Hub, Quay, internal)",
-            "Container has: a process, writable layer, mounts, network settings",
-            "The kernel is shared — a container is NOT a VM",
-        ],
-        "notes": (
-            "The 'not a VM' point is crucial and comes up in security discussions later. "
-            "A container shares the host kernel. If the kernel has a privilege-escalation "
-            "bug and the container is running as root with extra capabilities, that is a "
-            "real threat. This is exactly why rootless plus non-root-inside-container matters. "
-            "Common analogy: an image is a class definition; a container is an instance. "
-            "Deleting the container does not delete the image, just like deleting an object "
-            "does not delete the class."
-        ),
-    },
-    {
-        "module": "01-containers-101",
-        "type": "content",
-        "title": "Rootless vs Rootful",
-        "bullets": [
-            "Rootless: container daemon and processes run as your user account",
-            "A breakout gains your user's privileges — not host root",
-            "Developers can run containers without handing them sudo",
-            "Tradeoff: ports below 1024 need extra setup, UID mapping can confuse",
-            "Rule: rootless by default; rootful only when you can explain why",
-        ],
-        "notes": (
-            "This slide is the security foundation of the whole course. Every time "
-            "a student asks why they can not just use sudo, refer back here. "
-            "The threat model: if an attacker can escape the container (kernel CVE, "
-            "misconfigured volume), rootless limits blast radius to your user account "
-            "rather than full host root. "
-            "For the low-port question: the recommended production pattern is a high port "
-            "for the container plus a reverse proxy (nginx, Caddy) in front. This is covered "
-            "in Module 06. The sysctl approach is a last resort."
-        ),
-    },
-    {
-        "module": "01-containers-101",
-        "type": "lab",
-        "title": "Lab 01: Compare Host vs Container",
-        "bullets": [
-            "uname -a                                        (host kernel)",
-            "podman run --rm alpine:latest uname -a          (same kernel!)",
-            "podman run --rm alpine:latest ps -ef             (tiny process tree)",
-            "podman create --name c101 alpine:latest sleep 300",
-            "podman inspect c101 | less   (note: image, mounts, network, user)",
-            "podman rm c101",
-        ],
-        "notes": (
-            "The key learning moment is the uname output being identical — same kernel "
-            "version on host and container. This makes the 'not a VM' point visceral. "
-            "The inspect exercise teaches students where to look when debugging: the JSON "
-            "blob from podman inspect contains everything Podman knows about a container. "
-            "Ask students: what user is the container running as? They should find it "
-            "in the Config.User field. If it is empty string, that means root inside "
-            "the container — a problem fixed in Module 08."
-        ),
-    },
-
-    # ──────────────────────────────────────────────────────────────
-    # MODULE 02 — EVERYDAY COMMANDS
-    # ──────────────────────────────────────────────────────────────
-    {
-        "module": "02-everyday-commands",
-        "type": "section",
-        "title": "Module 02",
-        "subtitle": "Everyday Podman Commands   (60-90 min)",
-        "notes": (
-            "Module 02 is muscle memory. Students will type these commands hundreds of "
-            "times. The goal is fluency: run, ps, logs, exec, stop, rm — and knowing "
-            "when to use each. The writable-layer lab is the single most important "
-            "concept in this module: data written to the container filesystem is gone "
-            "when the container is removed."
-        ),
-    },
-    {
-        "module": "02-everyday-commands",
-        "type": "content",
-        "title": "Core Lifecycle Commands",
-        "bullets": [
-            "podman run --rm alpine echo hello             # run and auto-remove",
-            "podman run -d --name web nginx:stable         # detached, named",
-            "podman ps / podman ps -a                      # list running / all",
-            "podman logs web                               # app stdout/stderr",
-            "podman exec -it web sh                        # shell inside container",
-            "podman stop web / podman rm -f web            # stop / force remove",
-        ],
-        "notes": (
-            "Emphasise --rm for ephemeral containers. Every lab should use --rm "
-            "unless you specifically want to inspect the stopped state. Students who "
-            "skip --rm end up with dozens of stopped containers clogging podman ps -a. "
-            "podman exec -it is the single most-used debug tool. Ask: what do you do "
-            "if the container has no shell? Answer: use a sidecar on the same network "
-            "(Module 07) or --network container:<name> to share the namespace. "
-            "Exit codes: podman inspect --format {{.State.ExitCode}} is how you "
-            "programmatically check why a container died."
-        ),
-    },
-    {
-        "module": "02-everyday-commands",
-        "type": "lab",
-        "title": "Lab 02: The Writable Layer Is Not Persistence",
-        "bullets": [
-            "1.  podman run -it --name scratch alpine sh",
-            "    Inside: echo hi > /tmp/hello.txt && exit",
-            "2.  podman rm scratch",
-            "3.  podman run -it --name scratch alpine sh",
-            "    Inside: ls -la /tmp/hello.txt   ->  file is GONE",
-            "Key insight: use volumes for anything you need to keep",
-        ],
-        "notes": (
-            "This lab creates a memorable aha moment. Students who have used Docker "
-            "with bind mounts may already know this, but it is worth reinforcing. "
-            "The correct mental model: the writable layer is scratch space for the container. "
-            "It is gone when the container is gone. "
-            "Follow up with the naming lab: run two containers with names a1 and a2, "
-            "then try to create a third container called a1 — the error teaches why "
-            "stable naming matters for scripts and automation."
-        ),
-    },
-    {
-        "module": "02-everyday-commands",
-        "type": "content",
-        "title": "Cleanup Commands",
-        "bullets": [
-            "podman container prune     # remove all stopped containers",
-            "podman image prune         # remove dangling images",
-            "podman system df           # see disk usage at a glance",
-            "podman system prune        # remove ALL unused objects — use with care",
-            "Tip: know what prune will remove before running it",
-        ],
-        "notes": (
-            "Production tip: add podman container prune to a weekly cron/timer to "
-            "keep stopped containers from accumulating. podman system prune can "
-            "delete unnamed volumes containing data you care about — always check "
-            "podman volume ls first. "
-            "Common interview question: how do you free up disk space from containers? "
-            "Correct answer: check df first, then prune images (largest savings), "
-            "then containers, and never blindly prune volumes."
-        ),
-    },
-
-    # ──────────────────────────────────────────────────────────────
-    # MODULE 03 — IMAGES & REGISTRIES
-    # ──────────────────────────────────────────────────────────────
-    {
-        "module": "03-images-registries",
-        "type": "section",
-        "title": "Module 03",
-        "subtitle": "Images and Registries   (60-90 min)",
-        "notes": (
-            "Module 03 teaches image hygiene. The two big ideas: always use fully "
-            "qualified image names, and prefer digests over tags for anything that "
-            "matters. Both habits prevent whole categories of bugs and security incidents."
-        ),
-    },
-    {
-        "module": "03-images-registries",
-        "type": "content",
-        "title": "Tags vs Digests",
-        "bullets": [
-            "Tag (:latest, :stable) — mutable pointer, can change silently",
-            "Digest (@sha256:...) — content-addressed, immutable",
-            "Production rule: pin by digest for reproducibility and audit",
-            "podman images --digests | grep nginx",
-            "podman run docker.io/library/nginx@sha256:<digest>",
-        ],
-        "notes": (
-            "Classic failure mode: deploy with :latest, it works. Three weeks later "
-            "upstream publishes a new :latest with a breaking change. Your next deploy "
-            "silently picks up the new image and the service breaks. Digest pinning "
-            "prevents this entirely. The trade-off is that you have to actively update "
-            "digests to get security patches — that is the auto-update topic in Module 14. "
-            "For incident response: if you record the digest you deployed, you can always "
-            "reproduce the exact image that was running, even if tags have moved."
-        ),
-    },
-    {
-        "module": "03-images-registries",
-        "type": "content",
-        "title": "Fully Qualified Image Names",
-        "bullets": [
-            "Avoid: alpine:latest             (ambiguous — which registry?)",
-            "Prefer: docker.io/library/alpine:latest",
-            "Short-name resolution rules vary by /etc/containers/registries.conf",
-            "ENTRYPOINT vs CMD: podman image inspect nginx:stable --format '{{.Config.Entrypoint}}'",
-            "In scripts and unit files: always use fully qualified names",
-        ],
-        "notes": (
-            "Short names are convenient interactively but dangerous in automation. "
-            "On Fedora the default short-name aliases list is in /etc/containers/registries.conf.d/. "
-            "Different distros or custom configs can resolve 'alpine' to a completely different "
-            "registry. In scripts, Containerfiles, and Quadlet units: always use the fully "
-            "qualified form. The ENTRYPOINT vs CMD distinction matters when you try to "
-            "override the command at runtime — if an image has ENTRYPOINT set, "
-            "podman run image mycommand appends to the entrypoint rather than replacing it."
-        ),
-    },
-    {
-        "module": "03-images-registries",
-        "type": "lab",
-        "title": "Lab 03: Pull, Inspect, Digest",
-        "bullets": [
-            "podman pull docker.io/library/nginx:stable",
-            "podman images --digests | grep nginx     (record the sha256)",
-            "podman run --rm docker.io/library/nginx@sha256:<digest> nginx -v",
-            "Optional: local registry -> tag -> push -> rmi -> pull back",
-            "Checkpoint: can run an image by digest without specifying a tag",
-        ],
-        "notes": (
-            "Walk students through finding the digest in the podman images --digests output. "
-            "The format is sha256: followed by 64 hex characters. Copy it to a file — "
-            "they will need it again when they do digest pinning in the capstone. "
-            "The optional local registry lab is valuable for teams that have a private "
-            "registry. The push/pull flow (tag, push, rmi, pull) teaches the full "
-            "promotion pipeline in miniature. Flag: --tls-verify=false is only for "
-            "this lab; never use it in production."
-        ),
-    },
-
-    # ──────────────────────────────────────────────────────────────
-    # MODULE 04 — SECRETS
-    # ──────────────────────────────────────────────────────────────
-    {
-        "module": "04-secrets",
-        "type": "section",
-        "title": "Module 04",
-        "subtitle": "Secrets (Local-First)   (60-90 min)",
-        "notes": (
-            "Module 04 breaks one of the most deeply ingrained bad habits in container "
-            "deployments: putting passwords in environment variables. Once students do "
-            "Lab A2 (proving the secret is not in the environment), the correct pattern "
-            "becomes intuitive. The rotation lab is equally important — secrets that "
-            "cannot be rotated become permanent liabilities."
-        ),
-    },
-    {
-        "module": "04-secrets",
-        "type": "content",
-        "title": "Why Not Environment Variables?",
-        "bullets": [
-            "Env vars appear in: process listings, podman inspect, crash dumps, logs",
-            "'-e DB_PASSWORD=...' is visible to any user who can run ps",
-            "'.env' files get accidentally committed to git",
-            "Podman secrets: named blob mounted as a file at /run/secrets/<name>",
-            "App reads the file — never an environment variable",
-        ],
-        "notes": (
-            "Show students how to find env vars on a running system: "
-            "cat /proc/<pid>/environ (as root). Then show that with secrets as files "
-            "the password does not appear there. The process listing visibility is "
-            "the most compelling demo: run a container with -e DB_PASSWORD=supersecret "
-            "then from another terminal do podman inspect and search for PASSWORD. "
-            "It is right there in the JSON. Then do the same with a mounted secret — it "
-            "is completely absent from the inspect output."
-        ),
-    },
-    {
-        "module": "04-secrets",
-        "type": "content",
-        "title": "Podman Secret Commands",
-        "bullets": [
-            "printf '%s' 'mypassword' | podman secret create db_password -",
-            "podman secret ls / podman secret inspect db_password",
-            "podman run --rm --secret db_password alpine sh -lc 'ls /run/secrets'",
-            "Custom path: --secret db_password,target=db.pass",
-            "Rotation: versioned names — db_password_v1 -> db_password_v2",
-        ],
-        "notes": (
-            "The printf %s idiom avoids a trailing newline which would corrupt the "
-            "secret value. Some apps are strict about newlines in passwords. "
-            "Never use 'echo password' — it adds a newline. "
-            "Teach the rotation pattern by name: create v2, update the consumer to "
-            "reference v2, restart, verify, then delete v1. This is the only safe "
-            "rotation flow. Deleting v1 before verifying v2 works means you cannot "
-            "roll back. The rule: keep the old secret until rollback is no longer needed."
-        ),
-    },
-    {
-        "module": "04-secrets",
-        "type": "lab",
-        "title": "Lab 04: Create, Mount, and Rotate a Secret",
-        "bullets": [
-            "1.  printf '%s' 'correct-horse-battery' | podman secret create db_password -",
-            "2.  podman run --rm --secret db_password busybox sh -lc 'test -f /run/secrets/db_password && echo OK'",
-            "3.  Prove not env var: podman run ... busybox env | grep -i password   (nothing!)",
-            "4.  Rotation: create db_password_v2, switch container, verify, remove v1",
-        ],
-        "notes": (
-            "Lab step 3 is the most important: asking students to prove the absence of "
-            "the secret from the environment builds the 'verify, don't assume' habit. "
-            "For the rotation lab, have students explicitly run a container with v1, "
-            "then switch to v2 and run again. Ask: what would happen if v2 was wrong? "
-            "Answer: the app would fail to start and they could roll back by switching "
-            "back to v1 — which is still there. This is why we keep v1 around."
-        ),
-    },
-
-    # ──────────────────────────────────────────────────────────────
-    # MODULE 05 — STORAGE
-    # ──────────────────────────────────────────────────────────────
-    {
-        "module": "05-storage",
-        "type": "section",
-        "title": "Module 05",
-        "subtitle": "Storage — Volumes, Bind Mounts, Permissions   (60-90 min)",
-        "notes": (
-            "Storage is where rootless Podman trips up most new users. The UID mapping "
-            "inside user namespaces makes permissions behave unexpectedly. 'podman unshare' "
-            "is the key debugging tool — teach it early and students can self-diagnose. "
-            "SELinux on Fedora/RHEL is the other common friction point: :Z is the fix "
-            "for bind mounts, volumes usually just work."
-        ),
-    },
-    {
-        "module": "05-storage",
-        "type": "content",
-        "title": "Three Storage Types",
-        "bullets": [
-            "Writable layer — per container, gone when container is removed",
-            "Named volume — Podman-managed, persists independently of containers",
-            "Bind mount — you specify the exact host path",
-            "Rule: volumes for databases/state, bind mounts for config/source code",
-            "Never write important data into the writable layer",
-        ],
-        "notes": (
-            "For named volumes: Podman stores them in ~/.local/share/containers/storage/volumes/. "
-            "Find the actual path with: podman volume inspect dbdata --format {{.Mountpoint}}. "
-            "Key advantage of named volumes over bind mounts: the container initialises "
-            "ownership when it first writes to the volume. With bind mounts you have to "
-            "manually ensure permissions match what the container process expects. "
-            "For databases: always use a named volume. Never a bind mount for DB data "
-            "in production — ownership problems are too common."
-        ),
-    },
-    {
-        "module": "05-storage",
-        "type": "content",
-        "title": "SELinux and Rootless Permissions",
-        "bullets": [
-            "Bind mount without label: may fail with permission denied on Fedora/RHEL",
-            "Fix private:  -v ./data:/mnt:Z   (relabelled for this container only)",
-            "Fix shared:   -v ./data:/mnt:z   (shared across containers)",
-            "Never: chmod 777 or setenforce 0 — fix the root cause",
-            "Debug: podman unshare ls -la <path>   (view inside user namespace)",
-        ],
-        "notes": (
-            "The :Z vs :z distinction: uppercase Z means private — only this container "
-            "can access this mount. Lowercase z means shared — multiple containers can "
-            "access it. In most cases use uppercase Z. "
-            "podman unshare is magical for debugging: it opens a shell inside the same "
-            "user namespace that containers use. Run podman unshare ls -la /path to see "
-            "what the container process actually sees. "
-            "Common failure: host path is owned by root:root mode 700. The container "
-            "process runs as UID 0 inside (mapped to your user outside) but has no write "
-            "access. Fix: podman unshare chown -R 1000:1000 /path where 1000 is the "
-            "UID the container runs as."
-        ),
-    },
-    {
-        "module": "05-storage",
-        "type": "lab",
-        "title": "Lab 05: Persistent Volume Demo",
-        "bullets": [
-            "podman volume create dbdata",
-            "podman run --rm -v dbdata:/data alpine sh -lc 'echo hi > /data/x'",
-            "podman run --rm -v dbdata:/data alpine sh -lc 'cat /data/x'     ->  hi",
-            "Remove the container — then re-run the cat — data is STILL there",
-            "SELinux drill: try bind mount without :Z, observe error, add :Z",
-        ],
-        "notes": (
-            "This lab makes volume persistence concrete in one minute. "
-            "Run the echo, destroy the container, run the cat — data survives. "
-            "This is the fundamental difference between a volume and the writable layer. "
-            "The SELinux drill is optional but highly recommended on Fedora/RHEL. "
-            "Tell students: trigger the error on purpose, read the error message, then "
-            "fix it. Building the habit of reading errors rather than immediately "
-            "Googling is one of the most valuable meta-skills in this course."
-        ),
-    },
-
-    # ──────────────────────────────────────────────────────────────
-    # MODULE 06 — NETWORKING
-    # ──────────────────────────────────────────────────────────────
-    {
-        "module": "06-networking",
-        "type": "section",
-        "title": "Module 06",
-        "subtitle": "Networking — Ports, DNS, Networks   (2-3 hours)",
-        "notes": (
-            "Module 06 is the largest module in the course and the most common source "
-            "of production bugs. The key insight is that user-defined networks enable "
-            "DNS-based service discovery; the default network does not. Build that "
-            "intuition early and the rest of the module flows naturally."
-        ),
-    },
-    {
-        "module": "06-networking",
-        "type": "content",
-        "title": "How Container Networking Works",
-        "bullets": [
-            "Each container gets its own network namespace",
-            "Virtual ethernet pair (veth) connects container to bridge",
-            "User-defined network: DNS enabled — containers find each other by name",
-            "Default 'podman' bridge: NO automatic DNS (use named networks!)",
-            "Rootless helpers: pasta (preferred, modern) or slirp4netns",
-        ],
-        "notes": (
-            "Mental model: think of a user-defined network as a private LAN segment. "
-            "Every container on that segment gets a private IP and a DNS entry matching "
-            "its container name. The Podman DNS resolver (aardvark-dns) handles the DNS. "
-            "The default network is a legacy artifact — it has no DNS, so containers "
-            "cannot find each other by name. Always create explicit named networks. "
-            "Check your rootless backend: podman info --format {{.Host.NetworkBackend}}. "
-            "Pasta is newer and handles UDP/ICMP more cleanly than slirp4netns."
-        ),
-    },
-    {
-        "module": "06-networking",
-        "type": "content",
-        "title": "Port Publishing Patterns",
-        "bullets": [
-            "-p 8080:80              all interfaces (0.0.0.0) — default",
-            "-p 127.0.0.1:8080:80   loopback only — safer for internal services",
-            "-p 8080:80 -p 8443:443  multiple ports",
-            "-p 80                   random host port (ephemeral)",
-            "podman port <name>      see what is published",
-        ],
-        "notes": (
-            "Security principle: bind to the most restrictive address that still meets "
-            "your requirements. Internal APIs should bind to 127.0.0.1. "
-            "Only the reverse proxy should bind to 0.0.0.0. "
-            "In production: DB never publishes a port at all — it lives on an internal "
-            "network only accessible to the app tier. This is the network segmentation "
-            "pattern covered in the three-tier lab. "
-            "Rootless note: ports below 1024 need sysctl net.ipv4.ip_unprivileged_port_start "
-            "or a reverse proxy. The reverse proxy approach is always preferred."
-        ),
-    },
-    {
-        "module": "06-networking",
-        "type": "content",
-        "title": "User-Defined Networks and DNS",
-        "bullets": [
-            "podman network create appnet",
-            "podman run -d --name db --network appnet postgres:16-alpine",
-            "podman run -d --name app --network appnet myapp:latest",
-            "Inside 'app': getent hosts db   ->  resolves to db container's IP",
-            "Network aliases: --network-alias db   (role-based names)",
-        ],
-        "notes": (
-            "Key demo: create a network, start two containers on it, exec into one and "
-            "resolve the other by container name. When this works, students understand "
-            "why user-defined networks are mandatory for multi-service stacks. "
-            "Network aliases: --network-alias db means you can have two containers share "
-            "the alias db for a blue/green rotation. When you cut over, the alias switches — "
-            "downstream services need no config change. "
-            "Custom subnets: only needed when avoiding VPN subnet conflicts."
-        ),
-    },
-    {
-        "module": "06-networking",
-        "type": "content",
-        "title": "Multi-Network Segmentation",
-        "bullets": [
-            "[internet] -> [frontend-net] -> [proxy] -> [app] -> [backend-net] -> [db]",
-            "proxy: only on frontend-net",
-            "app: on BOTH frontend-net AND backend-net",
-            "db: only on backend-net (--internal, no outbound access)",
-            "podman network connect backend-net app   # add second network live",
-        ],
-        "notes": (
-            "This is the production architecture pattern for the course. "
-            "Walk through the logic: the proxy cannot reach the db (different network), "
-            "the app can reach both, and the db cannot reach the internet (--internal). "
-            "--internal is important: an internal network has no default route, so a "
-            "compromised DB container cannot exfiltrate data to the internet. "
-            "This is a concrete, verifiable security control. "
-            "Key command: podman network connect adds a running container to a second "
-            "network without restart."
-        ),
-    },
-    {
-        "module": "06-networking",
-        "type": "lab",
-        "title": "Lab 06: Three-Tier Isolated Stack",
-        "bullets": [
-            "Create: frontend-net, app-net (--internal)",
-            "Start: db on app-net, app on app-net (--network-alias api), proxy on frontend-net",
-            "podman network connect frontend-net app",
-            "Verify: app resolves db (YES), proxy resolves api (YES)",
-            "Verify: proxy cannot resolve db (ISOLATED), db cannot reach internet (BLOCKED)",
-        ],
-        "notes": (
-            "This is the most important lab in Module 06. Run each verification step "
-            "explicitly and ask students to predict the result before running it. "
-            "Check proxy isolation: podman exec proxy sh -lc 'getent hosts db 2>&1 || echo ISOLATED'. "
-            "If it says ISOLATED the segmentation works. "
-            "Check db internet access: podman exec db wget --timeout=3 http://example.com 2>&1 || echo BLOCKED. "
-            "These two verification commands should become part of every student's deployment checklist."
-        ),
-    },
-    {
-        "module": "06-networking",
-        "type": "content",
-        "title": "Networking Troubleshooting Checklist",
-        "bullets": [
-            "Cannot reach by name? -> are both on the same user-defined network?",
-            "DNS works, TCP fails? -> service not listening, wrong port, firewall",
-            "Port published but unreachable? -> check HostIp binding, check ss -tlnp inside",
-            "Cannot reach internet? -> check if --internal flag is set on the network",
-            "Debug sidecar: podman run --rm --network <net> alpine sh",
-        ],
-        "notes": (
-            "Teach the systematic approach: DNS first, then TCP, then firewall, then binding. "
-            "Students who skip steps waste time. The most common mistake is checking "
-            "the wrong thing first: they try curl before checking if DNS resolves. "
-            "The debug sidecar pattern: run an ephemeral alpine container on the same "
-            "network and use it as your network debug tool. "
-            "For containers that lack networking tools, point to nicolaka/netshoot — "
-            "it is a purpose-built debug image with curl, dig, tcpdump, and nmap."
-        ),
-    },
-
-    # ──────────────────────────────────────────────────────────────
-    # MODULE 07 — PODS
-    # ──────────────────────────────────────────────────────────────
-    {
-        "module": "07-pods",
-        "type": "section",
-        "title": "Module 07",
-        "subtitle": "Pods and Sidecars   (45-60 min)",
-        "notes": (
-            "Module 07 is short but important for students who will use Kubernetes later. "
-            "Podman pods share a network namespace, so containers inside a pod reach "
-            "each other on localhost. The infra container holds the namespaces. "
-            "Pods are not required for most Podman workloads — use a user-defined network "
-            "instead unless you specifically need localhost sharing."
-        ),
-    },
-    {
-        "module": "07-pods",
-        "type": "content",
-        "title": "What Is a Podman Pod?",
-        "bullets": [
-            "A pod groups containers that share network namespace",
-            "Infra container: holds the shared namespaces, always present",
-            "All containers share the same IP and port space",
-            "Port published on pod -> available to all containers inside",
-            "Mirrors the Kubernetes pod concept (same design intent)",
-        ],
-        "notes": (
-            "The infra container shows up in podman ps. Students sometimes try to delete "
-            "it — remind them it is infrastructure, not garbage. "
-            "podman pod rm -f webpod cleans up the pod and all its containers including "
-            "the infra container. "
-            "When to use pods vs networks: use a pod when containers need to communicate "
-            "via localhost (e.g., a sidecar logging agent that reads a socket file). "
-            "Use a user-defined network for most multi-service stacks — more flexible "
-            "and easier to reason about."
-        ),
-    },
-    {
-        "module": "07-pods",
-        "type": "lab",
-        "title": "Lab 07: Pod with Debug Sidecar",
-        "bullets": [
-            "podman pod create --name webpod -p 8080:80",
-            "podman run -d --pod webpod --name nginx nginx:stable",
-            "podman run -it --rm --pod webpod alpine sh",
-            "  Inside sidecar: wget -qO- http://127.0.0.1:80/ | head",
-            "podman pod rm -f webpod",
-        ],
-        "notes": (
-            "Key moment: inside the sidecar container, http://127.0.0.1:80/ resolves "
-            "to nginx — even though nginx is a different container. They share localhost "
-            "because they share the network namespace. "
-            "This is the sidecar pattern: attach a debug container to a running pod "
-            "without exposing new ports, without modifying the main container. "
-            "Practical use: attach a busybox or alpine sidecar to a pod to run netstat "
-            "or dump environment variables when debugging without restarting the main service."
-        ),
-    },
-
-    # ──────────────────────────────────────────────────────────────
-    # MODULE 08 — BUILDING IMAGES
-    # ──────────────────────────────────────────────────────────────
-    {
-        "module": "08-building-images",
-        "type": "section",
-        "title": "Module 08",
-        "subtitle": "Building Images (Containerfiles)   (2-3 hours)",
-        "notes": (
-            "Module 08 is the largest technical module. The four pillars: layer caching, "
-            "non-root runtime, multi-stage builds, and build context hygiene. Students "
-            "who master these four pillars can build images that are production-ready "
-            "on the first attempt. Slow builds and bloated images are almost always "
-            "caused by violating one of these four principles."
-        ),
-    },
-    {
-        "module": "08-building-images",
-        "type": "content",
-        "title": "Images, Layers, and Caching",
-        "bullets": [
-            "Each Containerfile instruction creates an immutable layer",
-            "Cache is invalidated from the first changed instruction downward",
-            "Slow-changing steps first: OS packages, dependency install",
-            "Fast-changing steps last: application source code",
-            "COPY . .  early = cache miss on every source change",
-        ],
-        "notes": (
-            "Analogy: building a layer cake. You cannot change a lower layer without "
-            "rebuilding everything above it. The cache optimisation rule: put stable "
-            "steps at the bottom (base image, system packages, dependency installs), "
-            "and volatile steps at the top (your app source). "
-            "Bad example: FROM python:3.13, COPY . ., RUN pip install. Every time any "
-            "source file changes, pip reruns. "
-            "Good example: COPY requirements.txt first, RUN pip install, then COPY . . "
-            "Now pip only reruns when requirements.txt changes."
-        ),
-    },
-    {
-        "module": "08-building-images",
-        "type": "content",
-        "title": "Essential Containerfile Instructions",
-        "bullets": [
-            "FROM     — base image (pin version; digest for prod)",
-            "WORKDIR  — set working directory (avoids brittle cd chains)",
-            "COPY     — copy files (prefer over ADD; use --chown=)",
-            "RUN      — install/build steps (chain with && to reduce layers)",
-            "USER     — run as non-root (must be after all root-requiring steps)",
-            "CMD / ENTRYPOINT  — exec form preferred (correct signal handling)",
-        ],
-        "notes": (
-            "COPY vs ADD: ADD has extra magic (tar extraction, URL fetching). "
-            "Unless you need that specific magic, use COPY — it is explicit and predictable. "
-            "Exec form for CMD: ['nginx', '-g', 'daemon off;'] vs shell form. "
-            "Exec form makes the process PID 1, which means it receives SIGTERM directly "
-            "when the container is stopped. Shell form wraps it in /bin/sh -c which "
-            "means SIGTERM goes to the shell, not your process — causing graceful-shutdown bugs. "
-            "USER placement: set USER after all root-requiring steps (apt-get, adduser, etc.)."
-        ),
-    },
-    {
-        "module": "08-building-images",
-        "type": "content",
-        "title": "Non-Root Runtime (Least Privilege in Images)",
-        "bullets": [
-            "RUN addgroup -S app && adduser -S -G app app",
-            "COPY --chown=app:app . /app",
-            "USER app",
-            "Give write access only to: /tmp, app state dir, log dir",
-            "Test: podman run --rm localhost/myapp:1 id   (must NOT be uid=0)",
-        ],
-        "notes": (
-            "This is the image-level complement to rootless Podman (the host-level protection). "
-            "Rootless Podman protects the host from container escapes. Non-root inside "
-            "the container protects against: escape bugs that require in-container root, "
-            "accidental writes to system paths, and overly permissive defaults. "
-            "The 'podman run id' test is a quick smoke test for every image. If it returns "
-            "uid=0(root), the image needs fixing before production. "
-            "COPY --chown is cleaner than a separate RUN chown because it avoids creating "
-            "an extra layer with duplicated files."
-        ),
-    },
-    {
-        "module": "08-building-images",
-        "type": "content",
-        "title": "Multi-Stage Builds",
-        "bullets": [
-            "Build stage: has compiler/toolchain, produces artifact",
-            "Runtime stage: minimal image + artifact only",
-            "FROM ... AS build  /  COPY --from=build /app/binary /app/",
-            "podman build --target build   (stop at build stage for debugging)",
-            "Result: runtime image has no compiler, headers, or build cache",
-        ],
-        "notes": (
-            "Show the size comparison concretely: podman images after building both "
-            "a naive image (with all build tools) and a multi-stage image. "
-            "A Go binary in a scratch image is about 10 MB. The same binary with a "
-            "full golang:1.23 base is about 800 MB. "
-            "The --target flag is underused. If a multi-stage build fails late, stop at "
-            "the build stage and run podman run -it localhost/myapp:build sh to inspect "
-            "the filesystem interactively. This is far faster than print-debugging RUN statements."
-        ),
-    },
-    {
-        "module": "08-building-images",
-        "type": "content",
-        "title": "Build Context Hygiene",
-        "bullets": [
-            ".containerignore — prevents accidental COPY of .env, keys, node_modules",
-            "Never: COPY . .   (may include secrets, build artifacts, caches)",
-            "Prefer explicit: COPY src/ /app/src/   COPY package.json /app/",
-            "Secrets in ARG or ENV = secret in image history = leak",
-            "Inspect large layers: podman image history localhost/myapp:1",
-        ],
-        "notes": (
-            "The .containerignore omission is the single most common image security bug "
-            "in codebases that evolved from 'it works on my laptop'. Someone adds a "
-            "COPY . . line for convenience, the .env file is in the same directory, "
-            "and the production image ships with the database password baked in. "
-            "ARG secrets: even though ARG values are not in the final image environment, "
-            "they are visible in podman image history because they influence RUN steps. "
-            "The image history command shows every layer and its size — use it to find "
-            "unexpectedly large layers."
-        ),
-    },
-    {
-        "module": "08-building-images",
-        "type": "lab",
-        "title": "Lab 08: Build a Non-Root Service Image",
-        "bullets": [
-            "FROM python:3.13-alpine",
-            "RUN addgroup -S app && adduser -S -G app app",
-            "COPY --chown=app:app server.py /app/server.py",
-            "USER app  /  EXPOSE 8080  /  CMD [\"python\", \"/app/server.py\"]",
-            "Test: podman run --rm localhost/svc-lab:1 id   (must NOT be uid=0)",
-        ],
-        "notes": (
-            "This lab ties together layers, non-root, and a working service. "
-            "The 'id' test first ensures students cannot accidentally skip the USER step. "
-            "Common failure: touch /app/ok: permission denied. This means COPY --chown "
-            "was not used correctly, or the WORKDIR path is owned by root. "
-            "If time allows, have students do the hello-bun example: examples/build/hello-bun. "
-            "It shows a TypeScript app built in one stage and run in a minimal stage, "
-            "with a healthcheck using a dedicated healthcheck.ts file."
-        ),
-    },
-
-    # ──────────────────────────────────────────────────────────────
-    # MODULE 09 — MULTI-SERVICE WORKFLOWS
-    # ──────────────────────────────────────────────────────────────
-    {
-        "module": "09-multiservice-workflows",
-        "type": "section",
-        "title": "Module 09",
-        "subtitle": "Multi-Service Workflows   (60-90 min)",
-        "notes": (
-            "Module 09 bridges everything learned so far into a coherent stack. "
-            "The key skill is writing a repeatable 'stack up / stack down' script. "
-            "The provided examples/stack/stack.sh is a reference implementation — "
-            "study it with students before running it."
-        ),
-    },
-    {
-        "module": "09-multiservice-workflows",
-        "type": "content",
-        "title": "Choosing a Multi-Service Pattern",
-        "bullets": [
-            "User-defined network + named containers  ->  best default for small stacks",
-            "Pod (shared localhost)  ->  when sidecars need 127.0.0.1",
-            "podman play kube  ->  when you want Kubernetes YAML locally",
-            "Quadlet + systemd  ->  production, reboot-safe (Module 11)",
-            "Compose tools  ->  convenient wrapper; learn primitives first",
-        ],
-        "notes": (
-            "Decision tree: "
-            "1. Need boot persistence? -> Quadlet (Module 11). "
-            "2. Need shared localhost? -> Pod. "
-            "3. Have Kubernetes YAML? -> play kube. "
-            "4. Everything else: user-defined network. "
-            "Compose tools (podman-compose, docker compose) are valid but they obscure "
-            "what primitives are created. Students who learn the primitives first "
-            "can debug any compose-generated setup because they understand what "
-            "network create, volume create, and run commands are being issued."
-        ),
-    },
-    {
-        "module": "09-multiservice-workflows",
-        "type": "lab",
-        "title": "Lab 09: stack.sh Reference",
-        "bullets": [
-            "bash examples/stack/stack.sh up",
-            "bash examples/stack/stack.sh status",
-            "bash examples/stack/stack.sh down",
-            "Study: idempotent creates, secret prompting, stable names",
-            "DB has no published port — app reaches it via network DNS only",
-        ],
-        "notes": (
-            "Before running, walk through the structure: "
-            "1. Creates network and volume if they do not exist (idempotent). "
-            "2. Creates the Podman secret for the DB password if not present, "
-            "   prompting with read -s. "
-            "3. Starts containers with stable names so the script is safe to re-run. "
-            "4. The down command stops containers but leaves the volume to avoid data loss. "
-            "Idempotency is the key production habit: a deploy script should be safe "
-            "to run multiple times without side effects."
-        ),
-    },
-
-    # ──────────────────────────────────────────────────────────────
-    # MODULE 10 — PODMAN PLAY KUBE
-    # ──────────────────────────────────────────────────────────────
-    {
-        "module": "10-play-kube",
-        "type": "section",
-        "title": "Module 10",
-        "subtitle": "podman play kube   (45-75 min)",
-        "notes": (
-            "Module 10 is for teams that already use or will use Kubernetes YAML. "
-            "podman play kube runs a subset of Kubernetes Pod definitions locally. "
-            "The security note about base64 is important: many teams store Kubernetes "
-            "Secrets as YAML files without understanding that base64 is encoding, "
-            "not encryption."
-        ),
-    },
-    {
-        "module": "10-play-kube",
-        "type": "content",
-        "title": "Running Kubernetes YAML Locally",
-        "bullets": [
-            "podman play kube examples/kube/webpod.yaml",
-            "podman kube down examples/kube/webpod.yaml   # clean teardown",
-            "Quadlet .kube unit: run YAML-defined pod under systemd",
-            "Limitation: Pods only — no Deployments, Services, Ingress",
-            "Secret YAML: base64 is encoding NOT encryption — never commit",
-        ],
-        "notes": (
-            "The base64 point deserves extra emphasis. Show: "
-            "echo -n supersecret | base64 produces a string any human can decode. "
-            "Kubernetes Secret YAML is NOT encrypted by default. Committing Kubernetes "
-            "Secret YAML to a public repo is the same as committing plaintext passwords. "
-            "For secrets with play kube: provision them as Podman secrets out-of-band "
-            "and reference them in the pod spec rather than embedding base64 values. "
-            "The .kube Quadlet unit type is useful for teams that generate pod YAML "
-            "in CI and want to run it under systemd for boot persistence."
-        ),
-    },
-
-    # ──────────────────────────────────────────────────────────────
-    # MODULE 11 — QUADLET + SYSTEMD
-    # ──────────────────────────────────────────────────────────────
-    {
-        "module": "11-quadlet",
-        "type": "section",
-        "title": "Module 11",
-        "subtitle": "Production Baseline — systemd + Quadlet   (2-3 hours)",
-        "notes": (
-            "Module 11 is the production turning point. Everything before was development "
-            "patterns; Quadlet is how services run in production on Linux. Quadlet converts "
-            "simple declarative unit files into full systemd service units. The benefit: "
-            "restart policies, boot ordering, journald logging, and boot persistence — all "
-            "for free, using the same tooling that manages every other service on the host."
-        ),
-    },
-    {
-        "module": "11-quadlet",
-        "type": "content",
-        "title": "Why Quadlet?",
-        "bullets": [
-            "Linux-native: systemd manages restarts, logs, dependencies, boot start",
-            "Quadlet file -> systemd generates the service unit automatically",
-            "Files live at: ~/.config/containers/systemd/*.{container,network,volume,pod}",
-            "Boot persistence: sudo loginctl enable-linger $USER",
-            "journalctl --user -u myapp.service -n 100   (all logs in one place)",
-        ],
-        "notes": (
-            "Key differentiator vs 'podman run in a script': systemd handles restart "
-            "on failure, ordered startup (dependencies), graceful shutdown, and log collection. "
-            "A cron-or-bash approach misses all of these. "
-            "Linger: without loginctl enable-linger, user services stop when you log out. "
-            "On a server you want services to run regardless of whether anyone is logged in. "
-            "After enabling linger, user services start on boot with no active login session. "
-            "The Quadlet generator runs at daemon-reload time. If Podman cannot parse your "
-            "unit file, the generated service will not appear. Debug with: "
-            "/usr/lib/systemd/system-generators/podman-system-generator --user --dryrun"
-        ),
-    },
-    {
-        "module": "11-quadlet",
-        "type": "content",
-        "title": "Quadlet Unit File Structure",
-        "bullets": [
-            "[Unit]      Description=My App",
-            "[Container] Image=docker.io/library/nginx:stable",
-            "[Container] PublishPort=127.0.0.1:8081:80",
-            "[Container] Network=appnet.network  /  Volume=appdata.volume:/data",
-            "[Service]   Restart=always",
-            "[Install]   WantedBy=default.target",
-        ],
-        "notes": (
-            "Walk through a real unit file from examples/quadlet/hello-nginx.container. "
-            "[Container] section translates directly to podman run flags: "
-            "Image -> --image, PublishPort -> -p, Network -> --network, Volume -> -v. "
-            "The Network= and Volume= values reference other Quadlet units by filename stem. "
-            "systemd will start the network and volume units before the container unit "
-            "when you include them in After= and Requires=. "
-            "[Install] WantedBy=default.target means the service starts on boot after "
-            "linger is enabled. Without this line the service will not autostart."
-        ),
-    },
-    {
-        "module": "11-quadlet",
-        "type": "lab",
-        "title": "Lab 11: First Quadlet Service",
-        "bullets": [
-            "cp examples/quadlet/hello-nginx.container ~/.config/containers/systemd/",
-            "systemctl --user daemon-reload",
-            "systemctl --user start hello-nginx.service",
-            "curl http://127.0.0.1:8081/   ->  nginx welcome page",
-            "journalctl --user -u hello-nginx.service -n 20 --no-pager",
-        ],
-        "notes": (
-            "Most common failure: forgetting daemon-reload after copying the file. "
-            "Quadlet files are only processed at daemon-reload time — skip it and "
-            "the service will not exist. "
-            "Have students check: systemctl --user status hello-nginx.service. "
-            "If it shows 'not found', daemon-reload was not run. "
-            "If it shows 'failed', check journalctl for the Podman error. "
-            "After success, show the clean-up: stop service, remove the .container file, "
-            "daemon-reload again. This teaches that Quadlet is not a database — "
-            "the file IS the configuration."
-        ),
-    },
-    {
-        "module": "11-quadlet",
-        "type": "content",
-        "title": "Secrets in Quadlet (Module 11a)",
-        "bullets": [
-            "In [Container]: Secret=db_password",
-            "Container reads from /run/secrets/db_password at runtime",
-            "Never put secret values in Environment= lines",
-            "Rotation: update Secret= to new versioned name, daemon-reload, restart",
-            "Verify: journalctl logs must not contain secret values",
-        ],
-        "notes": (
-            "Rotation procedure: "
-            "1. Create new secret: printf '%s' 'newval' | podman secret create db_password_v2 - "
-            "2. Edit the .container file: change Secret=db_password_v1 to Secret=db_password_v2 "
-            "3. systemctl --user daemon-reload && systemctl --user restart myapp.service "
-            "4. Verify the service is healthy "
-            "5. podman secret rm db_password_v1 "
-            "The journald log verification step: journalctl --user -u myapp.service | grep -i password "
-            "should return nothing. If it returns something, the app is logging secrets — "
-            "fix the app before production."
-        ),
-    },
-
-    # ──────────────────────────────────────────────────────────────
-    # MODULE 12 — SECURITY
-    # ──────────────────────────────────────────────────────────────
-    {
-        "module": "12-security",
-        "type": "section",
-        "title": "Module 12",
-        "subtitle": "Security Deep Dive   (60-120 min)",
-        "notes": (
-            "Module 12 formalises the security practices scattered throughout the course "
-            "into a coherent hardening checklist. The key mental model: defence in depth. "
-            "No single control is sufficient. Rootless + non-root + dropped capabilities "
-            "+ read-only FS + SELinux + digest pinning = an auditable security posture."
-        ),
-    },
-    {
-        "module": "12-security",
-        "type": "content",
-        "title": "Baseline Hardening Checklist",
-        "bullets": [
-            "Run rootless (host protection against breakout)",
-            "Run as non-root inside container (in-container least privilege)",
-            "Drop capabilities: --cap-drop=ALL, add back only what is needed",
-            "Read-only root FS: --read-only + --tmpfs for writable scratch",
-            "--security-opt no-new-privileges",
-            "Limit resources: --memory 256m --pids-limit 200",
-        ],
-        "notes": (
-            "Walk through each control and ask what does this protect against: "
-            "Rootless -> host breakout. Non-root-in-container -> in-container privilege "
-            "escalation. Dropped capabilities -> kernel exploit needing a specific cap. "
-            "Read-only FS -> malware writing persistence files. no-new-privileges -> "
-            "setuid binaries inside the container cannot gain privileges. "
-            "Resource limits -> denial of service from runaway processes. "
-            "Collectively these make a container posture that is verifiable and auditable. "
-            "Avoid --privileged as a debug shortcut — it grants all capabilities."
-        ),
-    },
-    {
-        "module": "12-security",
-        "type": "lab",
-        "title": "Lab 12: Read-Only + Dropped Caps",
-        "bullets": [
-            "podman run --rm --cap-drop=ALL alpine id",
-            "podman run --rm --read-only --tmpfs /var/cache/nginx --tmpfs /var/run \\",
-            "         --cap-drop=ALL --security-opt no-new-privileges nginx:stable",
-            "If it fails: read error -> identify write path -> add targeted tmpfs",
-            "Goal: nginx runs successfully with all restrictions applied",
-        ],
-        "notes": (
-            "This lab deliberately fails first so students learn to read errors as a map "
-            "of required permissions. nginx needs to write to /var/cache/nginx (temp files) "
-            "and /var/run (PID file). Each time it fails, add the minimum required tmpfs "
-            "and retry. Goal: understand why each restriction fails and add back only the "
-            "minimum required exception. "
-            "Image trust: pin by digest, use minimal base images (alpine variants), "
-            "track upstream CVEs with tools like trivy or grype. "
-            "Supply chain: prefer official images; avoid curl-piped-to-bash installer scripts."
-        ),
-    },
-
-    # ──────────────────────────────────────────────────────────────
-    # MODULE 13 — TROUBLESHOOTING
-    # ──────────────────────────────────────────────────────────────
-    {
-        "module": "13-troubleshooting",
-        "type": "section",
-        "title": "Module 13",
-        "subtitle": "Troubleshooting and Ops   (60-120 min)",
-        "notes": (
-            "Module 13 is about turning 'it does not work' into a short, systematic "
-            "process. The debug loop (state -> logs -> inspect -> reproduce) applies to "
-            "100% of container failures. Students who memorise the loop save hours "
-            "of random Googling. The failure drills make this visceral."
-        ),
-    },
-    {
-        "module": "13-troubleshooting",
-        "type": "content",
-        "title": "The Debug Loop",
-        "bullets": [
-            "1.  podman ps -a              state, exit codes",
-            "2.  podman logs <name>        app output / crash reason",
-            "3.  podman inspect <name>     ports, mounts, env, command",
-            "4.  podman run --rm -it <image> sh    reproduce interactively",
-            "Container exits too fast? -> override CMD to 'sleep 3600' then exec in",
-        ],
-        "notes": (
-            "The loop is always the same, regardless of the failure. "
-            "Step 1: is the container actually running or did it exit? "
-            "Exit code 1 = application error. Exit code 137 = OOM killed. Exit code 139 = segfault. "
-            "Step 2: for a Quadlet service, also check journalctl. Difference: "
-            "podman logs shows container stdout/stderr; journalctl shows systemd "
-            "lifecycle events AND container output. "
-            "Step 4: if the container exits too fast, run the same image with "
-            "--entrypoint sh or override CMD with 'sleep 3600' to get a shell "
-            "in the same environment."
-        ),
-    },
-    {
-        "module": "13-troubleshooting",
-        "type": "content",
-        "title": "Ops Tools",
-        "bullets": [
-            "podman events          lifecycle events (start, stop, pull, network...)",
-            "podman stats           live CPU / memory / I/O per container",
-            "podman top <name>      processes inside the container",
-            "podman system df       disk usage by type",
-            "journalctl --user -u <svc>   systemd service logs",
-        ],
-        "notes": (
-            "podman events is underused. It answers: what did Podman do in the last "
-            "5 minutes? Invaluable when a container mysteriously stopped. "
-            "Filter: podman events --filter type=container --since 1h. "
-            "podman stats is the quick health check: if a container is consuming "
-            "100% CPU continuously, something is wrong. If memory grows without bound "
-            "there is a leak. "
-            "For Quadlet services: both podman logs and journalctl are useful. "
-            "journalctl shows the systemd perspective (failed to start, restart attempts). "
-            "podman logs shows the application perspective."
-        ),
-    },
-    {
-        "module": "13-troubleshooting",
-        "type": "lab",
-        "title": "Lab 13: Failure Drills",
-        "bullets": [
-            "1.  Port conflict: two services on 8080 -> fix by changing host port",
-            "2.  Permission denied: mount root-owned dir -> fix with unshare or :Z",
-            "3.  Bad tag: deploy :latest that changes -> fix by pinning digest",
-            "4.  DNS failure: containers on default network -> fix: user-defined network",
-            "Run each: observe error, diagnose using debug loop, fix, verify",
-        ],
-        "notes": (
-            "These drills should be done by students, not just demonstrated. "
-            "Tell them: I will cause these failures on purpose. Your job is to diagnose "
-            "and fix them using only the debug loop. "
-            "Drill 1: 'address already in use' in podman logs. Fix: change host port. "
-            "Drill 2: 'permission denied' writing to bind mount. Fix: unshare chown or add :Z. "
-            "Drill 3: upstream changes tag -> service breaks on next restart. "
-            "Fix: record digest, pin it. "
-            "Drill 4: getent hosts fails. Check podman network inspect shows no dns_enabled. "
-            "Fix: create user-defined network."
-        ),
-    },
-
-    # ──────────────────────────────────────────────────────────────
-    # MODULE 14 — AUTO-UPDATES
-    # ──────────────────────────────────────────────────────────────
-    {
-        "module": "14-autoupdate",
-        "type": "section",
-        "title": "Module 14",
-        "subtitle": "Maintenance and Auto-Updates   (45-75 min)",
-        "notes": (
-            "Module 14 is about making an informed policy decision around auto-updates. "
-            "Auto-update is not free: it introduces unplanned restarts and can "
-            "silently change behaviour. The course position: digest pinning for production, "
-            "auto-update only with monitoring and a documented rollback plan."
-        ),
-    },
-    {
-        "module": "14-autoupdate",
-        "type": "content",
-        "title": "Auto-Update: Policy, Not Magic",
-        "bullets": [
-            "podman auto-update: checks registry for new images, restarts units",
-            "Works with Quadlet units that have AutoUpdate=registry",
-            "Tags vs Digests: auto-update needs tags (digests are immutable)",
-            "If you use auto-update: add healthchecks, alert on restart loops",
-            "Rollback plan is mandatory before enabling auto-update",
-        ],
-        "notes": (
-            "The tension: tags are convenient for auto-update but unpredictable. "
-            "Digests are predictable but require manual upgrades. "
-            "Recommendation: "
-            "For non-critical services: auto-update with a stable tag is acceptable "
-            "if you monitor and have a rollback plan. "
-            "For production stateful services (databases, payment systems): digest pinning. "
-            "Upgrade via deliberate change: pull new digest, update unit, restart. "
-            "The minimum rollback plan: know the previous working image reference, "
-            "have a procedure to update the unit to that reference, and have monitoring "
-            "to detect failure within minutes of a restart."
-        ),
-    },
-    {
-        "module": "14-autoupdate",
-        "type": "lab",
-        "title": "Lab 14: Enable and Observe Auto-Update",
-        "bullets": [
-            "cp examples/quadlet/autoupdate-nginx.container ~/.config/containers/systemd/",
-            "systemctl --user daemon-reload && start autoupdate-nginx.service",
-            "podman auto-update   (manual trigger)",
-            "systemctl --user status autoupdate-nginx.service",
-            "journalctl --user -u autoupdate-nginx.service -n 50 --no-pager",
-        ],
-        "notes": (
-            "The autoupdate-nginx.container example has AutoUpdate=registry set. "
-            "Run podman auto-update manually and observe: if the image is already current, "
-            "nothing restarts. If there is a newer image for the tag, it is pulled and "
-            "the service restarts. "
-            "Show the systemd timer approach: systemctl --user list-unit-files | grep auto-update "
-            "may show a podman-auto-update timer that runs on a schedule. "
-            "Key question for students: what happens if auto-update pulls a broken image? "
-            "Answer: the service fails to start, systemd detects the failure, and raises "
-            "an alert — IF you have monitoring. Without monitoring, it silently breaks."
-        ),
-    },
-
-    # ──────────────────────────────────────────────────────────────
-    # MODULE 80 — CAPSTONE
-    # ──────────────────────────────────────────────────────────────
-    {
-        "module": "80-capstone",
-        "type": "section",
-        "title": "Module 80",
-        "subtitle": "Capstone Project   (3-6 hours)",
-        "notes": (
-            "The capstone is the course's final exam in practical form. Students deploy "
-            "a real MariaDB + Adminer stack with full Quadlet management, secrets, "
-            "backup/restore, and digest-pinned upgrades. The success criteria are "
-            "measurable and match real production requirements."
-        ),
-    },
-    {
-        "module": "80-capstone",
-        "type": "content",
-        "title": "Capstone: What You Will Build",
-        "bullets": [
-            "MariaDB (private, no published port) + Adminer (UI on port 8082)",
-            "Private network (capnet) — DB cannot reach internet (--internal)",
-            "Named volumes for data and backups",
-            "Podman secrets for the DB root password",
-            "Quadlet units: reboot-safe, starts on boot via linger",
-        ],
-        "notes": (
-            "This is not a toy: MariaDB with Quadlet plus secrets plus volumes is a "
-            "realistic pattern for running a production database on a single host. "
-            "The Adminer web UI gives a visual way to verify DB state. "
-            "Architecture: capnet (--internal) -> only cap-mariadb and cap-adminer attached "
-            "-> DB cannot reach internet, admin UI reaches DB via DNS name 'db' "
-            "-> only Adminer publishes a port (8082) to the host "
-            "-> passwords live in Podman secrets referenced by name in .container units."
-        ),
-    },
-    {
-        "module": "80-capstone",
-        "type": "content",
-        "title": "Capstone: Backup, Restore, Upgrade",
-        "bullets": [
-            "Backup: mysqldump via throwaway container -> cap-backups volume",
-            "Restore: feed .sql into mysql -h db via throwaway container, verify data",
-            "Upgrade: record digest -> pull new -> update Image= -> restart",
-            "Rollback: restore previous digest -> daemon-reload -> restart -> verify",
-            "Password rotation: create v2 -> ALTER USER -> update unit -> verify -> rm v1",
-        ],
-        "notes": (
-            "The backup and restore procedure is designed to be testable: create a table, "
-            "take a backup, drop the table, restore from backup, verify the table is back. "
-            "Never call a backup procedure verified until you have successfully restored "
-            "from it and confirmed data integrity. "
-            "Password rotation requires two steps: create the new secret AND update the "
-            "DB password with ALTER USER. The order matters: change the DB password first, "
-            "then update the secret reference in the Quadlet unit, then restart. "
-            "Rollback for password rotation is complex — keep the old password and the old "
-            "secret until verification is complete."
-        ),
-    },
-    {
-        "module": "80-capstone",
-        "type": "lab",
-        "title": "Capstone Lab Steps",
-        "bullets": [
-            "1.  Create secret, install units, enable linger, daemon-reload, start",
-            "2.  Verify: Adminer at :8082, DB has NO published ports",
-            "3.  Insert test data (CREATE TABLE cap.t1, INSERT 1)",
-            "4.  Backup -> DROP database -> Restore -> verify data is back",
-            "5.  Upgrade by digest -> verify -> rollback to previous digest -> verify",
-        ],
-        "notes": (
-            "Students who complete all five steps have demonstrated the complete "
-            "production skillset this course teaches. "
-            "Step 2: podman port cap-mariadb should return nothing. If it returns "
-            "anything, the .container unit has a PublishPort= that must be removed. "
-            "Step 4: the restore test is the most important. Force the issue: tell "
-            "students to DROP DATABASE cap before restoring so they know the restore "
-            "is actually working, not just reading a cached result. "
-            "Step 5: use real digests from podman images --digests. Record them in "
-            "a text file before upgrading so rollback is a copy-paste operation."
-        ),
-    },
-
-    # ──────────────────────────────────────────────────────────────
-    # MODULE 90 — EXTERNAL SECRETS
-    # ──────────────────────────────────────────────────────────────
-    {
-        "module": "90-external-secrets-survey",
-        "type": "section",
-        "title": "Module 90 (Optional)",
-        "subtitle": "External Secrets Survey   (45-90 min)",
-        "notes": (
-            "Module 90 is optional but valuable for teams that need to scale beyond "
-            "a single host or have compliance requirements. The goal is not to implement "
-            "any specific system — it is to build the mental model to choose the right "
-            "one. Students who understand the decision framework can evaluate any "
-            "secrets manager they encounter."
-        ),
-    },
-    {
-        "module": "90-external-secrets-survey",
-        "type": "content",
-        "title": "Choosing a Secrets System",
-        "bullets": [
-            "Key questions: how many hosts? rotation frequency? audit requirements?",
-            "Option 1 — systemd Credentials: host-native, great for single host",
-            "Option 2 — SOPS: encrypted files in git, GitOps-friendly",
-            "Option 3 — Vault-class: central policy + auth + audit, multi-host",
-            "Migration: external manager writes a file -> app reads the file (unchanged)",
-        ],
-        "notes": (
-            "Decision framework: "
-            "Single host, minimal infra -> systemd credentials. The credentials are "
-            "encrypted at rest on the host and materialised as files at service start. "
-            "Zero extra infrastructure. "
-            "Small team, GitOps workflow -> SOPS. Secrets live encrypted in git alongside "
-            "infrastructure code. Change history is in git. Audit = git log. "
-            "Larger org, compliance requirements, multi-host -> Vault-class (HashiCorp Vault, "
-            "AWS Secrets Manager). Dynamic credentials, fine-grained policies, "
-            "full audit logs, automated rotation. "
-            "Regardless of which system you choose, the delivery pattern stays the same: "
-            "the external system writes a file, the container reads the file. "
-            "This means migrating from Podman secrets does not require changing the application."
-        ),
-    },
-
-    # ──────────────────────────────────────────────────────────────
-    # CLOSING
-    # ──────────────────────────────────────────────────────────────
-    {
-        "module": "closing",
-        "type": "section",
-        "title": "Course Complete",
-        "subtitle": "You are now a production-ready Podman operator",
-        "notes": (
-            "Congratulations — students have covered every skill needed to run "
-            "rootless Podman services in production. Remind them of the five habits "
-            "that separate good operators from beginners: "
-            "1. Rootless by default. "
-            "2. Secrets as files, never environment variables. "
-            "3. Volumes for state, .containerignore for builds. "
-            "4. Digest-pinned images for anything that matters. "
-            "5. Quadlet + systemd for anything that must survive a reboot. "
-            "Point them to the cheatsheets/ directory for quick reference, and "
-            "ASSESSMENTS.md for the two practical exams."
-        ),
-    },
-    {
-        "module": "closing",
-        "type": "content",
-        "title": "Five Habits of a Podman Operator",
-        "bullets": [
-            "1.  Rootless by default — explain every exception",
-            "2.  Secrets as files — never environment variables",
-            "3.  Volumes for state — writable layer is not persistence",
-            "4.  Digest-pinned images — reproducibility + audit trail",
-            "5.  Quadlet + systemd — reboot-safe production baseline",
-        ],
-        "notes": (
-            "These five habits are a concise summary of the entire course. "
-            "If a student can defend every deviation from these five habits, "
-            "they are ready for production. "
-            "Quick reference: cheatsheets/ directory contains CLI, rootless, Quadlet, "
-            "troubleshooting, and security cheatsheets. "
-            "Next steps: read the capstone assessment rubric (ASSESSMENTS.md Exam B), "
-            "complete the capstone project, then run the Module 90 survey if you need "
-            "to scale beyond a single host."
-        ),
-    },
-]
+SLIDES_SRC_DIR = os.path.normpath(
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "slides", "src"))
+MODULES_DIR = str(course_source.ROOT_DIR / "modules")
+
+SOURCES = ("json", "markdown")
+_source = "json"
+
+
+def use_source(name: str) -> None:
+    """Select where module_keys() and load_module() read slides from."""
+    global _source
+    if name not in SOURCES:
+        raise ValueError(f"unknown slide source {name!r}; choose from {', '.join(SOURCES)}")
+    _source = name
+    reload_sources()
+
+
+def source_dir() -> str:
+    """The directory holding the current source's per-deck files."""
+    return MODULES_DIR if _source == "markdown" else SLIDES_SRC_DIR
+
+
+def source_suffix() -> str:
+    return ".md" if _source == "markdown" else ".json"
+
+
+@functools.lru_cache(maxsize=None)
+def module_keys() -> tuple[str, ...]:
+    """Deck keys in course order, from slides/src/index.json (or MODULES.md)."""
+    if _source == "markdown":
+        return tuple(os.path.splitext(os.path.basename(p))[0]
+                     for p in course_source.module_paths())
+    with open(os.path.join(SLIDES_SRC_DIR, "index.json"), encoding="utf-8") as fh:
+        return tuple(json.load(fh))
+
+
+SLIDE_TYPES = ("title", "section", "content", "lab")
+SLIDE_KEYS = ("module", "type", "title", "subtitle", "bullets", "notes")
+
+
+class SlideError(ValueError):
+    """A slide in the source does not fit the Slide model."""
+
+
+class CodeLine(str):
+    """A bullet that is code whatever it looks like (``{"code": line}`` in the source)."""
+    __slots__ = ()
+
+
+@dataclass(frozen=True, slots=True)
+class Slide:
+    """One validated slide.
+
+    Slotted and immutable since every deck, the combined one included, holds
+    its slides for the whole build; ``module`` and ``type`` are interned, so
+    the hundreds of slides sharing a value share one string.
+    """
+    module: str
+    type: str
+    title: str
+    subtitle: str = ""
+    bullets: tuple[str, ...] = ()   # str, or CodeLine for a forced code line
+    notes: str = ""
+
+    @classmethod
+    def from_dict(cls, data: dict, module: str = "misc", where: str = "slide") -> "Slide":
+        """Validate one source slide; *where* prefixes error messages."""
+        if not isinstance(data, dict):
+            raise SlideError(f"{where}: expected an object, got {type(data).__name__}")
+        for key in data:
+            if key not in SLIDE_KEYS:
+                hint = difflib.get_close_matches(key, SLIDE_KEYS, n=1)
+                raise SlideError(f"{where}: unknown key {key!r}"
+                                 + (f" (did you mean {hint[0]!r}?)" if hint else ""))
+        for key in ("module", "type", "title", "subtitle", "notes"):
+            if not isinstance(data.get(key, ""), str):
+                raise SlideError(f"{where}: {key!r} must be a string")
+        stype = data.get("type", "content")
+        if stype not in SLIDE_TYPES:
+            raise SlideError(f"{where}: unknown type {stype!r}; choose from {', '.join(SLIDE_TYPES)}")
+        bullets = data.get("bullets", [])
+        if not isinstance(bullets, list):
+            raise SlideError(f"{where}: 'bullets' must be a list")
+        parsed = []
+        for i, bullet in enumerate(bullets, 1):
+            if isinstance(bullet, str):
+                parsed.append(bullet)
+            elif (isinstance(bullet, dict) and bullet.keys() == {"code"}
+                  and isinstance(bullet["code"], str)):
+                parsed.append(CodeLine(bullet["code"]))
+            else:
+                raise SlideError(f'{where}: bullet {i} must be a string or {{"code": line}}')
+        return cls(sys.intern(data.get("module", module)), sys.intern(stype),
+                   data.get("title", ""), data.get("subtitle", ""), tuple(parsed),
+                   data.get("notes", ""))
+
+    def to_dict(self) -> dict:
+        """The slide in source form, without the keys left at their defaults."""
+        data = {"module": self.module, "type": self.type, "title": self.title}
+        if self.subtitle:
+            data["subtitle"] = self.subtitle
+        if self.bullets:
+            data["bullets"] = [{"code": b} if isinstance(b, CodeLine) else b
+                               for b in self.bullets]
+        if self.notes:
+            data["notes"] = self.notes
+        return data
+
+
+@functools.lru_cache(maxsize=None)
+def load_module(module_key: str) -> list[Slide]:
+    """Slides of one deck, each tagged with its ``module`` key. Do not mutate.
+
+    Raises SlideError if the source has a slide that does not validate.
+    """
+    with PHASES("load"):
+        if _source == "markdown":
+            rel = f"modules/{module_key}.md"
+            slides = markdown_slides(course_source.load_module_doc(rel))
+        else:
+            path = os.path.join(SLIDES_SRC_DIR, f"{module_key}.json")
+            rel = os.path.relpath(path, course_source.ROOT_DIR)
+            with open(path, encoding="utf-8") as fh:
+                slides = json.load(fh)
+        if not isinstance(slides, list):
+            raise SlideError(f"{rel}: expected a list of slides")
+        return [Slide.from_dict(slide, module_key, f"{rel}: slide {i}")
+                for i, slide in enumerate(slides, 1)]
+
+
+_SKIP_HEADINGS = {"table of contents"}
+# A paragraph that is nothing but a link, e.g. "[↑ Go to TOC](#table-of-contents)".
+_LINK_ONLY_RE = re.compile(r"!?\[[^\]]*\]\([^)]*\)")
+
+
+def markdown_slides(doc: course_source.ModuleDoc) -> list[dict]:
+    """Slide dicts for one parsed module (see the section comment above)."""
+    slides: list[dict] = []
+    slide: dict | None = None
+    notes: list[str] = []
+    skipping = False    # under a skipped heading: keep its prose, drop its lists
+
+    def finish() -> None:
+        if slide is not None and (slide.get("bullets") or notes or slide["type"] == "section"):
+            if notes:
+                slide["notes"] = " ".join(notes)
+            slides.append(slide)
+        notes.clear()
+
+    for block in doc.blocks:
+        if block.kind == "heading":
+            title = course_source.plain_text(block.text)
+            skipping = block.level > 1 and title.lower() in _SKIP_HEADINGS
+            if skipping or block.level > 3:
+                continue
+            finish()
+            if block.level == 1:
+                head, _, rest = title.partition(":")
+                slide = {"type": "section", "title": head.strip(), "subtitle": rest.strip()}
+            else:
+                kind = "lab" if title.lower().startswith("lab") else "content"
+                slide = {"type": kind, "title": title, "bullets": []}
+            continue
+        if slide is None:
+            continue
+        if block.kind == "paragraph":
+            if not _LINK_ONLY_RE.fullmatch(block.text):
+                notes.append(course_source.plain_text(block.text))
+        elif skipping or slide["type"] == "section":
+            continue
+        elif block.kind == "list":
+            slide["bullets"] += [course_source.plain_text(item) for item in block.items]
+        elif block.kind == "code":
+            slide["bullets"] += [{"code": line.rstrip()} for line in block.items if line.strip()]
+        elif block.kind == "table":
+            slide["bullets"] += [" — ".join(course_source.plain_text(c) for c in row)
+                                 for row in block.items]
+    finish()
+    return slides
+
+
+@functools.lru_cache(maxsize=None)
+def all_slides() -> list[Slide]:
+    """Every slide in course order, i.e. the combined deck. Do not mutate."""
+    return [slide for key in module_keys() for slide in load_module(key)]
+
+
+def __getattr__(name: str):
+    # Lazy module attribute (PEP 562) so ``build_slides.SLIDES`` keeps working
+    # for importers without loading any slide file at import time.
+    if name == "SLIDES":
+        return all_slides()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 # ---------------------------------------------------------------------------
-# ODP builder
+# Shared slide helpers (used by both backends)
 # ---------------------------------------------------------------------------
 
-def build_presentation(output_path: str, slides: list | None = None) -> None:
-    if slides is None:
-        slides = SLIDES
-    doc = OpenDocumentPresentation()
+COPYRIGHT = "\u00a9 2026 Jaco Steyn \u2014 Licensed under CC BY-SA 4.0 \u2014 Attribution Required"
+
+
+class BulletClassifier:
+    """Decides which bullets are command/config lines, and in what language.
+
+    Rules are per-language prefix lists, compiled into one anchored regex
+    with a named group per language, so a bullet is classified with a
+    single match call. Results are memoised per bullet text; repeated
+    bullets (and the second pass over a deck by the stream backend or the
+    combined deck) cost a dict lookup.
+    """
+
+    def __init__(self, rules: dict[str, tuple[str, ...]] | None = None) -> None:
+        self._rules: dict[str, tuple[str, ...]] = {}
+        for language, prefixes in (rules or {}).items():
+            self._rules[language] = tuple(prefixes)
+        self._compile()
+
+    def add_rule(self, language: str, prefixes: tuple[str, ...]) -> None:
+        """Add *prefixes* for *language* (an identifier) and recompile."""
+        if not language.isidentifier():
+            raise ValueError(f"language name must be an identifier: {language!r}")
+        self._rules[language] = self._rules.get(language, ()) + tuple(prefixes)
+        self._compile()
+
+    def _compile(self) -> None:
+        groups = [
+            f"(?P<{language}>{'|'.join(map(re.escape, sorted(prefixes, key=len, reverse=True)))})"
+            for language, prefixes in self._rules.items() if prefixes
+        ]
+        match = re.compile(r"\s*(?:" + "|".join(groups) + ")").match if groups else None
+
+        @functools.lru_cache(maxsize=1 << 16)
+        def classify(bullet: str) -> str | None:
+            m = match(bullet) if match else None
+            return m.lastgroup if m else None
+
+        self.classify = classify
+
+    def is_code(self, bullet: str) -> bool:
+        return self.classify(bullet) is not None
+
+
+CODE_RULES: dict[str, tuple[str, ...]] = {
+    "shell": (
+        "podman ", "systemctl ", "journalctl ", "sudo ", "bash ",
+        "cp ", "mkdir ", "cat ", "printf ", "grep ", "curl ",
+        "chmod ", "read ", "uname ", "getenforce", "ip ",
+        "--", "-p ", "-v ", "-e ", "-d ",
+    ),
+    "containerfile": ("FROM ", "RUN ", "COPY ", "USER ", "CMD ", "ENV "),
+    "quadlet": ("[", "Image="),
+    "yaml": ("apiVersion:", "kind:", "metadata:", "spec:", "containers:"),
+}
+
+CLASSIFIER = BulletClassifier(CODE_RULES)
+
+
+def is_code_bullet(bullet: str) -> bool:
+    """True if a bullet reads as a command or config line (rendered monospace)."""
+    return CLASSIFIER.is_code(bullet)
+
+
+def bullet_parts(bullet: str) -> tuple[str, bool]:
+    """(text, is_code) of a bullet: a CodeLine is always code, other text is
+    classified by is_code_bullet()."""
+    if isinstance(bullet, CodeLine):
+        return str(bullet), True
+    return bullet, is_code_bullet(bullet)
+
+
+NOTES_WIDTH = 100
+NOTES_MODES = ("wrap", "flow")
+
+
+@dataclass(frozen=True)
+class BuildOptions:
+    """Per-run settings that are not slide content."""
+    backend: str = "odfpy"      # see BACKENDS
+    notes: str = "wrap"         # see NOTES_MODES and notes_paragraphs()
+    compression: str = "default"  # see COMPRESSION
+    reproducible: bool = False  # fixed zip timestamps; see package_date_time()
+    overflow: str = "warn"      # see OVERFLOW_MODES and fit_slides()
+
+    def fingerprint(self) -> dict:
+        """The fields that change a deck's bytes (the backend does not)."""
+        fields = asdict(self)
+        del fields["backend"]
+        return fields
+
+
+DEFAULT_OPTIONS = BuildOptions()
+
+
+@functools.lru_cache(maxsize=4096)
+def wrap_notes(notes_text: str, width: int = NOTES_WIDTH) -> tuple[str, ...]:
+    """Hard-wrap presenter notes into lines of at most *width* characters."""
+    return tuple(textwrap.fill(notes_text, width=width).split("\n"))
+
+
+def notes_paragraphs(notes_text: str, mode: str = "wrap") -> tuple[tuple[str, ...], ...]:
+    """Presenter notes as paragraphs, each a tuple of lines.
+
+    ``wrap`` hard-wraps the text into one single-line paragraph per line,
+    the historical layout. ``flow`` emits one paragraph per notes block and
+    lets Impress wrap it; newlines in the text become soft line breaks
+    (``text:line-break``) inside that paragraph. It skips textwrap entirely
+    and gives a noticeably smaller content.xml.
+    """
+    if mode == "flow":
+        return (tuple(notes_text.split("\n")),)
+    return tuple((line,) for line in wrap_notes(notes_text))
+
+
+# ---------------------------------------------------------------------------
+# Slide layouts
+# ---------------------------------------------------------------------------
 
-    # ── Page layout ──────────────────────────────────────────────
-    pl = PageLayout(name="widescreen")
-    doc.automaticstyles.addElement(pl)
-    plp = PageLayoutProperties(
-        margin="0cm",
-        pagewidth=SLIDE_W,
-        pageheight=SLIDE_H,
-        printorientation="landscape",
+@dataclass(frozen=True)
+class FrameTemplate:
+    """Geometry (in cm) and presentation class of one frame.
+
+    Shared by every slide that uses it: the attribute strings are formatted
+    once, ``StyleRegistry.frame`` clones an odfpy prototype built from them
+    and ``_frame_open`` caches the streaming backend's start tag.
+    """
+    width: float
+    height: float
+    x: float
+    y: float
+    cls: str | None = None
+
+    def below(self, height: float, gap: float, cls: str | None = None) -> "FrameTemplate":
+        """A frame as wide as this one, *gap* cm under it."""
+        return FrameTemplate(self.width, height, self.x, round(self.y + self.height + gap, 2), cls)
+
+    @functools.cached_property
+    def attrs(self) -> dict[str, str]:
+        return {"width": f"{self.width}cm", "height": f"{self.height}cm",
+                "x": f"{self.x}cm", "y": f"{self.y}cm"}
+
+
+@dataclass(frozen=True)
+class SlideLayout:
+    title: FrameTemplate
+    title_role: str                         # StyleRegistry role of the title span
+    subtitle: FrameTemplate | None = None   # shown when the slide has a subtitle
+    body: FrameTemplate | None = None       # bullets
+    master: str = "Dark"
+
+
+_TITLE_FRAME = FrameTemplate(23.4, 4.0, 1.0, 3.2, "title")
+_HEADING_FRAME = FrameTemplate(23.4, 2.0, 1.0, 0.8, "title")
+_BODY_FRAME = FrameTemplate(23.4, 10.0, 1.0, 3.5, "body")
+
+LAYOUTS = {
+    "title":   SlideLayout(_TITLE_FRAME, "title_text", _TITLE_FRAME.below(1.6, 0.2, "subtitle")),
+    "section": SlideLayout(_TITLE_FRAME, "title_text", _TITLE_FRAME.below(1.6, 0.2, "subtitle"),
+                           master="Section"),
+    "content": SlideLayout(_HEADING_FRAME, "heading_text", body=_BODY_FRAME),
+    "lab":     SlideLayout(_HEADING_FRAME, "heading_text", body=_BODY_FRAME, master="Lab"),
+}
+
+FOOTER_FRAME = FrameTemplate(23.4, 0.6, 1.0, 13.55)
+NOTES_PAGE_FRAME = FrameTemplate(17.0, 12.57, 2.06, 1.14, "page")
+NOTES_TEXT_FRAME = FrameTemplate(17.0, 11.0, 2.06, 14.36, "notes")
+
+
+def slide_layout(slide_type: str) -> SlideLayout:
+    """The layout for *slide_type*, one of SLIDE_TYPES."""
+    return LAYOUTS[slide_type]
+
+
+# ---------------------------------------------------------------------------
+# Text fit
+# ---------------------------------------------------------------------------
+#
+# Estimates how tall a slide's bullets set, so slides whose text runs out of
+# the body frame can be reported (--overflow warn) or continued on extra
+# slides (--overflow split). Each bullet is word-wrapped to the frame width
+# using the font's advance widths, read from the installed TTF when there is
+# one and otherwise from the built-in tables below. Impress adds no spacing
+# between our paragraphs, so a body's height is its line count times the
+# line height.
+
+FONT_DIRS = ("/usr/share/fonts", "/usr/local/share/fonts",
+             "~/.local/share/fonts", "~/.fonts")
+FONT_FILES = {BODY_FONT: "LiberationSans-Regular.ttf", CODE_FONT: "LiberationMono-Regular.ttf"}
+
+# Impress's default text frame insets (cm): left/right, top/bottom.
+TEXT_INSETS = (0.25, 0.125)
+PT_CM = 2.54 / 72
+OVERFLOW_MODES = ("warn", "split")
+CONTINUED = " (cont.)"
+
+# Advance widths in 1/1000 em of printable ASCII (space to "~") and a few
+# characters the course uses, for when the font file is not installed.
+# Liberation Sans is metric-compatible with Arial; Liberation Mono is
+# monospaced. Line heights are (winAscent + winDescent) / unitsPerEm.
+_SANS_ASCII = (
+    278, 278, 355, 556, 556, 889, 667, 191, 333, 333, 389, 584, 278, 333, 278, 278,
+    556, 556, 556, 556, 556, 556, 556, 556, 556, 556, 278, 278, 584, 584, 584, 556,
+    1015, 667, 667, 722, 722, 667, 611, 778, 722, 278, 500, 667, 556, 833, 722, 778,
+    667, 778, 722, 667, 611, 722, 667, 944, 667, 667, 611, 278, 278, 278, 469, 556,
+    333, 556, 556, 500, 556, 556, 278, 556, 556, 222, 222, 500, 222, 833, 556, 556,
+    556, 556, 333, 500, 278, 556, 500, 722, 500, 500, 500, 334, 260, 334, 584,
+)
+_SANS_EXTRA = {"–": 556, "—": 1000, "‘": 222, "’": 222, "“": 333,
+               "”": 333, "•": 350, "…": 1000, "→": 1000, "×": 584}
+_BUILTIN_METRICS = {
+    BODY_FONT: ({**{chr(32 + i): w for i, w in enumerate(_SANS_ASCII)}, **_SANS_EXTRA},
+                556, 1.117),
+    CODE_FONT: ({}, 600, 1.133),
+}
+
+
+class FontMetrics:
+    """Advance widths and line height of one font, in em."""
+
+    def __init__(self, family: str, advances: dict[str, float], default: float,
+                 line_height: float, source: str) -> None:
+        self.family = family
+        self.advances = advances
+        self.default = default
+        self.line_height = line_height
+        self.source = source    # the TTF read, or "built-in"
+
+    def width(self, text: str) -> float:
+        get, default = self.advances.get, self.default
+        return sum(get(ch, default) for ch in text)
+
+
+def _read_ttf(path: str) -> tuple[dict[str, float], float, float]:
+    """(advances by character, default advance, line height) from a TrueType
+    font's cmap (format 4), hmtx, head, hhea and OS/2 tables."""
+    with open(path, "rb") as fh:
+        data = fh.read()
+    (num_tables,) = struct.unpack_from(">H", data, 4)
+    tables = {}
+    for i in range(num_tables):
+        tag, _checksum, offset, _length = struct.unpack_from(">4sIII", data, 12 + 16 * i)
+        tables[tag] = offset
+
+    (upem,) = struct.unpack_from(">H", data, tables[b"head"] + 18)
+    (n_metrics,) = struct.unpack_from(">H", data, tables[b"hhea"] + 34)
+    advances = struct.unpack_from(">" + "Hxx" * n_metrics, data, tables[b"hmtx"])
+    win_ascent, win_descent = struct.unpack_from(">HH", data, tables[b"OS/2"] + 74)
+
+    cmap = tables[b"cmap"]
+    (n_subtables,) = struct.unpack_from(">H", data, cmap + 2)
+    subtable = None
+    for i in range(n_subtables):
+        platform, encoding, offset = struct.unpack_from(">HHI", data, cmap + 4 + 8 * i)
+        if (platform, encoding) in ((3, 1), (0, 3)):
+            subtable = cmap + offset
+            break
+    widths: dict[str, float] = {}
+    if subtable is not None and struct.unpack_from(">H", data, subtable)[0] == 4:
+        (seg_x2,) = struct.unpack_from(">H", data, subtable + 6)
+        segs = seg_x2 // 2
+        ends = struct.unpack_from(f">{segs}H", data, subtable + 14)
+        starts = struct.unpack_from(f">{segs}H", data, subtable + 16 + seg_x2)
+        deltas = struct.unpack_from(f">{segs}h", data, subtable + 16 + 2 * seg_x2)
+        range_at = subtable + 16 + 3 * seg_x2
+        ranges = struct.unpack_from(f">{segs}H", data, range_at)
+        for seg, (start, end, delta, rng) in enumerate(zip(starts, ends, deltas, ranges)):
+            for code in range(start, min(end, 0xFFFE) + 1):
+                if rng:
+                    at = range_at + 2 * seg + rng + 2 * (code - start)
+                    (glyph,) = struct.unpack_from(">H", data, at)
+                    glyph = (glyph + delta) & 0xFFFF if glyph else 0
+                else:
+                    glyph = (code + delta) & 0xFFFF
+                if glyph:
+                    advance = advances[min(glyph, n_metrics - 1)]
+                    widths[chr(code)] = advance / upem
+    return widths, advances[0] / upem, (win_ascent + win_descent) / upem
+
+
+def find_font(family: str) -> str | None:
+    """Path of *family*'s regular TTF under FONT_DIRS, if installed."""
+    name = FONT_FILES.get(family)
+    for root in FONT_DIRS:
+        for dirpath, _dirs, files in os.walk(os.path.expanduser(root)):
+            if name in files:
+                return os.path.join(dirpath, name)
+    return None
+
+
+@functools.lru_cache(maxsize=None)
+def font_metrics(family: str) -> FontMetrics:
+    """Metrics of *family*, read once per process."""
+    path = find_font(family)
+    if path is not None:
+        try:
+            return FontMetrics(family, *_read_ttf(path), source=path)
+        except (OSError, KeyError, struct.error):
+            pass    # unreadable or unusual font: fall back to the tables
+    widths, default, line_height = _BUILTIN_METRICS[family]
+    return FontMetrics(family, {ch: w / 1000 for ch, w in widths.items()}, default / 1000,
+                       line_height, source="built-in")
+
+
+@functools.lru_cache(maxsize=1 << 14)
+def bullet_height(text: str, code: bool, width: float = _BODY_FRAME.width) -> float:
+    """Height in cm of one bullet paragraph wrapped in a frame *width* cm wide."""
+    font = font_metrics(CODE_FONT if code else BODY_FONT)
+    size = (CODE_PT if code else BULLET_PT) * PT_CM
+    room = (width - 2 * TEXT_INSETS[0]) / size      # line width in em
+    space = font.width(" ")
+    lines, line = 1, 0.0
+    for i, word in enumerate(text.split(" ")):
+        w = font.width(word)
+        if line and line + space + w > room:
+            lines, line = lines + 1, 0.0
+        elif i:
+            line += space
+        if not line and w > room:
+            # Longer than a line: Impress breaks it wherever it runs out.
+            extra = int(w // room)
+            lines, w = lines + extra, w - extra * room
+        line += w
+    return lines * size * font.line_height
+
+
+def body_height(slide: Slide) -> float:
+    """Estimated height in cm of *slide*'s bullets as set in its body frame."""
+    return sum(bullet_height(*bullet_parts(b)) for b in slide.bullets)
+
+
+def body_room(layout: SlideLayout) -> float:
+    """Height in cm available to text in *layout*'s body frame."""
+    return layout.body.height - 2 * TEXT_INSETS[1]
+
+
+def overflowing(slides: list[Slide]) -> list[tuple[int, Slide, float]]:
+    """``(1-based index, slide, body height)`` of each slide whose bullets
+    do not fit its body frame."""
+    found = []
+    for i, slide in enumerate(slides, 1):
+        layout = slide_layout(slide.type)
+        if layout.body is not None and slide.bullets:
+            height = body_height(slide)
+            if height > body_room(layout):
+                found.append((i, slide, height))
+    return found
+
+
+def split_slide(slide: Slide) -> list[Slide]:
+    """*slide*, or *slide* and its continuations if its bullets overflow.
+
+    Bullets are kept whole and in order; each continuation repeats the title
+    with CONTINUED appended. The notes stay on the first slide. A single
+    bullet taller than the frame still gets a slide to itself.
+    """
+    layout = slide_layout(slide.type)
+    if layout.body is None or not slide.bullets:
+        return [slide]
+    room = body_room(layout)
+    parts: list[list[str]] = [[]]
+    used = 0.0
+    for bullet in slide.bullets:
+        height = bullet_height(*bullet_parts(bullet))
+        if parts[-1] and used + height > room:
+            parts.append([])
+            used = 0.0
+        parts[-1].append(bullet)
+        used += height
+    if len(parts) == 1:
+        return [slide]
+    return [replace(slide, bullets=tuple(part), title=slide.title + CONTINUED if i else slide.title,
+                    notes="" if i else slide.notes)
+            for i, part in enumerate(parts)]
+
+
+def fit_slides(slides: list[Slide]) -> list[Slide]:
+    """*slides* with every overflowing slide split into continuations."""
+    return [part for slide in slides for part in split_slide(slide)]
+
+
+# ---------------------------------------------------------------------------
+# Style registry
+# ---------------------------------------------------------------------------
+
+@dataclass(frozen=True)
+class Theme:
+    """Everything the automatic styles depend on; hashable so it can key a cache."""
+    bg_dark: str = BG_DARK
+    bg_section: str = BG_SECTION
+    bg_lab: str = BG_LAB
+    accent: str = ACCENT
+    text_primary: str = TEXT_PRIMARY
+    text_dim: str = TEXT_DIM
+    white: str = WHITE
+    slide_w: str = SLIDE_W
+    slide_h: str = SLIDE_H
+
+
+THEME = Theme()
+
+
+class StyleRegistry:
+    """Page layout, master pages and automatic styles for one Theme.
+
+    Built once per process by ``style_registry`` and attached to every deck
+    instead of recreating ~13 odfpy elements per ``build_presentation`` call.
+    Styles with identical family and properties are created only once, and
+    names are assigned in creation order (``s1``, ``s2``, ...) so they are
+    the same in every deck.
+
+    odfpy elements have a single parent, so ``attach`` moves the shared
+    elements into the given document; decks must be rendered and saved one
+    at a time per process (which is how the builder and its workers run).
+    """
+
+    ROLES = (
+        "title_text", "subtitle_text", "heading_text", "bullet_text", "code_text",
+        "notes_text", "copyright_text", "bg_dark", "bg_section", "bg_lab", "box",
     )
-    pl.addElement(plp)
 
-    # ── Master page ───────────────────────────────────────────────
-    master = MasterPage(name="Dark", pagelayoutname=pl)
-    doc.masterstyles.addElement(master)
+    def __init__(self, theme: Theme) -> None:
+        self.theme = theme
+        self._styles: list[Style] = []
+        self._by_props: dict[tuple, Style] = {}
+        self._frames: dict[FrameTemplate, Frame] = {}
+
+        self.page_layout = PageLayout(name="widescreen")
+        self.page_layout.addElement(PageLayoutProperties(
+            margin="0cm",
+            pagewidth=theme.slide_w,
+            pageheight=theme.slide_h,
+            printorientation="landscape",
+        ))
+
+        self.title_text     = self._style("text", fontsize="34pt", fontweight="bold", color=theme.white)
+        self.subtitle_text  = self._style("text", fontsize="18pt",                    color=theme.text_dim)
+        self.heading_text   = self._style("text", fontsize="26pt", fontweight="bold", color=theme.accent)
+        self.bullet_text    = self._style("text", fontsize=f"{BULLET_PT}pt",          color=theme.text_primary)
+        self.code_text      = self._style("text", fontsize=f"{CODE_PT}pt",            color=theme.accent,
+                                          fontfamily=CODE_FONT)
+        self.notes_text     = self._style("text", fontsize="12pt",                    color="#111111")
+        self.copyright_text = self._style("text", fontsize="14pt",                    color=theme.text_dim)
+
+        self.bg_dark    = self._style("drawing-page", fill="solid", fillcolor=theme.bg_dark,    backgroundsize="border")
+        self.bg_section = self._style("drawing-page", fill="solid", fillcolor=theme.bg_section, backgroundsize="border")
+        self.bg_lab     = self._style("drawing-page", fill="solid", fillcolor=theme.bg_lab,     backgroundsize="border")
+
+        self.box = self._style("graphic", stroke="none", fill="none")
 
-    # ── Helper: create a Style object and register it ─────────────
-    _style_counter = [0]
+        # One master per background. Each carries what every slide used to
+        # repeat: the background fill, the copyright footer and, in its
+        # notes master, the notes-page placeholders.
+        self.masters = {
+            name: self._master(name, background)
+            for name, background in (("Dark", self.bg_dark), ("Section", self.bg_section),
+                                     ("Lab", self.bg_lab))
+        }
+        self.master = self.masters["Dark"]
 
-    def make_style(family: str, **props) -> Style:
-        _style_counter[0] += 1
-        s = Style(name=f"s{_style_counter[0]}", family=family)
+    def _master(self, name: str, background: Style) -> MasterPage:
+        master = MasterPage(name=name, pagelayoutname=self.page_layout, stylename=background)
+        footer = self.frame(FOOTER_FRAME)
+        footer_tb = TextBox()
+        fp = P()
+        fp.addElement(Span(stylename=self.copyright_text, text=COPYRIGHT))
+        footer_tb.addElement(fp)
+        footer.addElement(footer_tb)
+        master.addElement(footer)
+
+        notes = Notes()
+        for template in (NOTES_PAGE_FRAME, NOTES_TEXT_FRAME):
+            frame = self.frame(template)
+            frame.setAttrNS(PRESENTATIONNS, "placeholder", "true")
+            notes.addElement(frame)
+        master.addElement(notes)
+        return master
+
+    def master_name(self, slide_type: str) -> str:
+        """The master page (and so background) for a slide of *slide_type*."""
+        return slide_layout(slide_type).master
+
+    def frame(self, template: FrameTemplate) -> Frame:
+        """A new, empty frame laid out by *template*, in the ``box`` style.
+
+        Cloned from a prototype built once per template: a shallow copy with
+        fresh attribute and child lists costs a fraction of the keyword
+        validation odfpy does when constructing a Frame.
+        """
+        proto = self._frames.get(template)
+        if proto is None:
+            proto = Frame(stylename=self.box, **template.attrs)
+            if template.cls is not None:
+                proto.setAttrNS(PRESENTATIONNS, "class", template.cls)
+            self._frames[template] = proto
+        frame = copy.copy(proto)
+        frame.attributes = dict(proto.attributes)
+        frame.childNodes = []
+        return frame
+
+    def _style(self, family: str, **props) -> Style:
+        key = (family, tuple(sorted(props.items())))
+        existing = self._by_props.get(key)
+        if existing is not None:
+            return existing
+        s = Style(name=f"s{len(self._styles) + 1}", family=family)
         if family == "text":
             s.addElement(TextProperties(**props))
         elif family == "graphic":
             s.addElement(GraphicProperties(**props))
         elif family == "drawing-page":
             s.addElement(DrawingPageProperties(**props))
-        doc.automaticstyles.addElement(s)
+        self._styles.append(s)
+        self._by_props[key] = s
         return s
 
-    # ── Pre-build all required styles ────────────────────────────
-    S_TITLE_TEXT    = make_style("text", fontsize="34pt", fontweight="bold",   color=WHITE)
-    S_SUBTITLE_TEXT = make_style("text", fontsize="18pt",                       color=TEXT_DIM)
-    S_HEADING_TEXT  = make_style("text", fontsize="26pt", fontweight="bold",   color=ACCENT)
-    S_BULLET_TEXT   = make_style("text", fontsize="15pt",                       color=TEXT_PRIMARY)
-    S_CODE_TEXT     = make_style("text", fontsize="13pt",                       color=ACCENT,
-                                 fontfamily="Liberation Mono")
-    S_NOTES_TEXT    = make_style("text", fontsize="12pt",                       color="#111111")
-    S_COPYRIGHT_TEXT = make_style("text", fontsize="14pt",                      color=TEXT_DIM)
+    @property
+    def styles(self) -> list[Style]:
+        return list(self._styles)
 
-    S_BG_DARK    = make_style("drawing-page", fill="solid", fillcolor=BG_DARK,    backgroundsize="border")
-    S_BG_SECTION = make_style("drawing-page", fill="solid", fillcolor=BG_SECTION, backgroundsize="border")
-    S_BG_LAB     = make_style("drawing-page", fill="solid", fillcolor=BG_LAB,     backgroundsize="border")
+    @functools.cached_property
+    def names(self) -> dict[str, str]:
+        """Style name for each attribute, e.g. ``{"box": "s11", ...}``."""
+        return {role: getattr(self, role).getAttribute("name") for role in self.ROLES}
 
-    S_BOX = make_style("graphic", stroke="none", fill="none")
+    @property
+    def order(self) -> dict[bytes, int]:
+        """Automatic style names (UTF-8) mapped to their creation index."""
+        return {s.getAttribute("name").encode("utf-8"): i for i, s in enumerate(self._styles)}
 
-    # ── Slide builder ─────────────────────────────────────────────
-    def add_slide(data: dict) -> None:
-        stype = data.get("type", "content")
+    def attach(self, doc: OpenDocumentPresentation) -> None:
+        doc.automaticstyles.addElement(self.page_layout)
+        for s in self._styles:
+            doc.automaticstyles.addElement(s)
+        for master in self.masters.values():
+            doc.masterstyles.addElement(master)
 
-        if stype == "section":
-            bg_style = S_BG_SECTION
-        elif stype == "lab":
-            bg_style = S_BG_LAB
-        else:
-            bg_style = S_BG_DARK
 
-        page = Page(stylename=bg_style, masterpagename=master)
+@functools.lru_cache(maxsize=None)
+def style_registry(theme: Theme = THEME) -> StyleRegistry:
+    return StyleRegistry(theme)
+
+
+# ---------------------------------------------------------------------------
+# ODP builder
+# ---------------------------------------------------------------------------
+
+def render_presentation(slides: list[Slide],
+                        options: BuildOptions = DEFAULT_OPTIONS) -> OpenDocumentPresentation:
+    """Build the in-memory odfpy document for *slides* without saving it."""
+    doc = OpenDocumentPresentation()
+
+    # ── Shared page layout, master page and automatic styles ────
+    with PHASES("styles"):
+        styles = style_registry(THEME)
+        styles.attach(doc)
+
+    S_SUBTITLE_TEXT  = styles.subtitle_text
+    S_BULLET_TEXT    = styles.bullet_text
+    S_CODE_TEXT      = styles.code_text
+    S_NOTES_TEXT     = styles.notes_text
+
+    # ── Slide builder ─────────────────────────────────────────────
+    def add_slide(data: Slide) -> None:
+        layout = slide_layout(data.type)
+
+        # Background and footer come from the master page.
+        page = Page(masterpagename=layout.master)
         doc.presentation.addElement(page)
 
         # ── Title frame ─────────────────────────────────────────
-        if stype in ("title", "section"):
-            t_top, t_h = "3.2cm", "4.0cm"
-        else:
-            t_top, t_h = "0.8cm", "2.0cm"
-
-        title_frame = Frame(
-            stylename=S_BOX,
-            width="23.4cm", height=t_h,
-            x="1.0cm", y=t_top,
-        )
-        title_frame.setAttrNS(PRESENTATIONNS, "class", "title")
+        title_frame = styles.frame(layout.title)
         title_tb = TextBox()
         title_frame.addElement(title_tb)
-
-        t_style = S_TITLE_TEXT if stype in ("title", "section") else S_HEADING_TEXT
         tp = P()
-        tp.addElement(Span(stylename=t_style, text=data.get("title", "")))
+        tp.addElement(Span(stylename=getattr(styles, layout.title_role),
+                           text=data.title))
         title_tb.addElement(tp)
         page.addElement(title_frame)
 
         # ── Subtitle (title / section slides) ───────────────────
-        if stype in ("title", "section") and data.get("subtitle"):
-            sub_y = f"{float(t_top.replace('cm','')) + float(t_h.replace('cm','')) + 0.2:.2f}cm"
-            sub_frame = Frame(
-                stylename=S_BOX,
-                width="23.4cm", height="1.6cm",
-                x="1.0cm", y=sub_y,
-            )
-            sub_frame.setAttrNS(PRESENTATIONNS, "class", "subtitle")
+        if layout.subtitle is not None and data.subtitle:
+            sub_frame = styles.frame(layout.subtitle)
             sub_tb = TextBox()
             sub_frame.addElement(sub_tb)
             sp = P()
-            sp.addElement(Span(stylename=S_SUBTITLE_TEXT, text=data["subtitle"]))
+            sp.addElement(Span(stylename=S_SUBTITLE_TEXT, text=data.subtitle))
             sub_tb.addElement(sp)
             page.addElement(sub_frame)
 
         # ── Content frame (bullets) ──────────────────────────────
-        if stype not in ("title", "section"):
-            content_frame = Frame(
-                stylename=S_BOX,
-                width="23.4cm", height="10.0cm",
-                x="1.0cm", y="3.5cm",
-            )
-            content_frame.setAttrNS(PRESENTATIONNS, "class", "body")
+        if layout.body is not None:
+            content_frame = styles.frame(layout.body)
             content_tb = TextBox()
             content_frame.addElement(content_tb)
 
-            for bullet in data.get("bullets", []):
+            for bullet in data.bullets:
+                text, code = bullet_parts(bullet)
                 bp = P()
-                is_code = any(bullet.lstrip().startswith(tok) for tok in (
-                    "podman ", "systemctl ", "journalctl ", "sudo ", "bash ",
-                    "cp ", "mkdir ", "cat ", "printf ", "grep ", "curl ",
-                    "chmod ", "read ", "uname ", "getenforce", "ip ",
-                    "[", "Image=", "FROM ", "RUN ", "COPY ", "USER ", "CMD ",
-                    "ENV ", "--", "-p ", "-v ", "-e ", "-d ",
-                ))
                 bp.addElement(Span(
-                    stylename=S_CODE_TEXT if is_code else S_BULLET_TEXT,
-                    text=bullet,
+                    stylename=S_CODE_TEXT if code else S_BULLET_TEXT,
+                    text=text,
                 ))
                 content_tb.addElement(bp)
 
             page.addElement(content_frame)
 
         # ── Presenter notes ──────────────────────────────────────
-        notes_text = data.get("notes", "")
+        notes_text = data.notes
         if notes_text:
             notes_el = Notes()
 
             # Slide thumbnail placeholder — required by LibreOffice Impress
             # to make the Notes panel visible at all.
-            thumb_frame = Frame(
-                stylename=S_BOX,
-                width="17.0cm", height="12.57cm",
-                x="2.06cm", y="1.14cm",
-            )
-            thumb_frame.setAttrNS(PRESENTATIONNS, "class", "page")
-            notes_el.addElement(thumb_frame)
+            notes_el.addElement(styles.frame(NOTES_PAGE_FRAME))
 
             # Notes text frame — positioned below the thumbnail
-            notes_frame = Frame(
-                stylename=S_BOX,
-                width="17.0cm", height="11.0cm",
-                x="2.06cm", y="14.36cm",
-            )
-            notes_frame.setAttrNS(PRESENTATIONNS, "class", "notes")
+            notes_frame = styles.frame(NOTES_TEXT_FRAME)
             notes_tb = TextBox()
             notes_frame.addElement(notes_tb)
 
-            for para in textwrap.fill(notes_text, width=100).split("\n"):
+            with PHASES("notes_wrap"):
+                paragraphs = notes_paragraphs(notes_text, options.notes)
+            for lines in paragraphs:
                 np = P()
-                np.addElement(Span(stylename=S_NOTES_TEXT, text=para))
+                span = Span(stylename=S_NOTES_TEXT, text=lines[0])
+                for line in lines[1:]:
+                    span.addElement(LineBreak())
+                    span.addText(line)
+                np.addElement(span)
                 notes_tb.addElement(np)
 
             notes_el.addElement(notes_frame)
             page.addElement(notes_el)
 
-        # ── Footer: copyright line on every slide ─────────────────
-        footer_frame = Frame(
-            stylename=S_BOX,
-            width="23.4cm", height="0.6cm",
-            x="1.0cm", y="13.55cm",
-        )
-        footer_tb = TextBox()
-        footer_frame.addElement(footer_tb)
-        fp = P()
-        fp.addElement(Span(
-            stylename=S_COPYRIGHT_TEXT,
-            text="\u00a9 2026 Jaco Steyn \u2014 Licensed under CC BY-SA 4.0 \u2014 Attribution Required",
-        ))
-        footer_tb.addElement(fp)
-        page.addElement(footer_frame)
-
     # ── Build deck ────────────────────────────────────────────────
-    for slide in slides:
-        add_slide(slide)
+    with PHASES("add_slide"):
+        for slide in slides:
+            add_slide(slide)
+
+    return doc
+
+
+# Uses every element kind a real deck does, in the same order.
+_PRIME_SLIDE = Slide("prime", "title", "-", subtitle="-", notes="-")
+
+
+def prime_odf_namespaces() -> None:
+    """Warm odfpy's process-wide namespace table with a throwaway deck.
+
+    odfpy records every namespace it has serialised in a class-level dict
+    and declares all of them on each later document, so the first deck saved
+    in a process carries fewer ``xmlns`` attributes than the rest. Priming
+    once per process makes every deck's bytes independent of build order,
+    which is what lets ``--jobs`` match the serial output exactly.
+    """
+    render_presentation([_PRIME_SLIDE]).save(io.BytesIO())
+
+
+def build_presentation(output_path: str, slides: list[Slide] | None = None,
+                       options: BuildOptions = DEFAULT_OPTIONS) -> int:
+    """Write *slides* (default: the whole course) as an ODP; return the number
+    of slides written, which --overflow split can make more than given."""
+    if slides is None:
+        slides = all_slides()
+    if options.overflow == "split":
+        with PHASES("fit"):
+            slides = fit_slides(slides)
+    if options.backend == "stream":
+        write_presentation(output_path, slides, options)
+        return len(slides)
+    doc = render_presentation(slides, options)
 
     # ── Save ──────────────────────────────────────────────────────
+    # Same entries and order as doc.save(), but written by write_package()
+    # so --compression applies to both backends.
+    with PHASES("save"):
+        write_package(output_path, {
+            "styles.xml": doc.stylesxml().encode("utf-8"),
+            "content.xml": doc.contentxml(),
+            "meta.xml": doc.metaxml().encode("utf-8"),
+        }, options)
+    return len(slides)
+
+
+# ---------------------------------------------------------------------------
+# Streaming backend
+# ---------------------------------------------------------------------------
+#
+# Writes content.xml straight into the zip from the slide dicts, one page at a
+# time, without building an odfpy tree. The odfpy backend above remains the
+# reference: everything that does not depend on the slides (styles.xml,
+# meta.xml, the manifest, the document-content start tag and each style's
+# XML) is captured from odfpy once per process, and --verify-backends checks
+# that both backends produce the same documents.
+
+BACKENDS = ("odfpy", "stream")
+
+_XML_ILLEGAL_RE = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f\ufffe\uffff]")
+
+
+def _xml_text(text: str) -> str:
+    return xml_escape(_XML_ILLEGAL_RE.sub("\ufffd", text))
+
+
+@dataclass(frozen=True)
+class PackageTemplate:
+    """The slide-independent parts of an ODP package for one Theme."""
+    entries: tuple          # ((ZipInfo, bytes | None), ...); None marks content.xml
+    content_head: bytes     # XML prologue + <office:document-content ...> start tag
+    style_xml: dict         # style name -> serialised <style:style> element
+
+
+@functools.lru_cache(maxsize=None)
+def package_template(theme: Theme = THEME) -> PackageTemplate:
+    prime_odf_namespaces()
+    registry = style_registry(theme)
+    doc = OpenDocumentPresentation()
+    registry.attach(doc)
+    buf = io.BytesIO()
+    doc.save(buf)
+
+    entries = []
+    with zipfile.ZipFile(buf) as zf:
+        for info in zf.infolist():
+            if info.filename == "content.xml":
+                content = zf.read(info)
+                entries.append((info, None))
+            else:
+                entries.append((info, zf.read(info)))
+    head = content[:content.index(b"<office:automatic-styles")]
+
+    style_xml = {}
+    for el in registry.styles:
+        out = io.StringIO()
+        el.toXml(2, out)
+        style_xml[el.getAttribute("name")] = out.getvalue()
+    return PackageTemplate(tuple(entries), head, style_xml)
+
+
+# --compression: name -> (zip method, zlib level; None is zlib's default).
+COMPRESSION = {
+    "store": (zipfile.ZIP_STORED, None),
+    "fast": (zipfile.ZIP_DEFLATED, 1),
+    "default": (zipfile.ZIP_DEFLATED, None),
+    "max": (zipfile.ZIP_DEFLATED, 9),
+}
+
+
+# 1980-01-01 00:00:00 UTC, the earliest time a zip entry can record.
+ZIP_EPOCH = 315532800
+
+
+def package_date_time(options: BuildOptions = DEFAULT_OPTIONS) -> tuple:
+    """Timestamp for every entry of a package written with *options*.
+
+    Reproducible builds use $SOURCE_DATE_EPOCH (see reproducible-builds.org)
+    or else ZIP_EPOCH, so unchanged slides give byte-identical decks.
+    """
+    if not options.reproducible:
+        return time.localtime()[:6]
+    epoch = max(int(os.environ.get("SOURCE_DATE_EPOCH", ZIP_EPOCH)), ZIP_EPOCH)
+    return time.gmtime(epoch)[:6]
+
+
+def _package_info(src: zipfile.ZipInfo, date_time: tuple, compression: str) -> zipfile.ZipInfo:
+    info = zipfile.ZipInfo(src.filename, date_time)
+    info.create_system = src.create_system
+    info.external_attr = src.external_attr
+    if src.filename == "mimetype":
+        # ODF requires the mimetype entry first and uncompressed.
+        info.compress_type = zipfile.ZIP_STORED
+    else:
+        info.compress_type, level = COMPRESSION[compression]
+        # ZipFile.open(info, "w") takes no level argument; it reads this.
+        info._compresslevel = level
+    return info
+
+
+def write_package(output_path: str, parts: dict, options: BuildOptions = DEFAULT_OPTIONS,
+                  theme: Theme = THEME) -> None:
+    """Write an ODP package with odfpy's entries, in odfpy's order.
+
+    *parts* maps entry names to the bytes that replace the template's, or to
+    a callable that streams the entry into the file object it is given;
+    content.xml must be among them. Entry order, style names (registry
+    creation order) and namespace declarations (prime_odf_namespaces) are
+    already stable, so with ``options.reproducible`` the bytes depend only
+    on the slides and options.
+    """
     os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
-    doc.save(output_path)
-    print(f"Saved {output_path}  ({len(slides)} slides)")
+    now = package_date_time(options)
+    with zipfile.ZipFile(output_path, "w") as zf:
+        for src, payload in package_template(theme).entries:
+            info = _package_info(src, now, options.compression)
+            payload = parts.get(src.filename, payload)
+            if callable(payload):
+                with zf.open(info, "w") as out:
+                    payload(out)
+            else:
+                zf.writestr(info, payload)
 
 
-if __name__ == "__main__":
-    import sys
-    from collections import OrderedDict
+def compression_tradeoff(path: str) -> dict:
+    """Repack the ODP at *path* in memory with every COMPRESSION mode.
 
-    out_dir = sys.argv[1] if len(sys.argv) > 1 else "slides"
-    os.makedirs(out_dir, exist_ok=True)
+    Returns ``{mode: (bytes, seconds)}`` for the size/time report.
+    """
+    with zipfile.ZipFile(path) as zf:
+        entries = [(info, zf.read(info)) for info in zf.infolist()]
+    report = {}
+    for mode in COMPRESSION:
+        buf = io.BytesIO()
+        start = time.perf_counter()
+        with zipfile.ZipFile(buf, "w") as out:
+            for src, data in entries:
+                out.writestr(_package_info(src, src.date_time, mode), data)
+        report[mode] = (buf.tell(), time.perf_counter() - start)
+    return report
+
+
+@functools.lru_cache(maxsize=None)
+def _frame_open(template: FrameTemplate, style: str, empty: bool = False) -> str:
+    """The ``<draw:frame>`` start tag (or empty element) for *template*."""
+    a = template.attrs
+    tag = (f'<draw:frame draw:style-name="{style}" svg:width="{a["width"]}" '
+           f'svg:height="{a["height"]}" svg:x="{a["x"]}" svg:y="{a["y"]}"')
+    if template.cls is not None:
+        tag += f' presentation:class="{template.cls}"'
+    return tag + ("/>" if empty else ">")
+
+
+def _text_box(style: str, paragraphs: list) -> str:
+    """A text box with one span per paragraph; a paragraph is a string or a
+    tuple of lines joined by soft line breaks."""
+    spans = "".join(
+        f'<text:p><text:span text:style-name="{style}">'
+        + (_xml_text(para) if isinstance(para, str)
+           else "<text:line-break/>".join(map(_xml_text, para)))
+        + "</text:span></text:p>"
+        for para in paragraphs
+    )
+    return f"<draw:text-box>{spans}</draw:text-box>"
+
+
+def _slide_styles(data: Slide, names: dict) -> set[str]:
+    """Names of the automatic styles one slide references."""
+    layout = slide_layout(data.type)
+    used = {names["box"], names[layout.title_role]}
+    if layout.subtitle is not None and data.subtitle:
+        used.add(names["subtitle_text"])
+    if layout.body is not None:
+        for bullet in data.bullets:
+            used.add(names["code_text"] if bullet_parts(bullet)[1] else names["bullet_text"])
+    if data.notes:
+        used.add(names["notes_text"])
+    return used
+
+
+def _slide_xml(data: Slide, names: dict, options: BuildOptions = DEFAULT_OPTIONS) -> str:
+    """One ``<draw:page>``, mirroring ``render_presentation``'s add_slide."""
+    layout = slide_layout(data.type)
+    box = names["box"]
+    out = [f'<draw:page draw:master-page-name="{layout.master}">']
+
+    out.append(_frame_open(layout.title, box))
+    out.append(_text_box(names[layout.title_role], [data.title]))
+    out.append("</draw:frame>")
+
+    if layout.subtitle is not None and data.subtitle:
+        out.append(_frame_open(layout.subtitle, box))
+        out.append(_text_box(names["subtitle_text"], [data.subtitle]))
+        out.append("</draw:frame>")
+
+    if layout.body is not None:
+        out.append(_frame_open(layout.body, box))
+        out.append("<draw:text-box>")
+        for bullet in data.bullets:
+            text, code = bullet_parts(bullet)
+            style = names["code_text"] if code else names["bullet_text"]
+            out.append(f'<text:p><text:span text:style-name="{style}">'
+                       f'{_xml_text(text)}</text:span></text:p>')
+        out.append("</draw:text-box></draw:frame>")
+
+    notes_text = data.notes
+    if notes_text:
+        out.append("<presentation:notes>")
+        out.append(_frame_open(NOTES_PAGE_FRAME, box, empty=True))
+        out.append(_frame_open(NOTES_TEXT_FRAME, box))
+        with PHASES("notes_wrap"):
+            paragraphs = notes_paragraphs(notes_text, options.notes)
+        out.append(_text_box(names["notes_text"], paragraphs))
+        out.append("</draw:frame></presentation:notes>")
+
+    out.append("</draw:page>")
+    return "".join(out)
 
-    # ── Per-module files ──────────────────────────────────────────
-    # Preserve insertion order so files come out numbered correctly
+
+def write_presentation(output_path: str, slides: list,
+                       options: BuildOptions = DEFAULT_OPTIONS, theme: Theme = THEME) -> None:
+    """Stream *slides* into an ODP at *output_path* without an odfpy tree."""
+    with PHASES("styles"):
+        tpl = package_template(theme)
+        names = style_registry(theme).names
+        used: set[str] = set()
+        for data in slides:
+            used |= _slide_styles(data, names)
+        auto = "".join(tpl.style_xml[n] for n in tpl.style_xml if n in used)
+
+    def write_content(out) -> None:
+        out.write(tpl.content_head)
+        if auto:
+            out.write(f"<office:automatic-styles>{auto}</office:automatic-styles>"
+                      .encode("utf-8"))
+        else:
+            out.write(b"<office:automatic-styles/>")
+        if not slides:
+            out.write(b"<office:body><office:presentation/></office:body>")
+        else:
+            out.write(b"<office:body><office:presentation>")
+            for data in slides:
+                out.write(_slide_xml(data, names, options).encode("utf-8"))
+            out.write(b"</office:presentation></office:body>")
+        out.write(b"</office:document-content>")
+
+    with PHASES("save"):
+        write_package(output_path, {"content.xml": write_content}, options, theme)
+
+
+def compare_backends(slides: list, workdir: str,
+                     options: BuildOptions = DEFAULT_OPTIONS) -> list[str]:
+    """Build *slides* with both backends; return package entries that differ.
+
+    XML entries are compared after C14N canonicalisation, so attribute order
+    and namespace declaration order do not matter, only document content.
+    """
+    paths = {}
+    for backend in BACKENDS:
+        paths[backend] = os.path.join(workdir, f"{backend}.odp")
+        build_presentation(paths[backend], slides, replace(options, backend=backend))
+    return package_diffs(paths["odfpy"], paths["stream"])
+
+
+def compare_merge(slides: list, workdir: str,
+                  options: BuildOptions = DEFAULT_OPTIONS) -> list[str]:
+    """Merge per-module decks of *slides*, with an empty deck first and last,
+    and return the package entries that differ from rendering *slides* whole."""
+    paths = [os.path.join(workdir, "empty.odp")]
+    build_presentation(paths[0], [], options)
+    for key, deck_slides in group_by_module(slides).items():
+        paths.append(os.path.join(workdir, f"{key}.odp"))
+        build_presentation(paths[-1], deck_slides, options)
+    paths.append(paths[0])
+    merged, rendered = (os.path.join(workdir, name) for name in ("merged.odp", "rendered.odp"))
+    merge_presentations(merged, paths, options)
+    build_presentation(rendered, slides, options)
+    return package_diffs(rendered, merged)
+
+
+def package_diffs(ref_path: str, alt_path: str) -> list[str]:
+    """Names of the package entries that differ between two ODP files."""
+    with zipfile.ZipFile(ref_path) as ref, zipfile.ZipFile(alt_path) as alt:
+        ref_names, alt_names = ref.namelist(), alt.namelist()
+        diffs = sorted(set(ref_names) ^ set(alt_names))
+        for name in ref_names:
+            if name not in alt_names:
+                continue
+            a, b = ref.read(name), alt.read(name)
+            if name.endswith(".xml"):
+                a, b = canonicalize(a.decode("utf-8")), canonicalize(b.decode("utf-8"))
+            if a != b:
+                diffs.append(name)
+    return diffs
+
+
+_BODY_OPEN = b"<office:presentation>"
+_BODY_CLOSE = b"</office:presentation>"
+_BODY_EMPTY = b"<office:presentation/>"
+_AUTO_STYLES_RE = re.compile(
+    rb"<office:automatic-styles(?:/>|>(.*?)</office:automatic-styles>)", re.S)
+_STYLE_RE = re.compile(rb'<style:style style:name="([^"]+)".*?</style:style>', re.S)
+
+
+def merge_presentations(output_path: str, deck_paths: list[str],
+                        options: BuildOptions = DEFAULT_OPTIONS) -> int:
+    """Write a deck whose pages are those of *deck_paths*, in order, and
+    return its page count.
+
+    Every deck from ``build_presentation`` names its automatic styles
+    identically, and odfpy only serialises the ones a deck uses, so the
+    combined content.xml is the union of the decks' styles followed by their
+    ``<draw:page>`` fragments concatenated verbatim. This costs one zip read
+    per module and one zip write instead of a second full render. The other
+    package entries are copied from the first deck; decks with no slides
+    add nothing.
+    """
+    styles: dict[bytes, bytes] = {}
+    pages: list[bytes] = []
+    frame = None
+    count = 0
+    for i, path in enumerate(deck_paths):
+        with zipfile.ZipFile(path) as zf:
+            content = zf.read("content.xml")
+            if i == 0:
+                first = content
+                entries = [(info, zf.read(info)) for info in zf.infolist()
+                           if info.filename != "content.xml"]
+        auto = _AUTO_STYLES_RE.search(content)
+        for m in _STYLE_RE.finditer(auto.group(1) or b""):
+            if styles.setdefault(m.group(1), m.group(0)) != m.group(0):
+                raise ValueError(f"{path}: style {m.group(1).decode()} differs "
+                                 f"from earlier decks; cannot merge")
+        # A deck with no slides is written as <office:presentation/> and
+        # contributes no pages.
+        if content.find(_BODY_EMPTY, auto.end()) != -1:
+            continue
+        start = content.index(_BODY_OPEN, auto.end()) + len(_BODY_OPEN)
+        end = content.rindex(_BODY_CLOSE)
+        if frame is None:
+            frame = content[:auto.start()], content[auto.end():start], content[end:]
+        pages.append(content[start:end])
+        count += content.count(b"<draw:page ", start, end)
+
+    order = style_registry(THEME).order
+    merged_styles = b"".join(frag for _name, frag in sorted(
+        styles.items(), key=lambda item: order.get(item[0], len(order))))
+    auto_xml = (b"<office:automatic-styles>" + merged_styles + b"</office:automatic-styles>"
+                if merged_styles else b"<office:automatic-styles/>")
+
+    parts = {info.filename: data for info, data in entries}
+    if frame is None:
+        parts["content.xml"] = first
+    else:
+        head, between, tail = frame
+        parts["content.xml"] = head + auto_xml + between + b"".join(pages) + tail
+    write_package(output_path, parts, options)
+    return count
+
+
+def group_by_module(slides: list) -> "OrderedDict[str, list]":
+    """Split *slides* into per-module lists, preserving first-seen order."""
     modules: "OrderedDict[str, list]" = OrderedDict()
-    for slide in SLIDES:
-        key = slide.get("module", "misc")
-        modules.setdefault(key, []).append(slide)
-
-    for module_key, module_slides in modules.items():
-        out_path = os.path.join(out_dir, f"{module_key}.odp")
-        build_presentation(out_path, module_slides)
-
-    # ── Full combined deck ────────────────────────────────────────
-    combined_path = os.path.join(out_dir, "podman-course.odp")
-    build_presentation(combined_path, SLIDES)
-    print(f"\nDone. {len(modules)} module files + 1 combined deck in '{out_dir}/'")
+    for slide in slides:
+        modules.setdefault(slide.module, []).append(slide)
+    return modules
+
+
+def _theme_fingerprint() -> dict:
+    return {"generator": GENERATOR_VERSION, **asdict(THEME)}
+
+
+def deck_hash(slides: list, options: BuildOptions = DEFAULT_OPTIONS) -> str:
+    """Content hash of a deck: its slides, theme, build options and generator version."""
+    payload = json.dumps(
+        {"theme": _theme_fingerprint(), "options": options.fingerprint(),
+         "slides": [slide.to_dict() for slide in slides]},
+        sort_keys=True, ensure_ascii=False, separators=(",", ":"),
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def load_manifest(out_dir: str) -> dict:
+    """Read ``{file name: deck hash}`` from *out_dir*; empty if missing or corrupt."""
+    return course_source.read_json_dict(os.path.join(out_dir, MANIFEST_NAME))
+
+
+def save_manifest(out_dir: str, manifest: dict) -> None:
+    course_source.write_json_atomic(os.path.join(out_dir, MANIFEST_NAME), manifest)
+
+
+def modules_are_contiguous(slides: list) -> bool:
+    """True if each module's slides form one run, i.e. module decks concatenate to *slides*."""
+    seen: set = set()
+    prev = object()
+    for slide in slides:
+        key = slide.module
+        if key != prev:
+            if key in seen:
+                return False
+            seen.add(key)
+            prev = key
+    return True
+
+
+def build_deck(output_path: str, module_key: str | None = None,
+               options: BuildOptions = DEFAULT_OPTIONS) -> DeckResult:
+    """Build one deck and report its slide count, timing and phases.
+
+    ``module_key`` of None means the full combined deck. Workers receive the
+    key rather than the slide list so nothing large is pickled per task, and
+    a module worker only reads that module's source file.
+    """
+    with PHASES.separate() as phases:
+        start = time.perf_counter()
+        slides = all_slides() if module_key is None else load_module(module_key)
+        count = build_presentation(output_path, slides, options)
+        seconds = time.perf_counter() - start
+    return DeckResult(output_path, count, seconds, phases, peak_rss_kb())
+
+
+def init_worker(profile: bool, source: str) -> None:
+    """ProcessPoolExecutor initializer for processes that render decks."""
+    PHASES.enabled = profile
+    use_source(source)
+    prime_odf_namespaces()
+
+
+def deck_path(out_dir: str, module_key: str | None) -> str:
+    """Where a module deck (or, for None, the combined deck) is written."""
+    return os.path.join(out_dir, f"{module_key or COMBINED_KEY}.odp")
+
+
+def is_fresh(path: str, digest: str, manifest: dict) -> bool:
+    """Whether *path* exists and *manifest* records *digest* for it."""
+    return manifest.get(os.path.basename(path)) == digest and os.path.exists(path)
+
+
+def build_decks(
+    out_dir: str,
+    modules: list[str] | None = None,
+    combined: bool = True,
+    *,
+    jobs: int = 1,
+    force: bool = False,
+    merge: bool = True,
+    options: BuildOptions = DEFAULT_OPTIONS,
+) -> tuple[list[DeckResult], int]:
+    """Build the selected decks into *out_dir*; return (results, skipped count).
+
+    ``modules`` of None selects every module deck; ``combined`` adds the
+    full course deck. Decks whose hash matches OUT_DIR/.build-manifest.json
+    are skipped unless *force*. Only the selected modules' source files are
+    read, unless the combined deck is selected (it needs all of them).
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    keys = list(module_keys()) if modules is None else list(modules)
+
+    # Preserve course order so files come out numbered correctly
+    all_tasks: list[tuple[str, str | None]] = [(deck_path(out_dir, k), k) for k in keys]
+    if combined:
+        all_tasks.append((deck_path(out_dir, None), None))
+
+    # ── Incremental: skip decks whose content hash is unchanged ──
+    with PHASES("hash"):
+        hashes: dict[str | None, str] = {
+            k: deck_hash(load_module(k), options)
+            for k in (module_keys() if combined else keys)
+        }
+        if combined:
+            hashes[None] = deck_hash(all_slides(), options)
+        manifest = load_manifest(out_dir)
+    tasks = [(path, key) for path, key in all_tasks
+             if force or not is_fresh(path, hashes[key], manifest)]
+    skipped = len(all_tasks) - len(tasks)
+
+    # In merge mode the combined deck is stitched from the module decks
+    # afterwards, so it is taken out of the render queue. That needs every
+    # module deck to be either built in this run or already up to date.
+    building = {key for _path, key in tasks}
+    merge = (
+        merge and combined and None in building
+        and modules_are_contiguous(all_slides())
+        and all(k in building or is_fresh(deck_path(out_dir, k), hashes[k], manifest)
+                for k in module_keys())
+    )
+    render_tasks = [t for t in tasks if not (merge and t[1] is None)]
+
+    if not render_tasks:
+        results = []
+    elif jobs > 1:
+        # Every deck is independent, so in render mode the combined deck runs
+        # alongside the module decks. Results are reported in task order
+        # regardless of which worker finishes first.
+        with ProcessPoolExecutor(max_workers=jobs, initializer=init_worker,
+                                 initargs=(PHASES.enabled, _source)) as pool:
+            results = list(pool.map(functools.partial(build_deck, options=options),
+                                    *zip(*render_tasks)))
+    else:
+        prime_odf_namespaces()
+        results = [build_deck(path, key, options) for path, key in render_tasks]
+
+    if merge:
+        combined_path = deck_path(out_dir, None)
+        with PHASES.separate() as phases:
+            start = time.perf_counter()
+            with PHASES("merge"):
+                count = merge_presentations(
+                    combined_path, [deck_path(out_dir, k) for k in module_keys()], options)
+            seconds = time.perf_counter() - start
+        results.append(DeckResult(combined_path, count, seconds, phases, peak_rss_kb()))
+
+    # Only decks that were actually written get their new hash recorded;
+    # entries for decks that no longer exist are dropped.
+    known = {os.path.basename(deck_path(out_dir, k)) for k in (*module_keys(), None)}
+    new_manifest = {name: digest for name, digest in manifest.items() if name in known}
+    for path, key in tasks:
+        new_manifest[os.path.basename(path)] = hashes[key]
+    save_manifest(out_dir, new_manifest)
+    return results, skipped
+
+
+# ---------------------------------------------------------------------------
+# Watch mode
+# ---------------------------------------------------------------------------
+
+_IN_MODIFY      = 0x00000002
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_TO    = 0x00000080
+_IN_CREATE      = 0x00000100
+_IN_DELETE      = 0x00000200
+_IN_EVENT       = struct.Struct("iIII")   # wd, mask, cookie, len (name follows)
+
+
+def _inotify_changes(directory: str):
+    """Yield batches of changed file names in *directory* using Linux inotify.
+
+    Returns None (instead of a generator) where inotify is unavailable.
+    """
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or None, use_errno=True)
+        fd = libc.inotify_init1(os.O_CLOEXEC)
+    except (OSError, AttributeError):
+        return None
+    if fd < 0 or libc.inotify_add_watch(
+            fd, os.fsencode(directory),
+            _IN_CLOSE_WRITE | _IN_MOVED_TO | _IN_CREATE | _IN_DELETE | _IN_MODIFY) < 0:
+        return None
+
+    def batches():
+        try:
+            while True:
+                names: set[str] = set()
+                select.select([fd], [], [])
+                # Editors save with several events (write, rename, chmod);
+                # collect everything that arrives within a short window.
+                while select.select([fd], [], [], 0.05)[0]:
+                    buf = os.read(fd, 64 * 1024)
+                    pos = 0
+                    while pos < len(buf):
+                        _wd, _mask, _cookie, length = _IN_EVENT.unpack_from(buf, pos)
+                        pos += _IN_EVENT.size
+                        names.add(os.fsdecode(buf[pos:pos + length].rstrip(b"\0")))
+                        pos += length
+                yield names
+        finally:
+            os.close(fd)
+
+    return batches()
+
+
+def _polled_changes(directory: str, interval: float = 0.25):
+    """Fallback for non-Linux hosts: compare mtimes every *interval* seconds."""
+    def snapshot() -> dict[str, float]:
+        with os.scandir(directory) as it:
+            return {e.name: e.stat().st_mtime_ns for e in it if e.is_file()}
+
+    before = snapshot()
+    while True:
+        time.sleep(interval)
+        after = snapshot()
+        changed = {n for n in before.keys() | after.keys() if before.get(n) != after.get(n)}
+        before = after
+        if changed:
+            yield changed
+
+
+def reload_sources(names: set[str] | None = None) -> None:
+    """Drop cached slide files so the next access re-reads them."""
+    load_module.cache_clear()
+    all_slides.cache_clear()
+    if names is None or "index.json" in names:
+        module_keys.cache_clear()
+
+
+def watch(out_dir: str, modules: list[str] | None = None, combined: bool = True, *,
+          jobs: int = 1, merge: bool = True, options: BuildOptions = DEFAULT_OPTIONS) -> None:
+    """Rebuild decks whenever a file in source_dir() changes, until interrupted.
+
+    The process stays warm: odfpy is imported, the style registry and (for the
+    stream backend) the package template are built once, and each change
+    only rebuilds the edited module deck plus the combined deck. *modules*
+    and *combined* select decks as for ``build_decks``; edits to other
+    modules are ignored.
+    """
+    prime_odf_namespaces()
+    if options.backend == "stream":
+        package_template(THEME)
+    results, skipped = build_decks(out_dir, modules, combined,
+                                   jobs=jobs, merge=merge, options=options)
+    print(f"Initial build: {len(results)} deck(s) built, {skipped} unchanged.")
+
+    directory, suffix = source_dir(), source_suffix()
+    changes = _inotify_changes(directory)
+    how = "inotify"
+    if changes is None:
+        changes, how = _polled_changes(directory), "polling"
+    print(f"Watching {directory} ({how}); Ctrl-C to stop.")
+
+    for names in changes:
+        sources = {n for n in names if n.endswith(suffix)}
+        if not sources:
+            continue
+        start = time.perf_counter()
+        reload_sources(sources)
+        try:
+            keys = module_keys() if modules is None else modules
+            touched = modules if "index.json" in sources else [
+                k for k in keys if f"{k}{suffix}" in sources]
+            if not touched and not combined:
+                continue
+            results, _skipped = build_decks(out_dir, touched, combined,
+                                            jobs=jobs, merge=merge, options=options)
+        except (OSError, ValueError) as exc:
+            # Half-saved or invalid source: report it and wait for the next save.
+            print(f"[watch] {', '.join(sorted(sources))}: {exc}")
+            continue
+        built = ", ".join(os.path.basename(r.path) for r in results) or "nothing"
+        print(f"[watch] {', '.join(sorted(sources))} -> {built} "
+              f"({(time.perf_counter() - start) * 1000:.0f} ms)")
+
+
+def profile_report(results: list[DeckResult], skipped: int, wall: float,
+                   setup: dict[str, float], **run_info) -> dict:
+    """JSON-ready summary of a build for --profile.
+
+    *setup* holds phases timed outside any deck, e.g. hashing the sources.
+    """
+    phases = dict(setup)
+    for r in results:
+        for name, secs in r.phases.items():
+            phases[name] = phases.get(name, 0.0) + secs
+    return {
+        "generator": GENERATOR_VERSION,
+        **run_info,
+        "wall_seconds": round(wall, 6),
+        "decks_built": len(results),
+        "decks_skipped": skipped,
+        "slides": sum(r.slides for r in results),
+        "bytes": sum(os.path.getsize(r.path) for r in results),
+        "peak_rss_kb": {
+            "main": peak_rss_kb(),
+            "workers": peak_rss_kb(resource.RUSAGE_CHILDREN),
+        },
+        # add_slide includes notes_wrap. load is reading and validating the
+        # sources, which happens up front, before hash.
+        "phases": {name: round(secs, 6) for name, secs in sorted(phases.items())},
+        "decks": [
+            {
+                "path": r.path,
+                "slides": r.slides,
+                "seconds": round(r.seconds, 6),
+                "bytes": os.path.getsize(r.path),
+                "slides_per_second": round(r.slides / r.seconds, 1) if r.seconds else None,
+                "peak_rss_kb": r.peak_rss_kb,
+                "phases": {name: round(secs, 6) for name, secs in sorted(r.phases.items())},
+            }
+            for r in results
+        ],
+    }
+
+
+def parse_slide_range(spec: str) -> slice:
+    """Turn a 1-based inclusive ``FIRST:LAST`` range (either end optional) into a slice."""
+    first, sep, last = spec.partition(":")
+    try:
+        start = int(first) - 1 if first else None
+        stop = int(last) if last else None
+        if not sep:
+            stop = start + 1
+    except (TypeError, ValueError):
+        raise argparse.ArgumentTypeError(f"expected FIRST:LAST, got {spec!r}") from None
+    if (start is not None and start < 0) or (stop is not None and stop < 1):
+        raise argparse.ArgumentTypeError(f"slide numbers start at 1, got {spec!r}")
+    return slice(start, stop)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate the course ODP decks.")
+    parser.add_argument("out_dir", nargs="?",
+                        help="output directory (default: slides, or slides/markdown "
+                             "with --source markdown)")
+    selection = parser.add_mutually_exclusive_group()
+    selection.add_argument("-m", "--module", action="append", metavar="KEY",
+                        help="build only this module deck, e.g. 06-networking (repeatable)")
+    selection.add_argument("--only-combined", action="store_true",
+                        help=f"build only {COMBINED_KEY}.odp")
+    parser.add_argument("--source", choices=SOURCES, default="json",
+                        help="json: the curated decks in slides/src (default); markdown: "
+                             "derive one deck per module from modules/*.md")
+    parser.add_argument("--slides", type=parse_slide_range, metavar="FIRST:LAST",
+                        help="preview slides FIRST..LAST (1-based, inclusive) of the selected "
+                             "deck into <deck>.slides-FIRST-LAST.odp; the real deck and "
+                             "manifest are left alone")
+    parser.add_argument("-j", "--jobs", type=int, default=1,
+                        help="build decks in N worker processes (default: 1, serial)")
+    parser.add_argument("-f", "--force", action="store_true",
+                        help=f"rebuild the selected decks even if {MANIFEST_NAME} says they are current")
+    parser.add_argument("--combined", choices=("merge", "render"), default="merge",
+                        help="merge: stitch podman-course.odp from the module decks' pages "
+                             "(default); render: render it from the slide sources like any other deck")
+    parser.add_argument("--backend", choices=BACKENDS, default="odfpy",
+                        help="odfpy: build an odfpy document tree (reference, default); "
+                             "stream: write content.xml directly from the slides")
+    parser.add_argument("--notes", choices=NOTES_MODES, default="wrap",
+                        help=f"wrap: hard-wrap presenter notes at {NOTES_WIDTH} columns, one "
+                             "paragraph per line (default); flow: one paragraph per notes "
+                             "block, wrapped by Impress")
+    parser.add_argument("--compression", choices=COMPRESSION, default="default",
+                        help="how the ODP zip is written: store (fastest), fast, default "
+                             "(zlib's default level, as odfpy writes) or max (smallest, "
+                             "for dist/)")
+    parser.add_argument("--reproducible", action="store_true",
+                        default="SOURCE_DATE_EPOCH" in os.environ,
+                        help="write byte-identical decks for unchanged slides: every zip "
+                             "entry is stamped $SOURCE_DATE_EPOCH or 1980-01-01 (default: "
+                             "on when SOURCE_DATE_EPOCH is set)")
+    parser.add_argument("--compression-report", action="store_true",
+                        help="after the build, repack each built deck with every "
+                             "--compression mode and print the size/time tradeoff")
+    parser.add_argument("--overflow", choices=OVERFLOW_MODES, default="warn",
+                        help="warn: list slides whose bullets run out of the body frame "
+                             "(default); split: continue them on extra slides")
+    parser.add_argument("--profile", nargs="?", const="", metavar="FILE",
+                        help="write per-deck and per-phase timings, sizes and peak RSS as "
+                             "JSON to FILE ('-' for stdout; default OUT_DIR/.build-profile.json)")
+    parser.add_argument("--cprofile", metavar="FILE",
+                        help="also dump cProfile stats for the main process to FILE "
+                             "(deck rendering is included only with --jobs 1)")
+    parser.add_argument("-w", "--watch", action="store_true",
+                        help="stay running and rebuild affected decks whenever a file "
+                             "in slides/src changes")
+    parser.add_argument("--verify-backends", action="store_true",
+                        help="build every deck with both backends, report any "
+                             "semantic differences and exit")
+    args = parser.parse_args()
+    use_source(args.source)
+    if args.out_dir is None:
+        args.out_dir = os.path.join("slides", "markdown") if args.source == "markdown" else "slides"
+    options = BuildOptions(backend=args.backend, notes=args.notes,
+                           compression=args.compression, reproducible=args.reproducible,
+                           overflow=args.overflow)
+
+    if args.module:
+        unknown = [k for k in args.module if k not in module_keys()]
+        if unknown:
+            parser.error(f"unknown module(s) {', '.join(unknown)}; "
+                         f"choose from {', '.join(module_keys())}")
+
+    # Timed from here: validating the sources is where they are loaded.
+    wall_start = time.perf_counter()
+    PHASES.enabled = args.profile is not None
+
+    try:
+        selected = {key: load_module(key) for key in args.module or module_keys()}
+    except SlideError as exc:
+        parser.exit(2, f"{parser.prog}: error: {exc}\n")
+    if options.overflow == "warn" and not args.verify_backends:
+        for key, deck_slides in selected.items():
+            for i, slide, height in overflowing(deck_slides):
+                print(f"warning: {key} slide {i} ({slide.title!r}): bullets need "
+                      f"~{height:.1f}cm of {body_room(slide_layout(slide.type)):.1f}cm; "
+                      f"--overflow split continues them", file=sys.stderr)
+
+    if args.verify_backends:
+        import tempfile
+
+        decks = [*group_by_module(all_slides()).items(), (COMBINED_KEY, all_slides())]
+        failed = 0
+        with tempfile.TemporaryDirectory() as tmp:
+            for name, deck_slides in decks:
+                diffs = compare_backends(deck_slides, tmp, options)
+                failed += bool(diffs)
+                print(f"{'DIFF' if diffs else 'ok  '} {name}" + (f"  {diffs}" if diffs else ""))
+            diffs = compare_merge(all_slides(), tmp, options)
+            failed += bool(diffs)
+            print(f"{'DIFF' if diffs else 'ok  '} {COMBINED_KEY} (merged)"
+                  + (f"  {diffs}" if diffs else ""))
+        print(f"\n{len(decks) + 1 - failed}/{len(decks) + 1} decks identical")
+        sys.exit(1 if failed else 0)
+
+    if args.watch:
+        try:
+            watch(args.out_dir, [] if args.only_combined else args.module,
+                  combined=not args.module, jobs=args.jobs,
+                  merge=args.combined == "merge", options=options)
+        except KeyboardInterrupt:
+            pass
+        sys.exit(0)
+
+    if args.slides:
+        if args.module and len(args.module) > 1:
+            parser.error("--slides needs a single deck: pass at most one --module")
+        key = args.module[0] if args.module else None
+        rng = args.slides
+        deck_slides = (load_module(key) if key else all_slides())[rng]
+        if not deck_slides:
+            parser.error(f"no slides in that range ({key or COMBINED_KEY} has "
+                         f"{len(load_module(key) if key else all_slides())})")
+        first = (rng.start or 0) + 1
+        path = os.path.join(args.out_dir, f"{key or COMBINED_KEY}.slides-"
+                                          f"{first}-{first + len(deck_slides) - 1}.odp")
+        count = build_presentation(path, deck_slides, options)
+        print(f"Saved {path}  ({count} slides, "
+              f"{time.perf_counter() - wall_start:.3f}s)")
+        sys.exit(0)
+
+    profiler = cProfile.Profile() if args.cprofile else None
+    if profiler:
+        profiler.enable()
+    results, skipped = build_decks(
+        args.out_dir,
+        modules=[] if args.only_combined else args.module,
+        combined=not args.module,
+        jobs=args.jobs,
+        force=args.force,
+        merge=args.combined == "merge",
+        options=options,
+    )
+    wall = time.perf_counter() - wall_start
+    if profiler:
+        profiler.disable()
+        profiler.dump_stats(args.cprofile)
+
+    # With --profile - the JSON owns stdout; the usual summary goes to stderr.
+    log = sys.stderr if args.profile == "-" else sys.stdout
+    for r in results:
+        print(f"Saved {r.path}  ({r.slides} slides, {r.seconds:.3f}s)", file=log)
+    print(f"\nDone. {len(results)} deck(s) built, {skipped} unchanged in '{args.out_dir}/' "
+          f"({wall:.2f}s, jobs={args.jobs})", file=log)
+
+    if args.compression_report and results:
+        print(f"\n{'deck':<34}" + "".join(f"{mode:>21}" for mode in COMPRESSION), file=log)
+        for r in results:
+            tradeoff = compression_tradeoff(r.path)
+            print(f"{os.path.basename(r.path):<34}" + "".join(
+                f"{size / 1024:>10.1f}KB {seconds * 1000:>6.1f}ms"
+                for size, seconds in tradeoff.values()), file=log)
+
+    if args.profile is not None:
+        report = json.dumps(profile_report(results, skipped, wall, PHASES.take(),
+                                           **asdict(options),
+                                           jobs=args.jobs, combined=args.combined), indent=2)
+        if args.profile == "-":
+            print(report)
+        else:
+            path = args.profile or os.path.join(args.out_dir, ".build-profile.json")
+            with open(path, "w", encoding="utf-8") as fh:
+                fh.write(report + "\n")
+            print(f"Profile written to {path}", file=log)
+    if profiler:
+        print(f"cProfile stats written to {args.cprofile} "
+              f"(python3 -m pstats {args.cprofile})", file=log)
@@ -0,0 +1,243 @@
+"""
+course_source.py — The course markdown as shared by the slide and PDF builds.
+
+MODULES.md lists the module files (modules/NN-*.md) in course order. Each
+module parses into a small intermediate representation, a tuple of Blocks:
+headings, paragraphs, lists, fenced code and tables, with inline markdown
+left as written. build_slides.py turns it into slides (--source markdown).
+build_course_pdf.py uses the module index and the content digests from here,
+while pandoc reads the raw markdown, which the IR does not round-trip.
+The build manifests of every script are read and written with the JSON
+helpers here.
+
+Parses are cached in memory and in .cache/course-ir/, keyed by the file's
+sha256 with its size and mtime as a shortcut, so an unchanged module is
+neither re-hashed nor re-parsed by the next build, whichever tool runs it.
+"""
+
+from __future__ import annotations
+
+import functools
+import hashlib
+import json
+import os
+import re
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+MODULES_INDEX = "MODULES.md"
+IR_CACHE_DIR = ROOT_DIR / ".cache" / "course-ir"
+COPY_BUFSIZE = 1 << 20
+
+# Bump whenever parse_markdown's output changes, to invalidate IR_CACHE_DIR.
+IR_VERSION = "1"
+
+
+# ---------------------------------------------------------------------------
+# Module index and digests
+# ---------------------------------------------------------------------------
+
+def extract_module_paths(modules_md: str) -> list[str]:
+    # Lines look like: - `modules/00-setup.md`
+    paths: list[str] = []
+    for line in modules_md.splitlines():
+        m = re.search(r"`(modules/[^`]+\.md)`", line)
+        if m:
+            paths.append(m.group(1))
+    return paths
+
+
+def module_paths(root: Path = ROOT_DIR) -> list[str]:
+    """Module files, relative to *root*, in the order MODULES.md lists them."""
+    return extract_module_paths((root / MODULES_INDEX).read_text(encoding="utf-8"))
+
+
+def file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for block in iter(lambda: fh.read(COPY_BUFSIZE), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def source_digest(root: Path, rel: Path, known: dict) -> list:
+    """``[size, mtime_ns, sha256]`` of *rel*, reusing *known*'s entry while the
+    file's size and mtime are unchanged."""
+    st = (root / rel).stat()
+    entry = known.get(rel.as_posix())
+    if entry and entry[:2] == [st.st_size, st.st_mtime_ns]:
+        return entry
+    return [st.st_size, st.st_mtime_ns, file_sha256(root / rel)]
+
+
+# ---------------------------------------------------------------------------
+# Build manifests
+# ---------------------------------------------------------------------------
+
+def read_json_dict(path: str | os.PathLike) -> dict:
+    """The JSON object at *path*; empty if the file is missing, corrupt or
+    not an object."""
+    try:
+        with open(path, encoding="utf-8") as fh:
+            data = json.load(fh)
+    except (OSError, ValueError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def write_json_atomic(path: str | os.PathLike, data: dict) -> None:
+    """Write *data* to *path* via a temporary file, so readers never see it
+    half-written."""
+    tmp = f"{os.fspath(path)}.tmp"
+    with open(tmp, "w", encoding="utf-8") as fh:
+        json.dump(data, fh, indent=2, sort_keys=True)
+        fh.write("\n")
+    os.replace(tmp, path)
+
+
+# ---------------------------------------------------------------------------
+# Intermediate representation
+# ---------------------------------------------------------------------------
+
+BLOCK_KINDS = ("heading", "paragraph", "list", "code", "table")
+
+
+@dataclass(frozen=True)
+class Block:
+    kind: str               # see BLOCK_KINDS
+    text: str = ""          # heading or paragraph text
+    level: int = 0          # heading level (1 for "#")
+    items: tuple = ()       # list items, code lines or table rows (tuples of cells)
+    lang: str = ""          # fenced code info string
+
+
+@dataclass(frozen=True)
+class ModuleDoc:
+    path: str               # relative to the repository root
+    sha256: str
+    blocks: tuple
+
+    @property
+    def title(self) -> str:
+        return next((b.text for b in self.blocks if b.kind == "heading" and b.level == 1), "")
+
+
+_FENCE_RE = re.compile(r"^\s*(```+|~~~+)\s*([\w+-]*)")
+_HEADING_RE = re.compile(r"^(#{1,6})\s+(.*?)\s*#*\s*$")
+_ITEM_RE = re.compile(r"^\s*(?:[-*+]|\d+[.)])\s+(.*)$")
+_TABLE_RULE_RE = re.compile(r"^\|?[\s:|-]+\|?$")
+_HTML_RE = re.compile(r"^\s*</?[a-zA-Z][^>]*>\s*(?:</[a-zA-Z]+>)?\s*$")
+
+
+def parse_markdown(text: str) -> tuple[Block, ...]:
+    """Split markdown *text* into Blocks. Nested list items are flattened and
+    lines of raw HTML (anchors and the like) are dropped."""
+    blocks: list[Block] = []
+    para: list[str] = []
+    items: list[str] = []
+    rows: list[tuple] = []
+
+    def flush() -> None:
+        if para:
+            blocks.append(Block("paragraph", " ".join(para)))
+            para.clear()
+        if items:
+            blocks.append(Block("list", items=tuple(items)))
+            items.clear()
+        if rows:
+            blocks.append(Block("table", items=tuple(rows)))
+            rows.clear()
+
+    lines = iter(text.splitlines())
+    for line in lines:
+        fence = _FENCE_RE.match(line)
+        if fence:
+            flush()
+            code = []
+            for inner in lines:
+                if inner.strip().startswith(fence.group(1)):
+                    break
+                code.append(inner)
+            blocks.append(Block("code", items=tuple(code), lang=fence.group(2)))
+            continue
+        stripped = line.strip()
+        if not stripped or _HTML_RE.match(line):
+            flush()
+            continue
+        heading = _HEADING_RE.match(line)
+        if heading:
+            flush()
+            blocks.append(Block("heading", heading.group(2), level=len(heading.group(1))))
+            continue
+        if stripped.startswith("|"):
+            if not rows:
+                flush()
+            if not _TABLE_RULE_RE.match(stripped):
+                rows.append(tuple(c.strip() for c in stripped.strip("|").split("|")))
+            continue
+        item = _ITEM_RE.match(line)
+        if item:
+            if para or rows:
+                flush()
+            items.append(item.group(1).strip())
+        elif items and line[:1].isspace():
+            items[-1] += " " + stripped     # continuation of the last item
+        else:
+            if items or rows:
+                flush()
+            para.append(stripped)
+    flush()
+    return tuple(blocks)
+
+
+_LINK_RE = re.compile(r"!?\[([^\]]*)\]\([^)]*\)")
+_EMPHASIS_RE = re.compile(r"(\*\*|__|\*|_|`)(.+?)\1")
+
+
+def plain_text(inline: str) -> str:
+    """*inline* markdown without link targets, emphasis or code backticks."""
+    return _EMPHASIS_RE.sub(r"\2", _LINK_RE.sub(r"\1", inline)).strip()
+
+
+# ---------------------------------------------------------------------------
+# Cached loading
+# ---------------------------------------------------------------------------
+
+def _doc_from_json(data: dict) -> ModuleDoc:
+    blocks = tuple(Block(**{**b, "items": tuple(tuple(i) if isinstance(i, list) else i
+                                                for i in b["items"])})
+                   for b in data["blocks"])
+    return ModuleDoc(data["path"], data["sha256"], blocks)
+
+
+@functools.lru_cache(maxsize=None)
+def _load(rel: str, size: int, mtime_ns: int, root: Path) -> ModuleDoc:
+    cache = IR_CACHE_DIR / f"{Path(rel).stem}.json"
+    try:
+        with open(cache, encoding="utf-8") as fh:
+            cached = json.load(fh)
+    except (OSError, ValueError):
+        cached = {}
+    if cached.get("version") != IR_VERSION:
+        cached = {}
+    if cached.get("stat") == [size, mtime_ns]:
+        return _doc_from_json(cached["doc"])
+
+    sha = file_sha256(root / rel)
+    if cached.get("doc", {}).get("sha256") == sha:
+        doc = _doc_from_json(cached["doc"])
+    else:
+        doc = ModuleDoc(rel, sha, parse_markdown((root / rel).read_text(encoding="utf-8")))
+    IR_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    tmp = cache.with_name(cache.name + ".tmp")
+    with open(tmp, "w", encoding="utf-8") as fh:
+        json.dump({"version": IR_VERSION, "stat": [size, mtime_ns], "doc": asdict(doc)}, fh)
+    os.replace(tmp, cache)
+    return doc
+
+
+def load_module_doc(rel: str, root: Path = ROOT_DIR) -> ModuleDoc:
+    """The parsed module at *rel* (relative to *root*), from cache when current."""
+    st = (root / rel).stat()
+    return _load(rel, st.st_size, st.st_mtime_ns, root)
@@ -0,0 +1,406 @@
+#!/usr/bin/env python3
+"""
+export_slides.py — Export the built slide decks to PDF and per-slide PNGs.
+
+The LMS takes each deck as a PDF plus a PNG thumbnail per slide, which only
+LibreOffice can render faithfully. Starting soffice costs seconds, far more
+than converting one deck, so rather than one soffice per file this keeps a
+pool of --jobs headless soffice processes, each with its own profile and
+listening on a private UNO pipe, and hands the decks out to them as they
+free up. The combined deck goes first, as it takes longest.
+
+A deck is skipped when its ODP content matches the last export, recorded in
+OUT_DIR/.export-manifest.json. The hash covers the names, CRCs and sizes of
+the deck's zip entries, read from the zip directory without decompressing,
+so rebuilding a deck with new timestamps or compression does not re-export it.
+
+Talking UNO needs LibreOffice's Python bridge (the uno module: install
+python3-uno, or run this with LibreOffice's bundled python). Without it each
+worker converts its share of the decks with one ``soffice --convert-to pdf``
+call instead, which still starts soffice once per worker, but cannot render
+thumbnails.
+
+Run:
+    python3 scripts/export_slides.py                  # slides/*.odp -> dist/slides/
+    python3 scripts/export_slides.py -j 4 --formats pdf
+    python3 scripts/export_slides.py --slides-dir slides/markdown --out-dir dist/slides/markdown
+
+Output:
+    dist/slides/<deck>.pdf
+    dist/slides/<deck>/001.png, 002.png, ...
+"""
+
+from __future__ import annotations
+
+import argparse
+import fcntl
+import hashlib
+import itertools
+import json
+import os
+import queue
+import shutil
+import subprocess
+import sys
+import time
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable
+
+from course_source import read_json_dict, write_json_atomic
+
+try:
+    import uno
+except ImportError:     # not LibreOffice's python, and no python3-uno
+    uno = None
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+SLIDES_DIR = ROOT_DIR / "slides"
+OUT_DIR = ROOT_DIR / "dist" / "slides"
+PROFILE_DIR = ROOT_DIR / ".cache" / "soffice"
+MANIFEST_NAME = ".export-manifest.json"
+
+SOFFICE = os.environ.get("SOFFICE", "soffice")
+FORMATS = ("pdf", "png")
+THUMB_SIZE = (640, 360)         # pixels; the slides are 25.4cm x 14.29cm
+STARTUP_TIMEOUT = 60.0          # seconds for a new soffice to accept connections
+
+# Bump whenever the exported files change for the same deck.
+EXPORTER_VERSION = "1"
+
+
+# ---------------------------------------------------------------------------
+# Jobs and the export cache
+# ---------------------------------------------------------------------------
+
+@dataclass(frozen=True)
+class Export:
+    """One deck and where its exports go; a None target is not exported."""
+    odp: Path
+    pdf: Path | None
+    png_dir: Path | None
+
+    @property
+    def name(self) -> str:
+        return self.odp.name
+
+
+def odp_digest(path: Path) -> str:
+    """Hash of a deck's entry names, CRCs and sizes, from its zip directory."""
+    with zipfile.ZipFile(path) as zf:
+        entries = [[info.filename, info.CRC, info.file_size] for info in zf.infolist()]
+    return hashlib.sha256(json.dumps(entries).encode("utf-8")).hexdigest()
+
+
+def export_hash(digest: str, formats: tuple[str, ...]) -> str:
+    payload = json.dumps([EXPORTER_VERSION, digest, sorted(formats), THUMB_SIZE])
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def load_manifest(out_dir: Path) -> dict:
+    """Read ``{deck file name: export hash}`` from *out_dir*; empty if missing or corrupt."""
+    return read_json_dict(out_dir / MANIFEST_NAME)
+
+
+def save_manifest(out_dir: Path, manifest: dict) -> None:
+    write_json_atomic(out_dir / MANIFEST_NAME, manifest)
+
+
+def deck_files(slides_dir: Path) -> list[Path]:
+    """The decks in *slides_dir*, largest first; --slides previews are left out."""
+    decks = [p for p in slides_dir.glob("*.odp") if ".slides-" not in p.name]
+    return sorted(decks, key=lambda p: (-p.stat().st_size, p.name))
+
+
+# ---------------------------------------------------------------------------
+# soffice over UNO
+# ---------------------------------------------------------------------------
+
+def _props(**values) -> tuple:
+    """Keyword arguments as the PropertyValue sequence UNO calls take."""
+    props = []
+    for name, value in values.items():
+        prop = uno.createUnoStruct("com.sun.star.beans.PropertyValue")
+        prop.Name, prop.Value = name, value
+        props.append(prop)
+    return tuple(props)
+
+
+def _url(path: Path) -> str:
+    return uno.systemPathToFileUrl(str(path.resolve()))
+
+
+def claim_profile() -> tuple[Path, int]:
+    """A soffice profile directory that no other process is using, and the
+    descriptor that holds its lock (close it to release the profile).
+
+    Profiles live on across runs, so soffice starts with a warm profile.
+    A soffice launched on a profile that is already in use hands its
+    arguments to the running instance and exits, so each profile is locked
+    while in use. Concurrent exports, or a second export_slides.py next to
+    build.py, move on to the next free profile.
+    """
+    PROFILE_DIR.mkdir(parents=True, exist_ok=True)
+    for n in itertools.count():
+        fd = os.open(PROFILE_DIR / f"{n}.lock", os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            os.close(fd)
+            continue
+        return PROFILE_DIR / str(n), fd
+
+
+class Office:
+    """One headless soffice with its own profile, driven over a UNO pipe.
+
+    The profile comes from claim_profile(), so soffice processes never share
+    one, and the pipe is named after this process, so concurrent exports
+    never compete for a TCP port.
+    """
+
+    def __init__(self, index: int, soffice: str = SOFFICE):
+        self.soffice = soffice
+        self.pipe = f"course-export-{os.getpid()}-{index}"
+        self.profile: Path | None = None
+        self._profile_lock: int | None = None
+        self.process: subprocess.Popen | None = None
+        self.context = None
+        self.desktop = None
+
+    def start(self) -> None:
+        from com.sun.star.connection import NoConnectException
+
+        self.profile, self._profile_lock = claim_profile()
+        self.process = subprocess.Popen(
+            [self.soffice, "--headless", "--invisible", "--nologo", "--norestore",
+             "--nodefault", "--nolockcheck", f"-env:UserInstallation={self.profile.as_uri()}",
+             f"--accept=pipe,name={self.pipe};urp;StarOffice.ComponentContext"],
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        local = uno.getComponentContext()
+        resolver = local.ServiceManager.createInstanceWithContext(
+            "com.sun.star.bridge.UnoUrlResolver", local)
+        deadline = time.monotonic() + STARTUP_TIMEOUT
+        while True:
+            try:
+                self.context = resolver.resolve(
+                    f"uno:pipe,name={self.pipe};urp;StarOffice.ComponentContext")
+                break
+            except NoConnectException:
+                if self.process.poll() is not None or time.monotonic() > deadline:
+                    self.stop()
+                    raise RuntimeError(f"{self.soffice} did not start (pipe {self.pipe})")
+                time.sleep(0.25)
+        self.desktop = self.context.ServiceManager.createInstanceWithContext(
+            "com.sun.star.frame.Desktop", self.context)
+
+    def export(self, job: Export) -> None:
+        doc = self.desktop.loadComponentFromURL(_url(job.odp), "_blank", 0,
+                                                _props(Hidden=True, ReadOnly=True))
+        try:
+            if job.pdf is not None:
+                doc.storeToURL(_url(job.pdf), _props(FilterName="impress_pdf_Export"))
+            if job.png_dir is not None:
+                self._thumbnails(doc, job.png_dir)
+        finally:
+            doc.close(True)
+
+    def _thumbnails(self, doc, png_dir: Path) -> None:
+        if png_dir.exists():
+            shutil.rmtree(png_dir)      # the deck may have lost slides
+        png_dir.mkdir(parents=True)
+        graphic = self.context.ServiceManager.createInstanceWithContext(
+            "com.sun.star.drawing.GraphicExportFilter", self.context)
+        size = uno.Any("[]com.sun.star.beans.PropertyValue",
+                       _props(PixelWidth=THUMB_SIZE[0], PixelHeight=THUMB_SIZE[1]))
+        pages = doc.getDrawPages()
+        for i in range(pages.getCount()):
+            graphic.setSourceDocument(pages.getByIndex(i))
+            graphic.filter(_props(URL=_url(png_dir / f"{i + 1:03d}.png"),
+                                  MediaType="image/png", FilterData=size))
+
+    def stop(self) -> None:
+        if self.desktop is not None:
+            try:
+                self.desktop.terminate()
+            except Exception:   # the bridge drops as soffice exits (DisposedException)
+                pass
+            self.desktop = self.context = None
+        if self.process is not None:
+            try:
+                self.process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+                self.process.wait()
+            self.process = None
+        if self._profile_lock is not None:
+            os.close(self._profile_lock)
+            self._profile_lock = None
+
+
+class OfficePool:
+    """*size* Office processes, started together and stopped on exit."""
+
+    def __init__(self, size: int, soffice: str = SOFFICE):
+        self.offices = [Office(i, soffice) for i in range(max(1, size))]
+
+    def __enter__(self) -> OfficePool:
+        try:
+            with ThreadPoolExecutor(max_workers=len(self.offices)) as pool:
+                for future in [pool.submit(o.start) for o in self.offices]:
+                    future.result()
+        except BaseException:
+            self.close()
+            raise
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        for office in self.offices:
+            office.stop()
+
+    def run(self, jobs: list[Export], log: Callable[[str], None] = print) -> list[Export]:
+        """Export *jobs* in order, each on the next free process; return the ones that failed."""
+        todo: queue.SimpleQueue = queue.SimpleQueue()
+        for job in jobs:
+            todo.put(job)
+        failed: list[Export] = []
+
+        def drain(office: Office) -> None:
+            while True:
+                try:
+                    job = todo.get_nowait()
+                except queue.Empty:
+                    return
+                start = time.perf_counter()
+                try:
+                    office.export(job)
+                except Exception as exc:  # report and carry on with the other decks
+                    failed.append(job)
+                    log(f"FAIL  {job.name}: {exc}")
+                    continue
+                log(f"exported {job.name} ({time.perf_counter() - start:.2f}s)")
+
+        with ThreadPoolExecutor(max_workers=len(self.offices)) as pool:
+            for future in [pool.submit(drain, o) for o in self.offices]:
+                future.result()
+        return failed
+
+
+def convert_batches(jobs: list[Export], size: int, soffice: str = SOFFICE,
+                    log: Callable[[str], None] = print) -> list[Export]:
+    """PDFs of *jobs* without UNO: one ``soffice --convert-to`` per worker
+    for its share of the decks. Returns the jobs whose batch failed."""
+    batches = [jobs[i::size] for i in range(min(max(1, size), len(jobs)))]
+    failed: list[Export] = []
+
+    def convert(batch: list[Export]) -> None:
+        profile, lock = claim_profile()
+        start = time.perf_counter()
+        try:
+            result = subprocess.run(
+                [soffice, "--headless", "--norestore",
+                 f"-env:UserInstallation={profile.as_uri()}",
+                 "--convert-to", "pdf:impress_pdf_Export", "--outdir", str(batch[0].pdf.parent),
+                 *(str(job.odp) for job in batch)],
+                stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+        finally:
+            os.close(lock)
+        names = ", ".join(job.name for job in batch)
+        if result.returncode != 0:
+            failed.extend(batch)
+            log(f"FAIL  {names}: {result.stderr.strip() or f'exit {result.returncode}'}")
+        else:
+            log(f"exported {names} ({time.perf_counter() - start:.2f}s)")
+
+    with ThreadPoolExecutor(max_workers=max(1, len(batches))) as pool:
+        for future in [pool.submit(convert, b) for b in batches]:
+            future.result()
+    return failed
+
+
+# ---------------------------------------------------------------------------
+# Export
+# ---------------------------------------------------------------------------
+
+def export(slides_dir: Path = SLIDES_DIR, out_dir: Path = OUT_DIR, *,
+           formats: tuple[str, ...] = FORMATS, jobs: int = 1, force: bool = False,
+           soffice: str = SOFFICE, log: Callable[[str], None] = print) -> tuple[int, int, int]:
+    """Export the decks in *slides_dir* that changed since the last run.
+
+    Returns ``(exported, unchanged, failed)`` deck counts.
+    """
+    if uno is None and "png" in formats:
+        log("warning: no uno module, so no PNG thumbnails (install python3-uno)")
+        formats = tuple(f for f in formats if f != "png")
+    if not formats:
+        return 0, 0, 0
+
+    out_dir.mkdir(parents=True, exist_ok=True)
+    manifest = load_manifest(out_dir)
+    hashes: dict[str, str] = {}
+    stale: list[Export] = []
+    for odp in deck_files(slides_dir):
+        hashes[odp.name] = digest = export_hash(odp_digest(odp), formats)
+        job = Export(odp, out_dir / f"{odp.stem}.pdf" if "pdf" in formats else None,
+                     out_dir / odp.stem if "png" in formats else None)
+        outputs = [p for p in (job.pdf, job.png_dir) if p is not None]
+        if force or manifest.get(odp.name) != digest or not all(p.exists() for p in outputs):
+            stale.append(job)
+
+    failed: list[Export] = []
+    if stale:
+        if uno is not None:
+            with OfficePool(min(jobs, len(stale)), soffice) as pool:
+                failed = pool.run(stale, log)
+        else:
+            failed = convert_batches(stale, jobs, soffice, log)
+
+    failed_names = {job.name for job in failed}
+    for job in stale:
+        if job.name in failed_names:
+            manifest.pop(job.name, None)
+        else:
+            manifest[job.name] = hashes[job.name]
+    for name in set(manifest) - set(hashes):
+        del manifest[name]      # the deck is gone
+    save_manifest(out_dir, manifest)
+    return len(stale) - len(failed), len(hashes) - len(stale), len(failed)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export the slide decks to PDF and PNG.")
+    parser.add_argument("--slides-dir", type=Path, default=SLIDES_DIR,
+                        help=f"where the built decks are (default: "
+                             f"{SLIDES_DIR.relative_to(ROOT_DIR)})")
+    parser.add_argument("--out-dir", type=Path, default=OUT_DIR,
+                        help=f"where the exports go (default: {OUT_DIR.relative_to(ROOT_DIR)})")
+    parser.add_argument("--formats", default=",".join(FORMATS),
+                        help="comma-separated: pdf, png (per-slide thumbnails) "
+                             "(default: %(default)s)")
+    parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count() or 1,
+                        help="soffice processes to run at once (default: one per CPU)")
+    parser.add_argument("-f", "--force", action="store_true",
+                        help="export every deck, ignoring the export manifest")
+    parser.add_argument("--soffice", default=SOFFICE,
+                        help="the LibreOffice binary (default: $SOFFICE or soffice)")
+    args = parser.parse_args()
+
+    formats = tuple(f for f in args.formats.split(",") if f)
+    unknown = [f for f in formats if f not in FORMATS]
+    if unknown:
+        parser.error(f"unknown format(s) {', '.join(unknown)}; choose from {', '.join(FORMATS)}")
+    if shutil.which(args.soffice) is None:
+        sys.exit(f"error: {args.soffice} not found; install LibreOffice or pass --soffice")
+
+    start = time.perf_counter()
+    exported, unchanged, failed = export(args.slides_dir, args.out_dir, formats=formats,
+                                         jobs=max(1, args.jobs), force=args.force,
+                                         soffice=args.soffice)
+    print(f"\nDone. {exported} deck(s) exported, {unchanged} unchanged, {failed} failed "
+          f"({time.perf_counter() - start:.2f}s)")
+    sys.exit(1 if failed else 0)